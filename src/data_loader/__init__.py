@@ -36,7 +36,7 @@ __version__ = "1.0.0"
 __author__ = "OmniData Nexus Core Team"
 
 # Exports - M1 Foundation components
-from .cache import CacheEntry, CacheManager
+from .cache import CacheBackend, CacheEntry, CacheManager, DictBackend, FileBackend
 from .circuit_breaker import (
     CircuitBreaker,
     CircuitBreakerConfig,
@@ -74,6 +74,9 @@ __all__ = [
     # Cache
     "CacheManager",
     "CacheEntry",
+    "CacheBackend",
+    "FileBackend",
+    "DictBackend",
     # Health
     "HealthMonitor",
     "ProviderStatus",
@@ -2,17 +2,109 @@
 OmniData Nexus Core - Cache Manager
 
 Filesystem-based JSON cache with atomic writes, TTL support,
-and provider-specific directories.
+and provider-specific directories. Storage is pluggable via CacheBackend,
+and entries can optionally be stored as msgpack.
 """
 
+import hashlib
 import json
+import math
+import mmap
 import os
+import re
 import tempfile
 import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Optional
+from threading import Lock
+from typing import Any, Callable, Optional, Protocol
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore[assignment]
+
+# Characters that are unsafe in file names, mapped to underscores
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('/\\:*?"<>| ', '_'))
+
+# Files at least this large are parsed straight from an mmap
+_MMAP_THRESHOLD = 64 * 1024
+
+# Supported on-disk formats for CacheManager(serializer=...)
+SERIALIZERS = ("json", "msgpack")
+
+# Prefix marking msgpack-encoded entries. 0xC1 is never emitted by msgpack
+# and cannot start a JSON document, so readers can tell the formats apart.
+_MSGPACK_MAGIC = b"\xc1NX"
+
+# A run of 20+ digits may be an integer beyond 64 bits, which orjson
+# reads back as a float
+_LONG_DIGITS = re.compile(rb'\d{20}')
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Check whether obj contains a NaN or infinite float."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a cache entry to compact UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Types orjson rejects (e.g. ints beyond 64 bits) go through json
+            pass
+        else:
+            # orjson writes NaN and Infinity as null; json keeps them
+            if b'null' not in data or not _has_non_finite(obj):
+                return data
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _dumps_msgpack(obj: Any) -> bytes:
+    """Serialize a cache entry to magic-prefixed msgpack bytes."""
+    try:
+        return _MSGPACK_MAGIC + msgpack.packb(obj, use_bin_type=True)
+    except (OverflowError, TypeError):
+        # Values msgpack can't represent (e.g. ints beyond 64 bits) go
+        # through JSON, which _loads reads back with the stdlib parser
+        return _dumps(obj)
+
+
+def _loads(data: bytes) -> Any:
+    """
+    Deserialize an entry, detecting msgpack by its magic prefix.
+
+    JSON that orjson would misread (integers beyond 64 bits) or reject
+    (NaN and Infinity) is parsed with the stdlib json module instead.
+    """
+    if data[:len(_MSGPACK_MAGIC)] == _MSGPACK_MAGIC:
+        if msgpack is None:
+            raise ValueError("Cache entry is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(data[len(_MSGPACK_MAGIC):], raw=False, strict_map_key=False)
+    if orjson is not None and _LONG_DIGITS.search(data) is None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity tokens from the stdlib writer; retry with json
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
 
 
 @dataclass
@@ -28,6 +120,10 @@ class CacheEntry:
         key: Cache key
     """
 
+    # Declared by hand (dataclass(slots=True) needs Python 3.10+) so
+    # entries don't carry a per-instance __dict__
+    __slots__ = ("data", "timestamp", "ttl_days", "provider", "key")
+
     data: Any
     timestamp: float
     ttl_days: int
@@ -39,10 +135,26 @@ class CacheEntry:
         """Get expiration datetime."""
         return datetime.fromtimestamp(self.timestamp) + timedelta(days=self.ttl_days)
 
+    @property
+    def expires_timestamp(self) -> float:
+        """Get expiration as a Unix timestamp."""
+        return self.timestamp + (self.ttl_days * 86400)
+
     @property
     def is_expired(self) -> bool:
         """Check if entry has expired."""
-        return time.time() > (self.timestamp + (self.ttl_days * 86400))
+        return time.time() > self.expires_timestamp
+
+    def is_expired_at(self, now: float) -> bool:
+        """
+        Check if entry has expired at a given time.
+
+        Lets bulk sweeps read the clock once instead of per entry.
+
+        Args:
+            now: Unix timestamp to compare against
+        """
+        return now > self.expires_timestamp
 
     @property
     def age_seconds(self) -> float:
@@ -56,6 +168,8 @@ class CacheEntry:
 
     def to_dict(self) -> dict:
         """Serialize to dictionary for JSON storage."""
+        # Spelled out rather than dataclasses.asdict(), which walks fields
+        # and deep-copies data on every write
         return {
             "data": self.data,
             "timestamp": self.timestamp,
@@ -76,6 +190,205 @@ class CacheEntry:
         )
 
 
+class CacheBackend(Protocol):
+    """
+    Storage backend used by CacheManager.
+
+    Paths are computed by CacheManager; a backend only moves bytes.
+    Missing entries raise FileNotFoundError from read_bytes/unlink/size.
+    """
+
+    def read_bytes(self, path: Path) -> bytes:
+        """Read the full contents of an entry."""
+        ...
+
+    def write_bytes(self, path: Path, data: bytes, mtime: Optional[float] = None) -> None:
+        """Write an entry, creating parent directories as needed.
+
+        If mtime is given it is stored as the entry's modification time.
+        """
+        ...
+
+    def unlink(self, path: Path) -> None:
+        """Delete an entry."""
+        ...
+
+    def iterdir(self, directory: Path) -> Iterator[Path]:
+        """Iterate over the cache entries (*.json) in a directory."""
+        ...
+
+    def exists(self, path: Path) -> bool:
+        """Check if an entry exists."""
+        ...
+
+    def size(self, path: Path) -> int:
+        """Get the stored size of an entry in bytes."""
+        ...
+
+    def mtime(self, path: Path) -> float:
+        """Get the modification time of an entry."""
+        ...
+
+
+class FileBackend:
+    """
+    Filesystem storage backend (default).
+
+    Writes are atomic: data goes to a temp file in the target directory
+    which is then renamed over the destination.
+    """
+
+    def __init__(self) -> None:
+        # Directories already created, so writes skip the mkdir syscall
+        self._known_dirs: set[Path] = set()
+
+    def read_bytes(self, path: Path) -> bytes:
+        """Read the full contents of a cache file."""
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def write_bytes(self, path: Path, data: bytes, mtime: Optional[float] = None) -> None:
+        """Atomically write a cache file (temp file + rename)."""
+        directory = path.parent
+        if directory not in self._known_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(directory)
+
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix=".json.tmp", dir=directory)
+        except FileNotFoundError:
+            # Directory was removed behind our back; recreate it once
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(suffix=".json.tmp", dir=directory)
+
+        try:
+            # Unbuffered write straight to the fd (no file object)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+
+            if mtime is not None:
+                os.utime(temp_path, (mtime, mtime))
+
+            # Atomic rename (on POSIX systems)
+            os.replace(temp_path, path)
+
+        except Exception:
+            # Clean up temp file on failure
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def read_parsed(self, path: Path, parse: Callable[[Any], Any]) -> Any:
+        """
+        Read and parse a cache file.
+
+        Files of _MMAP_THRESHOLD bytes or more are mapped into memory and
+        handed to the parser as a memoryview, skipping the copy into an
+        intermediate bytes object.
+
+        Args:
+            path: Cache file to read
+            parse: Parser accepting bytes or a memoryview
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+                return parse(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return parse(view)
+
+    def unlink(self, path: Path) -> None:
+        """Delete a cache file."""
+        path.unlink()
+
+    def iterdir(self, directory: Path) -> Iterator[Path]:
+        """
+        Iterate over cache files in a directory.
+
+        Uses os.scandir, whose entries know their file type without an
+        extra stat() call.
+        """
+        try:
+            with os.scandir(directory) as it:
+                paths = [
+                    Path(e.path) for e in it
+                    if e.name.endswith(".json") and e.is_file()
+                ]
+        except FileNotFoundError:
+            return iter(())
+        return iter(paths)
+
+    def exists(self, path: Path) -> bool:
+        """Check if a cache file exists."""
+        return path.exists()
+
+    def size(self, path: Path) -> int:
+        """Get the size of a cache file in bytes."""
+        return path.stat().st_size
+
+    def mtime(self, path: Path) -> float:
+        """Get the modification time of a cache file."""
+        return path.stat().st_mtime
+
+
+class DictBackend:
+    """
+    In-memory storage backend.
+
+    Keeps entries in a dict keyed by path. Useful for tests and for
+    short-lived processes that don't need a persistent cache.
+    """
+
+    def __init__(self) -> None:
+        self._files: dict[Path, bytes] = {}
+        self._mtimes: dict[Path, float] = {}
+        self._lock = Lock()
+
+    def read_bytes(self, path: Path) -> bytes:
+        """Read the contents of an entry."""
+        try:
+            return self._files[path]
+        except KeyError:
+            raise FileNotFoundError(str(path)) from None
+
+    def write_bytes(self, path: Path, data: bytes, mtime: Optional[float] = None) -> None:
+        """Store an entry."""
+        with self._lock:
+            self._files[path] = bytes(data)
+            self._mtimes[path] = time.time() if mtime is None else mtime
+
+    def unlink(self, path: Path) -> None:
+        """Delete an entry."""
+        with self._lock:
+            if self._files.pop(path, None) is None:
+                raise FileNotFoundError(str(path))
+            self._mtimes.pop(path, None)
+
+    def iterdir(self, directory: Path) -> Iterator[Path]:
+        """Iterate over entries stored directly under a directory."""
+        with self._lock:
+            paths = list(self._files)
+        return iter([p for p in paths if p.parent == directory and p.suffix == ".json"])
+
+    def exists(self, path: Path) -> bool:
+        """Check if an entry exists."""
+        return path in self._files
+
+    def size(self, path: Path) -> int:
+        """Get the stored size of an entry in bytes."""
+        return len(self.read_bytes(path))
+
+    def mtime(self, path: Path) -> float:
+        """Get the modification time of an entry."""
+        try:
+            return self._mtimes[path]
+        except KeyError:
+            raise FileNotFoundError(str(path)) from None
+
+
 class CacheManager:
     """
     Filesystem-based JSON cache with atomic writes.
@@ -85,6 +398,8 @@ class CacheManager:
     - Atomic writes using temp file + rename pattern
     - TTL-based expiration
     - Thread-safe file operations
+    - Pluggable storage backend (filesystem by default, in-memory for tests)
+    - Optional sharding of provider directories for very large caches
 
     Usage:
         cache = CacheManager(base_dir=Path("./data/cache"), ttl_days=7)
@@ -106,6 +421,9 @@ class CacheManager:
         base_dir: Path,
         ttl_days: int = 7,
         enabled: bool = True,
+        storage_backend: Optional[CacheBackend] = None,
+        serializer: str = "json",
+        sharded: bool = False,
     ):
         """
         Initialize cache manager.
@@ -114,13 +432,40 @@ class CacheManager:
             base_dir: Base directory for cache storage
             ttl_days: Default TTL for cache entries
             enabled: Whether caching is enabled
+            storage_backend: Backend storing the entries (defaults to FileBackend)
+            serializer: Format for new entries, "json" or "msgpack". Entries
+                are read back in whichever format they were written, so the
+                setting can be changed without clearing the cache. msgpack
+                keeps non-string dict keys instead of coercing them.
+            sharded: Spread each provider's entries over 256 subdirectories
+                keyed by a hash prefix of the cache key, so no single
+                directory grows huge. Flat entries written before sharding
+                was enabled are moved into place when first read.
+
+        Raises:
+            ValueError: If the serializer is unknown
+            ImportError: If "msgpack" is requested but not installed
         """
+        if serializer not in SERIALIZERS:
+            raise ValueError(
+                f"Unknown cache serializer {serializer!r}, expected one of {SERIALIZERS}"
+            )
+        if serializer == "msgpack" and msgpack is None:
+            raise ImportError(
+                "The msgpack cache serializer requires the 'msgpack' package "
+                "(pip install 'omnidata-nexus-core[msgpack]')"
+            )
+
         self.base_dir = Path(base_dir)
         self.ttl_days = ttl_days
         self.enabled = enabled
+        self._backend: CacheBackend = storage_backend or FileBackend()
+        self.serializer = serializer
+        self.sharded = sharded
+        self._dumps = _dumps_msgpack if serializer == "msgpack" else _dumps
 
-        # Create base directory if enabled
-        if self.enabled:
+        # Create base directory if enabled and backed by the filesystem
+        if self.enabled and isinstance(self._backend, FileBackend):
             self.base_dir.mkdir(parents=True, exist_ok=True)
 
     def _get_provider_dir(self, provider: str) -> Path:
@@ -129,10 +474,72 @@ class CacheManager:
 
     def _get_cache_path(self, provider: str, key: str) -> Path:
         """Get full path for a cache entry."""
+        if self.sharded:
+            return (
+                self._get_provider_dir(provider)
+                / self._shard_for(key)
+                / f"{self._sanitize_key(key)}.json"
+            )
+        return self._get_flat_path(provider, key)
+
+    def _get_flat_path(self, provider: str, key: str) -> Path:
+        """Get the unsharded path for a cache entry."""
         # Sanitize key to be filesystem-safe
         safe_key = self._sanitize_key(key)
         return self._get_provider_dir(provider) / f"{safe_key}.json"
 
+    @staticmethod
+    def _shard_for(key: str) -> str:
+        """Get the shard subdirectory (two hex chars) for a cache key."""
+        return hashlib.blake2b(key.encode(), digest_size=1).hexdigest()
+
+    def _iter_entries(self, provider: str) -> Iterator[Path]:
+        """
+        Iterate over all cache files for a provider.
+
+        Includes flat entries in sharded mode so legacy files are still
+        swept and counted.
+        """
+        provider_dir = self._get_provider_dir(provider)
+        yield from self._backend.iterdir(provider_dir)
+        if self.sharded:
+            for shard in range(256):
+                yield from self._backend.iterdir(provider_dir / f"{shard:02x}")
+
+    def _read_entry_data(self, path: Path) -> Any:
+        """Read and deserialize a stored entry."""
+        if isinstance(self._backend, FileBackend):
+            return self._backend.read_parsed(path, _loads)
+        return _loads(self._backend.read_bytes(path))
+
+    def _candidate_paths(self, provider: str, key: str) -> list[Path]:
+        """Get every path an entry may live at (sharded plus legacy flat)."""
+        cache_path = self._get_cache_path(provider, key)
+        if self.sharded:
+            return [cache_path, self._get_flat_path(provider, key)]
+        return [cache_path]
+
+    def _migrate_legacy(self, provider: str, key: str, cache_path: Path) -> bool:
+        """
+        Move a flat entry into its shard directory.
+
+        Returns:
+            True if an entry now exists at cache_path
+        """
+        legacy_path = self._get_flat_path(provider, key)
+        if not self._backend.exists(legacy_path):
+            return False
+        try:
+            self._backend.write_bytes(
+                cache_path,
+                self._backend.read_bytes(legacy_path),
+                mtime=self._backend.mtime(legacy_path),
+            )
+            self._backend.unlink(legacy_path)
+        except OSError:
+            return self._backend.exists(cache_path)
+        return True
+
     @staticmethod
     def _sanitize_key(key: str) -> str:
         """
@@ -140,12 +547,7 @@ class CacheManager:
 
         Replaces unsafe characters with underscores.
         """
-        # Replace common unsafe characters
-        unsafe_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|', ' ']
-        result = key
-        for char in unsafe_chars:
-            result = result.replace(char, '_')
-        return result
+        return key.translate(_SANITIZE_TABLE)
 
     def set(
         self,
@@ -173,10 +575,6 @@ class CacheManager:
             return False
 
         try:
-            # Ensure provider directory exists
-            provider_dir = self._get_provider_dir(provider)
-            provider_dir.mkdir(parents=True, exist_ok=True)
-
             # Create cache entry
             entry = CacheEntry(
                 data=data,
@@ -186,27 +584,15 @@ class CacheManager:
                 key=key,
             )
 
-            cache_path = self._get_cache_path(provider, key)
-
-            # Atomic write: write to temp file, then rename
-            fd, temp_path = tempfile.mkstemp(
-                suffix=".json.tmp",
-                dir=provider_dir,
+            # The backend performs the atomic write (temp file + rename).
+            # The file's mtime is set to the expiry deadline so sweeps can
+            # skip parsing entries that are still valid.
+            self._backend.write_bytes(
+                self._get_cache_path(provider, key),
+                self._dumps(entry.to_dict()),
+                mtime=entry.expires_timestamp,
             )
-
-            try:
-                with os.fdopen(fd, 'w', encoding='utf-8') as f:
-                    json.dump(entry.to_dict(), f, indent=2, ensure_ascii=False)
-
-                # Atomic rename (on POSIX systems)
-                os.replace(temp_path, cache_path)
-                return True
-
-            except Exception:
-                # Clean up temp file on failure
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                raise
+            return True
 
         except Exception:
             return False
@@ -233,12 +619,12 @@ class CacheManager:
 
         cache_path = self._get_cache_path(provider, key)
 
-        if not cache_path.exists():
-            return None
+        if not self._backend.exists(cache_path):
+            if not (self.sharded and self._migrate_legacy(provider, key, cache_path)):
+                return None
 
         try:
-            with open(cache_path, encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._read_entry_data(cache_path)
 
             entry = CacheEntry.from_dict(data)
 
@@ -248,7 +634,7 @@ class CacheManager:
 
             return entry
 
-        except (OSError, json.JSONDecodeError, KeyError):
+        except (OSError, ValueError, KeyError):
             # Invalid or corrupted cache file
             return None
 
@@ -266,15 +652,15 @@ class CacheManager:
         if not self.enabled:
             return False
 
-        cache_path = self._get_cache_path(provider, key)
-
-        try:
-            if cache_path.exists():
-                cache_path.unlink()
-                return True
-            return False
-        except OSError:
-            return False
+        deleted = False
+        for cache_path in self._candidate_paths(provider, key):
+            try:
+                if self._backend.exists(cache_path):
+                    self._backend.unlink(cache_path)
+                    deleted = True
+            except OSError:
+                pass
+        return deleted
 
     def clear_provider(self, provider: str) -> int:
         """
@@ -289,15 +675,10 @@ class CacheManager:
         if not self.enabled:
             return 0
 
-        provider_dir = self._get_provider_dir(provider)
-
-        if not provider_dir.exists():
-            return 0
-
         count = 0
-        for cache_file in provider_dir.glob("*.json"):
+        for cache_file in self._iter_entries(provider):
             try:
-                cache_file.unlink()
+                self._backend.unlink(cache_file)
                 count += 1
             except OSError:
                 pass
@@ -335,28 +716,30 @@ class CacheManager:
 
         providers = [provider] if provider else ["fmp", "polygon", "fred"]
         count = 0
+        now = time.time()
 
         for prov in providers:
-            provider_dir = self._get_provider_dir(prov)
-
-            if not provider_dir.exists():
-                continue
-
-            for cache_file in provider_dir.glob("*.json"):
+            for cache_file in self._iter_entries(prov):
                 try:
-                    with open(cache_file, encoding='utf-8') as f:
-                        data = json.load(f)
+                    # Entries written by set() carry their expiry deadline
+                    # as mtime; a deadline in the future means still valid.
+                    # Files written any other way have an mtime in the past
+                    # and fall through to a full parse.
+                    if self._backend.mtime(cache_file) > now:
+                        continue
+
+                    data = self._read_entry_data(cache_file)
 
                     entry = CacheEntry.from_dict(data)
 
-                    if entry.is_expired:
-                        cache_file.unlink()
+                    if entry.is_expired_at(now):
+                        self._backend.unlink(cache_file)
                         count += 1
 
-                except (OSError, json.JSONDecodeError, KeyError):
+                except (OSError, ValueError, KeyError):
                     # Remove corrupted files
                     try:
-                        cache_file.unlink()
+                        self._backend.unlink(cache_file)
                         count += 1
                     except OSError:
                         pass
@@ -367,6 +750,11 @@ class CacheManager:
         """
         Get cache statistics.
 
+        Entries whose mtime (the expiry deadline written by set()) is in
+        the future are counted as valid from stat data alone, without
+        being parsed, so a corrupt file with a future mtime is reported as
+        valid until get() reads it.
+
         Args:
             provider: Optional provider to limit stats
 
@@ -383,10 +771,9 @@ class CacheManager:
             "ttl_days": self.ttl_days,
             "providers": {},
         }
+        now = time.time()
 
         for prov in providers:
-            provider_dir = self._get_provider_dir(prov)
-
             prov_stats = {
                 "total_entries": 0,
                 "expired_entries": 0,
@@ -394,23 +781,29 @@ class CacheManager:
                 "total_size_bytes": 0,
             }
 
-            if provider_dir.exists():
-                for cache_file in provider_dir.glob("*.json"):
-                    prov_stats["total_entries"] += 1
-                    prov_stats["total_size_bytes"] += cache_file.stat().st_size
+            for cache_file in self._iter_entries(prov):
+                prov_stats["total_entries"] += 1
 
-                    try:
-                        with open(cache_file, encoding='utf-8') as f:
-                            data = json.load(f)
-                        entry = CacheEntry.from_dict(data)
+                try:
+                    prov_stats["total_size_bytes"] += self._backend.size(cache_file)
 
-                        if entry.is_expired:
-                            prov_stats["expired_entries"] += 1
-                        else:
-                            prov_stats["valid_entries"] += 1
+                    # Stat-only for entries whose mtime (the expiry
+                    # deadline set by set()) is still in the future; only
+                    # possibly-expired or foreign files are opened.
+                    if self._backend.mtime(cache_file) > now:
+                        prov_stats["valid_entries"] += 1
+                        continue
 
-                    except (OSError, json.JSONDecodeError, KeyError):
+                    data = self._read_entry_data(cache_file)
+                    entry = CacheEntry.from_dict(data)
+
+                    if entry.is_expired_at(now):
                         prov_stats["expired_entries"] += 1
+                    else:
+                        prov_stats["valid_entries"] += 1
+
+                except (OSError, ValueError, KeyError):
+                    prov_stats["expired_entries"] += 1
 
             stats["providers"][prov] = prov_stats  # type: ignore[index]
 
@@ -430,7 +823,9 @@ class CacheManager:
         if not self.enabled:
             return False
 
-        return self._get_cache_path(provider, key).exists()
+        return any(
+            self._backend.exists(path) for path in self._candidate_paths(provider, key)
+        )
 
     def is_valid(self, provider: str, key: str) -> bool:
         """
@@ -7,6 +7,7 @@ Prevents cascading failures by failing fast when a service is unhealthy.
 
 import time
 from collections import deque
+from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import Enum
 from threading import Lock
@@ -14,6 +15,10 @@ from typing import Any, Callable, Optional, TypeVar
 
 T = TypeVar('T')
 
+# Clock used for all circuit breaker timestamps. Module-level so tests can
+# monkeypatch it with a fake clock instead of sleeping.
+_now = time.time
+
 
 class CircuitState(Enum):
     """Circuit breaker states."""
@@ -106,12 +111,17 @@ class CircuitBreaker:
         self._state = CircuitState.CLOSED
         self._lock = Lock()
 
-        # Request tracking (rolling window)
-        self._requests: deque = deque(maxlen=self.config.window_size)
+        # Request tracking (rolling window of the last window_size outcomes).
+        # Stored as run-length buckets [successes, failures], each meaning
+        # "successes, then failures", with running totals so the error
+        # rate and batch updates are O(1) instead of O(window_size).
+        self._buckets: deque[list[int]] = deque()
+        self._window_successes = 0
+        self._window_failures = 0
 
         # State tracking
         self._last_failure_time: Optional[float] = None
-        self._last_state_change: float = time.time()
+        self._last_state_change: float = _now()
         self._consecutive_successes: int = 0
         self._half_open_requests: int = 0
 
@@ -142,7 +152,7 @@ class CircuitBreaker:
         if self._state == CircuitState.OPEN:
             # Check if recovery timeout has passed
             if self._last_failure_time:
-                elapsed = time.time() - self._last_failure_time
+                elapsed = _now() - self._last_failure_time
                 if elapsed >= self.config.recovery_timeout:
                     self._transition_to(CircuitState.HALF_OPEN)
 
@@ -155,7 +165,7 @@ class CircuitBreaker:
         """
         if self._state != new_state:
             self._state = new_state
-            self._last_state_change = time.time()
+            self._last_state_change = _now()
 
             if new_state == CircuitState.HALF_OPEN:
                 self._half_open_requests = 0
@@ -163,11 +173,47 @@ class CircuitBreaker:
 
     def _calculate_error_rate(self) -> float:
         """Calculate error rate from recent requests."""
-        if len(self._requests) == 0:
+        total = self._window_successes + self._window_failures
+        if total == 0:
             return 0.0
 
-        failures = sum(1 for success in self._requests if not success)
-        return failures / len(self._requests)
+        return self._window_failures / total
+
+    def _append_outcomes(self, successes: int, failures: int) -> None:
+        """
+        Add outcomes to the rolling window (caller holds the lock).
+
+        Successes are ordered before failures. The oldest outcomes are
+        evicted once the window holds more than window_size.
+        """
+        buckets = self._buckets
+        if successes:
+            if buckets and buckets[-1][1] == 0:
+                buckets[-1][0] += successes
+            else:
+                buckets.append([successes, 0])
+        if failures:
+            if buckets:
+                buckets[-1][1] += failures
+            else:
+                buckets.append([0, failures])
+        self._window_successes += successes
+        self._window_failures += failures
+
+        excess = self._window_successes + self._window_failures - self.config.window_size
+        while excess > 0:
+            oldest = buckets[0]
+            # Within a bucket the successes are older than the failures
+            drop = min(oldest[0], excess)
+            oldest[0] -= drop
+            self._window_successes -= drop
+            excess -= drop
+            drop = min(oldest[1], excess)
+            oldest[1] -= drop
+            self._window_failures -= drop
+            excess -= drop
+            if oldest[0] == 0 and oldest[1] == 0:
+                buckets.popleft()
 
     def can_execute(self) -> bool:
         """
@@ -194,43 +240,74 @@ class CircuitBreaker:
     def record_success(self) -> None:
         """Record a successful request."""
         with self._lock:
-            self._requests.append(True)
-            self._consecutive_successes += 1
-
-            if self._state == CircuitState.HALF_OPEN:
-                self._half_open_requests += 1
-
-                # Transition to closed after enough successes
-                if self._consecutive_successes >= self.config.half_open_max_requests:
-                    self._transition_to(CircuitState.CLOSED)
+            self._on_success()
 
     def record_failure(self) -> None:
         """Record a failed request."""
         with self._lock:
-            self._requests.append(False)
-            self._last_failure_time = time.time()
-            self._consecutive_successes = 0
+            self._on_failure()
 
-            if self._state == CircuitState.HALF_OPEN:
-                # Any failure in half-open goes back to open
-                self._transition_to(CircuitState.OPEN)
-                return
+    def record_outcomes(self, successes: int = 0, failures: int = 0) -> None:
+        """
+        Record a batch of request outcomes under a single lock.
 
-            if self._state == CircuitState.CLOSED:
-                # Check if we should open
-                if len(self._requests) >= self.config.min_requests:
-                    error_rate = self._calculate_error_rate()
-                    if error_rate >= self.config.error_threshold:
-                        self._transition_to(CircuitState.OPEN)
+        Equivalent to calling record_success() ``successes`` times and then
+        record_failure() ``failures`` times, but runs in constant time.
+
+        Args:
+            successes: Number of successful requests
+            failures: Number of failed requests
+        """
+        with self._lock:
+            if successes > 0:
+                self._on_success(successes)
+            if failures > 0:
+                self._on_failure(failures)
+
+    def _on_success(self, count: int = 1) -> None:
+        """Apply successful requests (caller holds the lock)."""
+        self._append_outcomes(count, 0)
+        before = self._consecutive_successes
+        self._consecutive_successes += count
+
+        if self._state == CircuitState.HALF_OPEN:
+            # Successes only count as half-open probes until the breaker closes
+            needed = max(self.config.half_open_max_requests - before, 1)
+            self._half_open_requests += min(count, needed)
+
+            # Transition to closed after enough successes
+            if self._consecutive_successes >= self.config.half_open_max_requests:
+                self._transition_to(CircuitState.CLOSED)
+
+    def _on_failure(self, count: int = 1) -> None:
+        """Apply failed requests (caller holds the lock)."""
+        self._append_outcomes(0, count)
+        self._last_failure_time = _now()
+        self._consecutive_successes = 0
+
+        if self._state == CircuitState.HALF_OPEN:
+            # Any failure in half-open goes back to open
+            self._transition_to(CircuitState.OPEN)
+            return
+
+        if self._state == CircuitState.CLOSED:
+            # Check if we should open. Appending failures never lowers the
+            # error rate, so checking once after a batch matches checking
+            # after each failure.
+            total = self._window_successes + self._window_failures
+            if total >= self.config.min_requests:
+                error_rate = self._calculate_error_rate()
+                if error_rate >= self.config.error_threshold:
+                    self._transition_to(CircuitState.OPEN)
 
     def get_stats(self) -> CircuitBreakerStats:
         """Get current statistics."""
         with self._lock:
             self._check_state_transition()
 
-            total = len(self._requests)
-            successes = sum(1 for s in self._requests if s)
-            failures = total - successes
+            successes = self._window_successes
+            failures = self._window_failures
+            total = successes + failures
             error_rate = failures / total if total > 0 else 0.0
 
             return CircuitBreakerStats(
@@ -242,19 +319,33 @@ class CircuitBreaker:
                 last_failure_time=self._last_failure_time,
                 last_state_change=self._last_state_change,
                 consecutive_successes=self._consecutive_successes,
-                time_in_current_state=time.time() - self._last_state_change,
+                time_in_current_state=_now() - self._last_state_change,
             )
 
     def reset(self) -> None:
         """Reset circuit breaker to initial state."""
         with self._lock:
             self._state = CircuitState.CLOSED
-            self._requests.clear()
+            self._buckets.clear()
+            self._window_successes = 0
+            self._window_failures = 0
             self._last_failure_time = None
-            self._last_state_change = time.time()
+            self._last_state_change = _now()
             self._consecutive_successes = 0
             self._half_open_requests = 0
 
+    def force_open(self) -> None:
+        """
+        Open the circuit immediately, regardless of recorded outcomes.
+
+        Useful when a provider outage is already known. The breaker moves
+        to HALF_OPEN after recovery_timeout as if it had tripped now.
+        """
+        with self._lock:
+            self._last_failure_time = _now()
+            self._consecutive_successes = 0
+            self._transition_to(CircuitState.OPEN)
+
     async def execute(
         self,
         func: Callable[..., Any],
@@ -332,16 +423,35 @@ class CircuitBreakerManager:
         self._breakers: dict[str, CircuitBreaker] = {}
         self._lock = Lock()
 
+    def _new_breaker(self, provider: str) -> CircuitBreaker:
+        """Create a circuit breaker using the provider's configuration."""
+        config = self.provider_configs.get(provider, self.default_config)
+        return CircuitBreaker(provider, config)
+
     def _get_breaker(self, provider: str) -> CircuitBreaker:
         """Get or create circuit breaker for a provider."""
         if provider not in self._breakers:
             with self._lock:
                 if provider not in self._breakers:
-                    config = self.provider_configs.get(provider, self.default_config)
-                    self._breakers[provider] = CircuitBreaker(provider, config)
+                    self._breakers[provider] = self._new_breaker(provider)
 
         return self._breakers[provider]
 
+    def prewarm(self, providers: Iterable[str]) -> None:
+        """
+        Create circuit breakers for providers ahead of first use.
+
+        Takes the lock once for all providers instead of once per lazy
+        first lookup.
+
+        Args:
+            providers: Provider names to create breakers for
+        """
+        with self._lock:
+            for provider in providers:
+                if provider not in self._breakers:
+                    self._breakers[provider] = self._new_breaker(provider)
+
     def get_state(self, provider: str) -> CircuitState:
         """Get circuit state for a provider."""
         return self._get_breaker(provider).state
@@ -358,6 +468,39 @@ class CircuitBreakerManager:
         """Record a failed request for a provider."""
         self._get_breaker(provider).record_failure()
 
+    def _record_batch(self, counts: dict[str, int], success: bool) -> None:
+        """Dispatch per-provider outcome counts under a single manager lock."""
+        with self._lock:
+            breakers = []
+            for provider, count in counts.items():
+                if provider not in self._breakers:
+                    self._breakers[provider] = self._new_breaker(provider)
+                breakers.append((self._breakers[provider], count))
+
+        for breaker, count in breakers:
+            if success:
+                breaker.record_outcomes(successes=count)
+            else:
+                breaker.record_outcomes(failures=count)
+
+    def record_successes(self, counts: dict[str, int]) -> None:
+        """
+        Record batches of successful requests for several providers.
+
+        Args:
+            counts: Mapping of provider name to number of successes
+        """
+        self._record_batch(counts, success=True)
+
+    def record_failures(self, counts: dict[str, int]) -> None:
+        """
+        Record batches of failed requests for several providers.
+
+        Args:
+            counts: Mapping of provider name to number of failures
+        """
+        self._record_batch(counts, success=False)
+
     async def execute(
         self,
         provider: str,
@@ -414,6 +557,29 @@ class CircuitBreakerManager:
             for breaker in self._breakers.values():
                 breaker.reset()
 
+    def force_open(self, provider: str) -> None:
+        """
+        Open a provider's circuit immediately.
+
+        Args:
+            provider: Provider name
+        """
+        self._get_breaker(provider).force_open()
+
+    def force_open_all(self, providers: Iterable[str]) -> None:
+        """
+        Open several providers' circuits immediately.
+
+        Missing breakers are created under a single lock acquisition.
+
+        Args:
+            providers: Provider names
+        """
+        providers = list(providers)
+        self.prewarm(providers)
+        for provider in providers:
+            self._breakers[provider].force_open()
+
     def get_all_states(self) -> dict[str, CircuitState]:
         """Get states for all tracked providers."""
         return {
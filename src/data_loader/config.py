@@ -9,7 +9,7 @@ import os
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional, Union
 
 from dotenv import load_dotenv
 
@@ -115,13 +115,15 @@ class Config:
     FRED_MAX_CONCURRENCY: int = 1
 
     @classmethod
-    def from_env(cls, env_path: Optional[Path] = None) -> "Config":
+    def from_env(cls, env_path: Optional[Union[Path, IO[str]]] = None) -> "Config":
         """
         Load configuration from environment variables.
 
         Args:
-            env_path: Optional path to .env file. If None, searches for .env
-                     in project root and parent directories.
+            env_path: Optional path to .env file, or an open text stream with
+                     .env contents. If None, uses the path in the
+                     NEXUS_DOTENV_PATH environment variable if set, else
+                     searches for .env in project root and parent directories.
 
         Returns:
             Configured Config instance.
@@ -133,8 +135,13 @@ class Config:
         project_root = cls._find_project_root()
 
         # Load .env file
-        if env_path:
+        if env_path is None and os.getenv("NEXUS_DOTENV_PATH"):
+            env_path = Path(os.environ["NEXUS_DOTENV_PATH"])
+
+        if isinstance(env_path, (str, os.PathLike)):
             load_dotenv(env_path)
+        elif env_path is not None:
+            load_dotenv(stream=env_path)
         else:
             # Try project root first, then current directory
             env_file = project_root / ".env"
@@ -320,7 +327,7 @@ class Config:
 
 
 # Convenience function for simple usage
-def load_config(env_path: Optional[Path] = None) -> Config:
+def load_config(env_path: Optional[Union[Path, IO[str]]] = None) -> Config:
     """
     Load configuration from environment.
 
@@ -328,7 +335,7 @@ def load_config(env_path: Optional[Path] = None) -> Config:
     by loading from environment variables.
 
     Args:
-        env_path: Optional path to .env file.
+        env_path: Optional path to .env file, or an open text stream.
 
     Returns:
         Configured Config instance.
@@ -11,6 +11,10 @@ from enum import Enum
 from threading import Lock
 from typing import Optional
 
+# Clock used for all health timestamps. Module-level so tests can
+# monkeypatch it with a fake clock.
+_now = time.time
+
 
 class ProviderStatus(Enum):
     """Health status for a provider."""
@@ -106,14 +110,25 @@ class HealthMonitor:
     ERROR_RATE_UNHEALTHY = 0.2  # 20% errors = unhealthy
     MIN_REQUESTS_FOR_STATUS = 10  # Minimum requests before evaluating
 
-    def __init__(self, window_size: int = 100):
+    def __init__(
+        self,
+        window_size: int = 100,
+        min_requests_for_status: Optional[int] = None,
+    ):
         """
         Initialize health monitor.
 
         Args:
             window_size: Number of recent requests to track per provider
+            min_requests_for_status: Requests needed before a status is
+                assigned (defaults to MIN_REQUESTS_FOR_STATUS)
         """
         self.window_size = window_size
+        self.min_requests_for_status = (
+            min_requests_for_status
+            if min_requests_for_status is not None
+            else self.MIN_REQUESTS_FOR_STATUS
+        )
         self._lock = Lock()
 
         # Per-provider request history (rolling window)
@@ -161,17 +176,12 @@ class HealthMonitor:
             success=success,
             status_code=status_code,
             latency_ms=latency_ms,
-            timestamp=time.time(),
+            timestamp=_now(),
             error_type=error_type,
         )
 
         with self._lock:
-            if provider not in self._history:
-                self._history[provider] = deque(maxlen=self.window_size)
-                self._total_counters[provider] = {
-                    "total": 0, "success": 0, "failed": 0,
-                    "rate_limited": 0, "timeout": 0,
-                }
+            self._ensure_provider(provider)
 
             self._history[provider].append(metrics)
 
@@ -188,6 +198,87 @@ class HealthMonitor:
                 if error_type == "timeout":
                     counters["timeout"] += 1
 
+    def record_batch(
+        self,
+        provider: str,
+        endpoint: str,
+        successes: int,
+        failures: int,
+        latency_ms: float,
+        status_code: Optional[int] = None,
+        error_type: Optional[str] = None,
+    ) -> None:
+        """
+        Record many requests for a provider under a single lock acquisition.
+
+        Successes are recorded before failures. Only the newest
+        window_size samples are materialized since older ones would be
+        evicted from the rolling window anyway.
+
+        Args:
+            provider: Provider name (fmp, polygon, fred)
+            endpoint: API endpoint called
+            successes: Number of successful requests
+            failures: Number of failed requests
+            latency_ms: Latency applied to every recorded request
+            status_code: HTTP status code of the failures (if any)
+            error_type: Type of error of the failures (if any)
+        """
+        total = successes + failures
+        if total <= 0:
+            return
+
+        now = _now()
+        kept_failures = min(failures, self.window_size)
+        kept_successes = min(successes, self.window_size - kept_failures)
+
+        samples = [
+            RequestMetrics(
+                provider=provider,
+                endpoint=endpoint,
+                success=True,
+                status_code=200,
+                latency_ms=latency_ms,
+                timestamp=now,
+            )
+            for _ in range(kept_successes)
+        ]
+        samples.extend(
+            RequestMetrics(
+                provider=provider,
+                endpoint=endpoint,
+                success=False,
+                status_code=status_code,
+                latency_ms=latency_ms,
+                timestamp=now,
+                error_type=error_type,
+            )
+            for _ in range(kept_failures)
+        )
+
+        with self._lock:
+            self._ensure_provider(provider)
+
+            self._history[provider].extend(samples)
+
+            counters = self._total_counters[provider]
+            counters["total"] += total
+            counters["success"] += successes
+            counters["failed"] += failures
+            if status_code == 429:
+                counters["rate_limited"] += failures
+            if error_type == "timeout":
+                counters["timeout"] += failures
+
+    def _ensure_provider(self, provider: str) -> None:
+        """Create tracking state for a new provider. Caller holds the lock."""
+        if provider not in self._history:
+            self._history[provider] = deque(maxlen=self.window_size)
+            self._total_counters[provider] = {
+                "total": 0, "success": 0, "failed": 0,
+                "rate_limited": 0, "timeout": 0,
+            }
+
     def get_provider_metrics(self, provider: str) -> ProviderMetrics:
         """
         Get aggregated metrics for a provider.
@@ -242,7 +333,7 @@ class HealthMonitor:
 
     def _determine_status(self, metrics: ProviderMetrics) -> ProviderStatus:
         """Determine health status based on metrics."""
-        if metrics.total_requests < self.MIN_REQUESTS_FOR_STATUS:
+        if metrics.total_requests < self.min_requests_for_status:
             return ProviderStatus.UNKNOWN
 
         if metrics.error_rate >= self.ERROR_RATE_UNHEALTHY:
@@ -261,7 +352,7 @@ class HealthMonitor:
             Dictionary with metrics for each provider and overall status
         """
         report = {
-            "timestamp": time.time(),
+            "timestamp": _now(),
             "providers": {},
             "overall_status": ProviderStatus.HEALTHY.value,
         }
@@ -342,7 +433,7 @@ class HealthMonitor:
             provider: Optional provider to reset, or None for all
         """
         with self._lock:
-            providers = [provider] if provider else ["fmp", "polygon", "fred"]
+            providers = [provider] if provider else list(self._history)
 
             for p in providers:
                 if p in self._history:
@@ -8,7 +8,7 @@ response parsing, and error normalization.
 import asyncio
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, ClassVar, Optional
 
 import aiohttp
 
@@ -23,7 +23,15 @@ class HttpMethod(Enum):
 
 
 class HttpError(Exception):
-    """Base exception for HTTP-related errors."""
+    """
+    Base exception for HTTP-related errors.
+
+    Each subclass sets ``kind``, a short error category that callers can
+    branch on (and record as a health error type) without an isinstance
+    chain.
+    """
+
+    kind: ClassVar[str] = "http_error"
 
     def __init__(self, message: str, status_code: Optional[int] = None, url: str = ""):
         super().__init__(message)
@@ -34,12 +42,14 @@ class HttpError(Exception):
 class TimeoutError(HttpError):
     """Request timed out."""
 
-    pass
+    kind: ClassVar[str] = "timeout"
 
 
 class RateLimitError(HttpError):
     """Rate limit exceeded (429)."""
 
+    kind: ClassVar[str] = "rate_limit"
+
     def __init__(self, message: str, retry_after: Optional[int] = None, url: str = ""):
         super().__init__(message, status_code=429, url=url)
         self.retry_after = retry_after
@@ -48,19 +58,19 @@ class RateLimitError(HttpError):
 class ServerError(HttpError):
     """Server error (5xx)."""
 
-    pass
+    kind: ClassVar[str] = "server_error"
 
 
 class ClientError(HttpError):
     """Client error (4xx, except 429)."""
 
-    pass
+    kind: ClassVar[str] = "client_error"
 
 
 class ConnectionError(HttpError):
     """Connection-related error."""
 
-    pass
+    kind: ClassVar[str] = "connection_error"
 
 
 @dataclass
@@ -131,6 +141,31 @@ class HttpClient:
         self.timeout = timeout
         self.default_headers = default_headers or {}
 
+    def create_session(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+    ) -> aiohttp.ClientSession:
+        """
+        Create a ClientSession whose connection pool enforces concurrency.
+
+        The TCPConnector caps open connections in aiohttp itself, so the
+        pool never holds more sockets than the callers can use.
+
+        Args:
+            limit: Maximum simultaneous connections (0 for unlimited).
+            limit_per_host: Maximum simultaneous connections per host
+                (0 for unlimited).
+
+        Returns:
+            New ClientSession; the caller owns it and must close it.
+        """
+        connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
     async def close(self) -> None:
         """Close the HTTP client. Currently a no-op as sessions are managed externally."""
         pass
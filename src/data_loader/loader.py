@@ -208,6 +208,27 @@ class DataLoader:
             health_monitor=self._health_monitor,
         )
 
+    def create_session(self) -> aiohttp.ClientSession:
+        """
+        Create a ClientSession sized to the configured provider limits.
+
+        The pool holds at most the sum of all provider concurrency limits,
+        and each provider host at most the largest single limit. The QoS
+        router still enforces the exact per-provider limits.
+
+        Returns:
+            New ClientSession; the caller owns it and must close it.
+        """
+        limits = [
+            self.config.fmp.max_concurrency,
+            self.config.polygon.max_concurrency,
+            self.config.fred.max_concurrency,
+        ]
+        return self._http_client.create_session(
+            limit=sum(limits),
+            limit_per_host=max(limits),
+        )
+
     @property
     def operating_mode(self) -> OperatingMode:
         """Get current operating mode."""
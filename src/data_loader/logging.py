@@ -7,10 +7,20 @@ All log output automatically redacts sensitive information.
 
 import logging
 import re
+import string
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
+# Maps hex digits to '1' and every other ASCII character to '0'
+_HEX_MASK = str.maketrans(
+    {chr(i): '1' if chr(i) in string.hexdigits else '0' for i in range(128)}
+)
+_HEX_RUN = '1' * 32
+
+# Standalone API key pattern (32+ hex chars); _apply_pattern pre-scans for it
+_HEX_KEY_PATTERN = re.compile(r'\b([a-fA-F0-9]{32,})\b')
+
 
 class SanitizingFormatter(logging.Formatter):
     """
@@ -38,7 +48,7 @@ class SanitizingFormatter(logging.Formatter):
         # Bearer tokens
         (re.compile(r'(Bearer\s+)([A-Za-z0-9\-_\.]+)', re.IGNORECASE), r'\1[REDACTED]'),
         # Standalone API key patterns (32+ hex chars)
-        (re.compile(r'\b([a-fA-F0-9]{32,})\b'), r'[REDACTED]'),
+        (_HEX_KEY_PATTERN, r'[REDACTED]'),
         # Known provider key patterns (adjust based on actual key formats)
         (re.compile(r'\b([a-zA-Z0-9]{20,}[a-zA-Z0-9\-_\.]*)\b'), lambda m: _redact_if_key_like(m)),
     ]
@@ -67,20 +77,69 @@ class SanitizingFormatter(logging.Formatter):
         # Format the message first
         formatted = super().format(record)
 
-        # Apply sanitization patterns
-        for pattern, replacement in self.PATTERNS:
-            if callable(replacement):
-                formatted = pattern.sub(replacement, formatted)
-            else:
-                formatted = pattern.sub(replacement, formatted)  # type: ignore[call-overload]
+        # Most log lines hold nothing a built-in pattern could match
+        if _may_contain_secret(formatted):
+            for pattern, replacement in self.PATTERNS:
+                formatted = _apply_pattern(pattern, replacement, formatted)
 
-        # Apply additional patterns
+        # Custom patterns have no known markers, so they always run
         for pattern, replacement in self.additional_patterns:
-            formatted = pattern.sub(replacement, formatted)
+            formatted = _apply_pattern(pattern, replacement, formatted)
 
         return formatted
 
 
+# Values that look key-like but are common non-secret text
+_KEY_LIKE_SKIP_PATTERNS = tuple(
+    re.compile(skip)
+    for skip in (
+        r'^https?://',  # URLs
+        r'^/[a-z]',  # File paths
+        r'^[a-z]+_[a-z]+$',  # snake_case identifiers
+        r'^[a-z]+[A-Z][a-z]+',  # camelCase identifiers
+        r'^\d+$',  # Pure numbers
+    )
+)
+
+# Shortest run the hex and key-like patterns can match
+_ALNUM_RUN = re.compile(r'[a-zA-Z0-9]{20}')
+
+
+def _may_contain_secret(message: str) -> bool:
+    """
+    Cheap pre-check for the built-in PATTERNS.
+
+    Returns False only when no built-in pattern can match: query and JSON
+    pairs need '=' or a quote, Bearer tokens need the word "bearer", and
+    standalone keys need a 20+ character alphanumeric run.
+    """
+    return (
+        '=' in message
+        or '"' in message
+        or "'" in message
+        or 'bearer' in message.lower()
+        or _ALNUM_RUN.search(message) is not None
+    )
+
+
+def _apply_pattern(pattern, replacement, text: str) -> str:
+    """
+    Apply one (pattern, replacement) pair to text.
+
+    The long-hex pattern only runs when the text holds a 32-character hex
+    run. Translating ASCII text to a hex mask and searching it is much
+    faster than walking the regex over long messages.
+    """
+    if (
+        pattern is _HEX_KEY_PATTERN
+        # Non-ASCII text would leave characters unmapped; let the regex decide
+        and text.isascii()
+        and _HEX_RUN not in text.translate(_HEX_MASK)
+    ):
+        return text
+    return pattern.sub(replacement, text)
+
+
 def _redact_if_key_like(match: re.Match) -> str:
     """
     Check if a matched string looks like an API key and redact if so.
@@ -93,16 +152,8 @@ def _redact_if_key_like(match: re.Match) -> str:
     value = match.group(1)
 
     # Skip if it looks like a common word or path
-    skip_patterns = [
-        r'^https?://',  # URLs
-        r'^/[a-z]',  # File paths
-        r'^[a-z]+_[a-z]+$',  # snake_case identifiers
-        r'^[a-z]+[A-Z][a-z]+',  # camelCase identifiers
-        r'^\d+$',  # Pure numbers
-    ]
-
-    for skip in skip_patterns:
-        if re.match(skip, value):
+    for skip in _KEY_LIKE_SKIP_PATTERNS:
+        if skip.match(value):
             return value
 
     # Check if it has characteristics of an API key
@@ -129,13 +180,13 @@ def sanitize_message(message: str) -> str:
     Returns:
         Sanitized message with sensitive data redacted
     """
+    if not _may_contain_secret(message):
+        return message
+
     result = message
 
     for pattern, replacement in SanitizingFormatter.PATTERNS:
-        if callable(replacement):
-            result = pattern.sub(replacement, result)
-        else:
-            result = pattern.sub(replacement, result)  # type: ignore[call-overload]
+        result = _apply_pattern(pattern, replacement, result)
 
     return result
 
@@ -226,13 +277,16 @@ class LoggerMixin:
 
     Usage:
         class MyClass(LoggerMixin):
-            def do_something(self):
-                self.logger.info("Doing something")
+            def do_something(self, symbol):
+                self.logger.info("Doing something for %s", symbol)
     """
 
-    @property
-    def logger(self) -> logging.Logger:
-        """Get logger for this class."""
-        if not hasattr(self, '_logger'):
-            self._logger = get_logger(self.__class__.__name__)
-        return self._logger
+    # Bound here and once per subclass, so self.logger is a plain class
+    # attribute. Pass values as %-style arguments rather than pre-formatting
+    # them with f-strings, so records filtered out by level are never
+    # interpolated or sanitized.
+    logger: logging.Logger = get_logger("LoggerMixin")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(cls.__name__)
@@ -9,6 +9,7 @@ import hashlib
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Optional
 
 import aiohttp
@@ -16,7 +17,28 @@ import aiohttp
 from ..cache import CacheManager
 from ..config import ProviderConfig
 from ..health import HealthMonitor
-from ..http_client import HttpClient, HttpError, HttpResponse, RateLimitError
+from ..http_client import HttpClient, HttpError, HttpResponse
+
+
+@lru_cache(maxsize=4096)
+def _build_cache_key(prefix: str, items: tuple[tuple[str, str], ...]) -> str:
+    """
+    Build a cache key from a prefix and sorted (name, value) pairs.
+
+    Memoized, since the same endpoint/parameter combinations are requested
+    repeatedly.
+    """
+    param_str = "_".join(f"{k}={v}" for k, v in items)
+
+    key = f"{prefix}_{param_str}" if param_str else prefix
+
+    # Hash if too long (BLAKE2b is faster than MD5 and only used for
+    # cache keys, not security)
+    if len(key) > 200:
+        hash_val = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        key = f"{prefix}_{hash_val}"
+
+    return key
 
 
 @dataclass
@@ -192,18 +214,10 @@ class BaseDataProvider(ABC):
         Returns:
             Cache key string
         """
-        # Sort params for consistent ordering
-        sorted_params = sorted(params.items())
-        param_str = "_".join(f"{k}={v}" for k, v in sorted_params if v is not None)
-
-        key = f"{prefix}_{param_str}" if param_str else prefix
-
-        # Hash if too long (MD5 used only for cache keys, not security)
-        if len(key) > 200:
-            hash_val = hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()[:16]
-            key = f"{prefix}_{hash_val}"
-
-        return key
+        # Sort params for consistent ordering. Values are stringified so
+        # the memoization key is hashable and 1/True/1.0 stay distinct.
+        items = tuple(sorted((k, str(v)) for k, v in params.items() if v is not None))
+        return _build_cache_key(prefix, items)
 
     async def get(
         self,
@@ -277,40 +291,29 @@ class BaseDataProvider(ABC):
                 raw_response=response.data,
             )
 
-        except RateLimitError as e:
-            elapsed_ms = (time.perf_counter() - start_time) * 1000
-            self.health_monitor.record_failure(
-                provider=self.provider_name,
-                endpoint=endpoint,
-                latency_ms=elapsed_ms,
-                status_code=429,
-                error_type="rate_limit",
-            )
-            return ProviderResponse(
-                success=False,
-                data=None,
-                provider=self.provider_name,
-                endpoint=endpoint,
-                latency_ms=elapsed_ms,
-                error=f"Rate limit exceeded. Retry after: {e.retry_after}s",
-            )
-
         except HttpError as e:
+            # One handler for every HTTP failure; the subclass's kind is
+            # the health error type and picks the message
             elapsed_ms = (time.perf_counter() - start_time) * 1000
             self.health_monitor.record_failure(
                 provider=self.provider_name,
                 endpoint=endpoint,
                 latency_ms=elapsed_ms,
                 status_code=e.status_code,
-                error_type=type(e).__name__.lower(),
+                error_type=e.kind,
             )
+            if e.kind == "rate_limit":
+                retry_after = getattr(e, "retry_after", None)
+                error = f"Rate limit exceeded. Retry after: {retry_after}s"
+            else:
+                error = str(e)
             return ProviderResponse(
                 success=False,
                 data=None,
                 provider=self.provider_name,
                 endpoint=endpoint,
                 latency_ms=elapsed_ms,
-                error=str(e),
+                error=error,
             )
 
         except Exception as e:
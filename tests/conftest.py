@@ -7,11 +7,13 @@ Shared pytest fixtures and configuration for all test types.
 import os
 import sys
 import tempfile
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import aiohttp
 import pytest
+import pytest_asyncio
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -30,6 +32,9 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "fmp: Tests for FMP provider")
     config.addinivalue_line("markers", "polygon: Tests for Polygon provider")
     config.addinivalue_line("markers", "fred: Tests for FRED provider")
+    config.addinivalue_line(
+        "markers", "xdist_group(name): Keep tests on the same pytest-xdist worker"
+    )
 
 
 # =============================================================================
@@ -65,11 +70,29 @@ def test_env() -> Generator[dict, None, None]:
             os.environ[k] = v
 
 
+@pytest.fixture(scope="module")
+def no_dotenv(tmp_path_factory: pytest.TempPathFactory) -> Generator[None, None, None]:
+    """
+    Stop Config.from_env() from loading the project's .env file.
+
+    Points NEXUS_DOTENV_PATH at a file that doesn't exist for the whole
+    module, instead of renaming the real .env on disk.
+    """
+    missing = tmp_path_factory.mktemp("nexus_dotenv_") / "missing.env"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("NEXUS_DOTENV_PATH", str(missing))
+        yield
+
+
 @pytest.fixture
-def temp_cache_dir() -> Generator[Path, None, None]:
-    """Provide a temporary directory for cache testing."""
-    with tempfile.TemporaryDirectory(prefix="nexus_test_cache_") as tmpdir:
-        yield Path(tmpdir)
+def temp_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Provide a temporary directory for cache testing.
+
+    Uses tmp_path_factory so each pytest-xdist worker gets its own
+    base temp directory and parallel runs never share cache files.
+    """
+    return tmp_path_factory.mktemp("nexus_test_cache_")
 
 
 @pytest.fixture
@@ -79,6 +102,33 @@ def temp_log_dir() -> Generator[Path, None, None]:
         yield Path(tmpdir)
 
 
+# =============================================================================
+# Clock Fixtures
+# =============================================================================
+
+class FakeClock:
+    """Manually advanced clock standing in for time.time()."""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Drive circuit breaker timing from a fake clock."""
+    from data_loader import circuit_breaker
+
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "_now", clock)
+    return clock
+
+
 # =============================================================================
 # Mock Session Fixtures
 # =============================================================================
@@ -153,8 +203,42 @@ def sample_fred_series() -> dict:
 # Async Fixtures
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def event_loop_policy():
-    """Return the default event loop policy."""
-    import asyncio
-    return asyncio.DefaultEventLoopPolicy()
+    """
+    Return the event loop policy, preferring uvloop when it is installed.
+
+    Session-scoped (as in pytest-asyncio itself) so tests can opt into a
+    shared loop with @pytest.mark.asyncio(loop_scope="session").
+    """
+    try:
+        import uvloop
+    except ImportError:
+        import asyncio
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+class NoNetworkConnector(aiohttp.BaseConnector):
+    """
+    Connector that never opens sockets.
+
+    aioresponses intercepts requests before they reach the connector, so
+    mocked tests skip the DNS resolver and SSL context a TCPConnector sets
+    up, and an unmocked request fails fast instead of touching the network.
+    """
+
+    async def _create_connection(self, req, traces, timeout):
+        raise aiohttp.ClientConnectionError(f"Unmocked request in tests: {req.method} {req.url}")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def shared_session() -> AsyncGenerator[aiohttp.ClientSession, None]:
+    """
+    One aiohttp session per test module for mocked provider requests.
+
+    Tests using it must run on the session loop:
+    @pytest.mark.asyncio(loop_scope="session").
+    """
+    async with aiohttp.ClientSession(connector=NoNetworkConnector()) as session:
+        yield session
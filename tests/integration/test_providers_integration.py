@@ -5,6 +5,7 @@ These tests verify that providers work correctly together with
 the caching, health monitoring, and HTTP client components.
 """
 
+import asyncio
 import re
 
 import aiohttp
@@ -23,9 +24,13 @@ from data_loader.providers import (
 
 
 @pytest.fixture
-def shared_health_monitor():
-    """Shared health monitor across all providers."""
-    return HealthMonitor()
+def shared_health_monitor(request):
+    """
+    Shared health monitor across all providers.
+
+    Parametrize indirectly with an int to lower min_requests_for_status.
+    """
+    return HealthMonitor(min_requests_for_status=getattr(request, "param", None))
 
 
 @pytest.fixture
@@ -88,6 +93,7 @@ def fred_provider(http_client, shared_cache, shared_health_monitor):
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestProvidersSharedHealthMonitor")
 class TestProvidersSharedHealthMonitor:
     """Test that providers correctly share health monitoring."""
 
@@ -117,6 +123,7 @@ class TestProvidersSharedHealthMonitor:
         assert report["providers"]["fred"]["total_requests"] == 1
 
     @pytest.mark.asyncio
+    @pytest.mark.parametrize("shared_health_monitor", [3], indirect=True)
     async def test_overall_health_degrades_on_errors(
         self, fmp_provider, polygon_provider, shared_health_monitor
     ):
@@ -126,24 +133,24 @@ class TestProvidersSharedHealthMonitor:
 
         with aioresponses() as m:
             # FMP succeeds
-            for _ in range(15):
+            for _ in range(3):
                 m.get(fmp_url, payload=[{"symbol": "AAPL"}], status=200)
 
             # Polygon fails with high error rate
-            for _ in range(10):
+            for _ in range(3):
                 m.get(polygon_url, payload={"status": "OK", "results": []}, status=200)
-            for _ in range(5):
+            for _ in range(2):
                 m.get(polygon_url, status=500)
 
             async with aiohttp.ClientSession() as session:
                 # FMP requests - all success
-                for _ in range(15):
+                for _ in range(3):
                     await fmp_provider.get(
                         session, "profile", symbol="AAPL", use_cache=False
                     )
 
                 # Polygon requests - mixed results
-                for _i in range(15):
+                for _i in range(5):
                     await polygon_provider.get(
                         session, "trades", symbol="SPY", use_cache=False
                     )
@@ -158,6 +165,7 @@ class TestProvidersSharedHealthMonitor:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestProvidersSharedCache")
 class TestProvidersSharedCache:
     """Test that providers correctly use shared cache."""
 
@@ -203,6 +211,7 @@ class TestProvidersSharedCache:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestMultiProviderWorkflow")
 class TestMultiProviderWorkflow:
     """Test realistic multi-provider data fetching workflows."""
 
@@ -264,8 +273,6 @@ class TestMultiProviderWorkflow:
         self, fmp_provider, polygon_provider, fred_provider
     ):
         """Test concurrent requests to multiple providers."""
-        import asyncio
-
         fmp_url = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
         polygon_url = re.compile(r'https://api\.polygon\.io/v2/aggs/ticker/SPY/range/.*')
         fred_url = re.compile(r'https://api\.stlouisfed\.org/fred/series/observations.*')
@@ -294,6 +301,7 @@ class TestMultiProviderWorkflow:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestProviderErrorRecovery")
 class TestProviderErrorRecovery:
     """Test error handling and recovery across providers."""
 
@@ -20,7 +20,26 @@ from data_loader.qos_router import QoSSemaphoreRouter
 from data_loader.retry import RetryConfig, RetryError, RetryHandler
 
 
+async def run_with_cb_retry(cb, retry_handler, fn, *args):
+    """Execute fn through a circuit breaker and retry handler.
+
+    Only an exhausted retry counts as a circuit breaker failure; transient
+    errors that are retried successfully are not recorded.
+    """
+    if not cb.can_execute():
+        raise CircuitBreakerError("Open", cb.state, cb.provider)
+
+    try:
+        result = await retry_handler.execute(fn, *args)
+        cb.record_success()
+        return result
+    except RetryError:
+        cb.record_failure()
+        raise
+
+
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestQoSWithRetry")
 class TestQoSWithRetry:
     """Test QoS Router combined with Retry Handler."""
 
@@ -54,19 +73,16 @@ class TestQoSWithRetry:
 
         max_concurrent = 0
         current_concurrent = 0
-        lock = asyncio.Lock()
 
         async def tracked_call():
             nonlocal max_concurrent, current_concurrent
-            async with lock:
-                current_concurrent += 1
-                if current_concurrent > max_concurrent:
-                    max_concurrent = current_concurrent
+            # No await between read and write, so no lock is needed
+            current_concurrent += 1
+            max_concurrent = max(max_concurrent, current_concurrent)
 
             await asyncio.sleep(0.02)
 
-            async with lock:
-                current_concurrent -= 1
+            current_concurrent -= 1
 
             return "done"
 
@@ -111,6 +127,7 @@ class TestQoSWithRetry:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestCircuitBreakerWithRetry")
 class TestCircuitBreakerWithRetry:
     """Test Circuit Breaker combined with Retry Handler."""
 
@@ -123,19 +140,7 @@ class TestCircuitBreakerWithRetry:
         async def api_call():
             return "data"
 
-        async def with_both():
-            if not cb.can_execute():
-                raise CircuitBreakerError("Open", cb.state, "test")
-
-            try:
-                result = await retry_handler.execute(api_call)
-                cb.record_success()
-                return result
-            except Exception:
-                cb.record_failure()
-                raise
-
-        result = await with_both()
+        result = await run_with_cb_retry(cb, retry_handler, api_call)
         assert result == "data"
         assert cb.state == CircuitState.CLOSED
 
@@ -157,22 +162,7 @@ class TestCircuitBreakerWithRetry:
                 raise ValueError("Temporary error")
             return "success"
 
-        async def with_both():
-            if not cb.can_execute():
-                raise CircuitBreakerError("Open", cb.state, "test")
-
-            try:
-                result = await retry_handler.execute(flaky_then_success)
-                cb.record_success()
-                return result
-            except RetryError:
-                cb.record_failure()
-                raise
-            except Exception:
-                # Don't record failure for retryable errors
-                raise
-
-        result = await with_both()
+        result = await run_with_cb_retry(cb, retry_handler, flaky_then_success)
         assert result == "success"
         assert call_count == 3
 
@@ -193,28 +183,17 @@ class TestCircuitBreakerWithRetry:
         async def always_fails():
             raise ValueError("Always fails")
 
-        async def with_both():
-            if not cb.can_execute():
-                raise CircuitBreakerError("Open", cb.state, "test")
-
-            try:
-                result = await retry_handler.execute(always_fails)
-                cb.record_success()
-                return result
-            except RetryError:
-                cb.record_failure()
-                raise
-
         # Multiple failed attempts
         for _ in range(3):
             with contextlib.suppress(RetryError):
-                await with_both()
+                await run_with_cb_retry(cb, retry_handler, always_fails)
 
         # Circuit should now be open
         assert cb.state == CircuitState.OPEN
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestAllResilienceComponents")
 class TestAllResilienceComponents:
     """Test all resilience components working together."""
 
@@ -272,7 +251,6 @@ class TestAllResilienceComponents:
         retry_handler = RetryHandler(RetryConfig(max_retries=1, base_delay=0.01))
 
         completed = []
-        lock = asyncio.Lock()
 
         async def api_call(request_id: int):
             await asyncio.sleep(0.02)  # Simulate API latency
@@ -286,8 +264,8 @@ class TestAllResilienceComponents:
                 result = await retry_handler.execute(api_call, request_id)
                 cb_manager.record_success("api")
 
-                async with lock:
-                    completed.append(result)
+                # Single-threaded event loop: append needs no lock
+                completed.append(result)
 
                 return result
 
@@ -324,19 +302,17 @@ class TestAllResilienceComponents:
             nonlocal success_count, circuit_open_count
 
             async with router.acquire("api"):
-                if not cb.can_execute():
+                try:
+                    result = await run_with_cb_retry(cb, retry_handler, unstable_api)
+                except CircuitBreakerError:
                     circuit_open_count += 1
                     return "circuit_open"
-
-                try:
-                    result = await retry_handler.execute(unstable_api)
-                    cb.record_success()
-                    success_count += 1
-                    return result
                 except RetryError:
-                    cb.record_failure()
                     return "failed"
 
+                success_count += 1
+                return result
+
         # Make requests
         results = []
         for _ in range(10):
@@ -377,11 +353,12 @@ class TestAllResilienceComponents:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("TestResilienceRecovery")
 class TestResilienceRecovery:
     """Test recovery scenarios for resilience components."""
 
     @pytest.mark.asyncio
-    async def test_circuit_recovery_with_retries(self):
+    async def test_circuit_recovery_with_retries(self, fake_clock):
         """Test circuit breaker recovery using retry handler."""
         cb = CircuitBreaker("test", CircuitBreakerConfig(
             min_requests=3,
@@ -398,7 +375,7 @@ class TestResilienceRecovery:
         assert cb.state == CircuitState.OPEN
 
         # Wait for recovery timeout
-        await asyncio.sleep(0.06)
+        fake_clock.advance(0.06)
 
         # Circuit should be half-open
         assert cb.state == CircuitState.HALF_OPEN
@@ -0,0 +1,28 @@
+"""
+Shared fixtures for unit tests.
+"""
+
+import pytest
+
+from data_loader.cache import CacheManager
+from data_loader.http_client import HttpClient
+
+
+@pytest.fixture(scope="session")
+def http_client() -> HttpClient:
+    """HttpClient shared by the provider unit tests; it holds no per-request state."""
+    return HttpClient(timeout=30.0)
+
+
+@pytest.fixture(scope="session")
+def prewarmed_cache(tmp_path_factory: pytest.TempPathFactory) -> CacheManager:
+    """
+    CacheManager populated once with the entries the provider cache-hit tests read.
+
+    Treat it as read-only; tests that write entries or expect a miss use
+    their module's cache_manager instead.
+    """
+    cache = CacheManager(base_dir=tmp_path_factory.mktemp("prewarmed_cache"), ttl_days=7)
+    cache.set("fmp", "profile_symbol=AAPL", {"symbol": "AAPL", "cached": True})
+    cache.set("fred", "series_series_id=CPIAUCSL", {"count": 10, "cached": True})
+    return cache
@@ -2,9 +2,6 @@
 Unit tests for the base data provider.
 """
 
-from unittest.mock import AsyncMock
-
-import aiohttp
 import pytest
 
 from data_loader.cache import CacheManager
@@ -12,14 +9,38 @@ from data_loader.config import ProviderConfig
 from data_loader.health import HealthMonitor
 from data_loader.http_client import (
     ClientError,
-    HttpClient,
+    HttpError,
     HttpResponse,
     RateLimitError,
     ServerError,
+    TimeoutError,
 )
 from data_loader.providers.base import BaseDataProvider, ProviderResponse
 
 
+def async_return(value):
+    """
+    Build a coroutine function that always returns ``value``.
+
+    Tests install it as ``fetch``. ``BaseDataProvider.get`` only hands the
+    session through to ``fetch``, so ``None`` stands in for a ClientSession.
+    """
+
+    async def _fetch(*args, **kwargs):
+        return value
+
+    return _fetch
+
+
+def async_raise(exc):
+    """Build a coroutine function that always raises ``exc``."""
+
+    async def _fetch(*args, **kwargs):
+        raise exc
+
+    return _fetch
+
+
 class MockProvider(BaseDataProvider):
     """Concrete implementation for testing."""
 
@@ -42,7 +63,7 @@ class MockProvider(BaseDataProvider):
         return ["test_endpoint", "another_endpoint"]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def provider_config():
     return ProviderConfig(
         api_key="test_api_key",
@@ -52,21 +73,23 @@ def provider_config():
     )
 
 
-@pytest.fixture
-def http_client():
-    return HttpClient(timeout=30.0)
-
-
 @pytest.fixture
 def cache_manager(temp_cache_dir):
     return CacheManager(base_dir=temp_cache_dir, ttl_days=7)
 
 
-@pytest.fixture
-def health_monitor():
+@pytest.fixture(scope="module")
+def _module_health_monitor():
     return HealthMonitor()
 
 
+@pytest.fixture
+def health_monitor(_module_health_monitor):
+    # Shared across the module; clear the mock provider's metrics per test
+    _module_health_monitor.reset("mock")
+    return _module_health_monitor
+
+
 @pytest.fixture
 def provider(provider_config, http_client, cache_manager, health_monitor):
     return MockProvider(
@@ -165,6 +188,12 @@ class TestBaseDataProvider:
         long_params = {f"param{i}": f"value{i}" * 20 for i in range(20)}
         key = provider._generate_cache_key("endpoint", **long_params)
         assert len(key) <= 200 + len("endpoint_")
+        assert key == provider._generate_cache_key("endpoint", **long_params)
+        assert key.startswith("endpoint_") and len(key) == len("endpoint_") + 16
+
+    def test_generate_cache_key_distinguishes_value_types(self, provider):
+        assert provider._generate_cache_key("ep", flag=1) == "ep_flag=1"
+        assert provider._generate_cache_key("ep", flag=True) == "ep_flag=True"
 
     def test_cache_key(self, provider):
         key = provider.cache_key("test_endpoint", symbol="AAPL")
@@ -183,7 +212,7 @@ class TestBaseDataProvider:
         assert provider.validate_endpoint("invalid_endpoint") is False
 
     @pytest.mark.asyncio
-    async def test_get_success(self, provider, cache_manager):
+    async def test_get_success(self, provider, cache_manager, monkeypatch):
         # Mock the fetch method
         mock_response = HttpResponse(
             status=200,
@@ -192,10 +221,9 @@ class TestBaseDataProvider:
             url="https://api.example.com/test",
             elapsed_ms=100.0,
         )
-        provider.fetch = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(provider, "fetch", async_return(mock_response))
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(session, "test_endpoint", symbol="AAPL")
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
 
         assert response.success is True
         assert response.data == {"symbol": "AAPL", "price": 185.50}
@@ -207,15 +235,14 @@ class TestBaseDataProvider:
         # Pre-populate cache
         cache_manager.set("mock", "test_endpoint_symbol=AAPL", {"cached": True})
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(session, "test_endpoint", symbol="AAPL")
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
 
         assert response.success is True
         assert response.data == {"cached": True}
         assert response.from_cache is True
 
     @pytest.mark.asyncio
-    async def test_get_bypass_cache(self, provider, cache_manager):
+    async def test_get_bypass_cache(self, provider, cache_manager, monkeypatch):
         # Pre-populate cache
         cache_manager.set("mock", "test_endpoint_symbol=AAPL", {"cached": True})
 
@@ -227,19 +254,18 @@ class TestBaseDataProvider:
             url="https://api.example.com/test",
             elapsed_ms=100.0,
         )
-        provider.fetch = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(provider, "fetch", async_return(mock_response))
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(
-                session, "test_endpoint", use_cache=False, symbol="AAPL"
-            )
+        response = await provider.get(
+            None, "test_endpoint", use_cache=False, symbol="AAPL"
+        )
 
         assert response.success is True
         assert response.data == {"fresh": True}
         assert response.from_cache is False
 
     @pytest.mark.asyncio
-    async def test_get_caches_result(self, provider, cache_manager):
+    async def test_get_caches_result(self, provider, cache_manager, monkeypatch):
         mock_response = HttpResponse(
             status=200,
             data={"new_data": True},
@@ -247,10 +273,9 @@ class TestBaseDataProvider:
             url="https://api.example.com/test",
             elapsed_ms=100.0,
         )
-        provider.fetch = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(provider, "fetch", async_return(mock_response))
 
-        async with aiohttp.ClientSession() as session:
-            await provider.get(session, "test_endpoint", symbol="AAPL")
+        await provider.get(None, "test_endpoint", symbol="AAPL")
 
         # Check cache was populated
         cached = cache_manager.get("mock", "test_endpoint_symbol=AAPL")
@@ -258,13 +283,12 @@ class TestBaseDataProvider:
         assert cached.data == {"new_data": True}
 
     @pytest.mark.asyncio
-    async def test_get_rate_limit_error(self, provider, health_monitor):
-        provider.fetch = AsyncMock(side_effect=RateLimitError(
+    async def test_get_rate_limit_error(self, provider, health_monitor, monkeypatch):
+        monkeypatch.setattr(provider, "fetch", async_raise(RateLimitError(
             "Rate limited", retry_after=60, url="https://api.example.com"
-        ))
+        )))
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(session, "test_endpoint", symbol="AAPL")
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
 
         assert response.success is False
         assert "Rate limit" in response.error
@@ -276,38 +300,70 @@ class TestBaseDataProvider:
         assert metrics.rate_limited_requests == 1
 
     @pytest.mark.asyncio
-    async def test_get_server_error(self, provider, health_monitor):
-        provider.fetch = AsyncMock(side_effect=ServerError(
+    async def test_get_server_error(self, provider, health_monitor, monkeypatch):
+        monkeypatch.setattr(provider, "fetch", async_raise(ServerError(
             "Server error", status_code=500, url="https://api.example.com"
-        ))
+        )))
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(session, "test_endpoint", symbol="AAPL")
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
 
         assert response.success is False
         assert "Server error" in response.error
 
         metrics = health_monitor.get_provider_metrics("mock")
         assert metrics.failed_requests == 1
+        assert metrics.last_error_type == "server_error"
 
     @pytest.mark.asyncio
-    async def test_get_client_error(self, provider, health_monitor):
-        provider.fetch = AsyncMock(side_effect=ClientError(
+    async def test_get_client_error(self, provider, health_monitor, monkeypatch):
+        monkeypatch.setattr(provider, "fetch", async_raise(ClientError(
             "Not found", status_code=404, url="https://api.example.com"
-        ))
+        )))
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(session, "test_endpoint", symbol="AAPL")
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
 
         assert response.success is False
         assert "Not found" in response.error
 
+        metrics = health_monitor.get_provider_metrics("mock")
+        assert metrics.failed_requests == 1
+        assert metrics.last_error_type == "client_error"
+
+    @pytest.mark.asyncio
+    async def test_get_generic_http_error(self, provider, health_monitor, monkeypatch):
+        monkeypatch.setattr(provider, "fetch", async_raise(HttpError(
+            "HTTP client error: payload error", url="https://api.example.com"
+        )))
+
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
+
+        assert response.success is False
+        assert "payload error" in response.error
+
+        metrics = health_monitor.get_provider_metrics("mock")
+        assert metrics.failed_requests == 1
+        assert metrics.last_error_type == "http_error"
+
+    @pytest.mark.asyncio
+    async def test_get_timeout_error(self, provider, health_monitor, monkeypatch):
+        monkeypatch.setattr(provider, "fetch", async_raise(TimeoutError(
+            "Request timed out after 30.0s", url="https://api.example.com"
+        )))
+
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
+
+        assert response.success is False
+        assert "timed out" in response.error
+
+        metrics = health_monitor.get_provider_metrics("mock")
+        assert metrics.timeout_requests == 1
+        assert metrics.last_error_type == "timeout"
+
     @pytest.mark.asyncio
-    async def test_get_unexpected_error(self, provider, health_monitor):
-        provider.fetch = AsyncMock(side_effect=ValueError("Unexpected"))
+    async def test_get_unexpected_error(self, provider, health_monitor, monkeypatch):
+        monkeypatch.setattr(provider, "fetch", async_raise(ValueError("Unexpected")))
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(session, "test_endpoint", symbol="AAPL")
+        response = await provider.get(None, "test_endpoint", symbol="AAPL")
 
         assert response.success is False
         assert "Unexpected" in response.error
@@ -316,7 +372,7 @@ class TestBaseDataProvider:
         assert metrics.failed_requests == 1
 
     @pytest.mark.asyncio
-    async def test_get_records_health_metrics(self, provider, health_monitor):
+    async def test_get_records_health_metrics(self, provider, health_monitor, monkeypatch):
         mock_response = HttpResponse(
             status=200,
             data={"data": True},
@@ -324,17 +380,16 @@ class TestBaseDataProvider:
             url="https://api.example.com/test",
             elapsed_ms=100.0,
         )
-        provider.fetch = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(provider, "fetch", async_return(mock_response))
 
-        async with aiohttp.ClientSession() as session:
-            await provider.get(session, "test_endpoint", symbol="AAPL")
+        await provider.get(None, "test_endpoint", symbol="AAPL")
 
         metrics = health_monitor.get_provider_metrics("mock")
         assert metrics.total_requests == 1
         assert metrics.successful_requests == 1
 
     @pytest.mark.asyncio
-    async def test_get_includes_raw_response(self, provider):
+    async def test_get_includes_raw_response(self, provider, monkeypatch):
         raw_data = {"raw": "response", "nested": {"data": True}}
         mock_response = HttpResponse(
             status=200,
@@ -343,10 +398,9 @@ class TestBaseDataProvider:
             url="https://api.example.com/test",
             elapsed_ms=100.0,
         )
-        provider.fetch = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(provider, "fetch", async_return(mock_response))
 
-        async with aiohttp.ClientSession() as session:
-            response = await provider.get(session, "test_endpoint")
+        response = await provider.get(None, "test_endpoint")
 
         assert response.raw_response == raw_data
 
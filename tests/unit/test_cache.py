@@ -3,11 +3,24 @@ Unit tests for the cache manager.
 """
 
 import json
+import math
+import shutil
 import time
 
 import pytest
 
-from data_loader.cache import CacheEntry, CacheManager
+from data_loader import cache as cache_module
+from data_loader.cache import CacheEntry, CacheManager, DictBackend, FileBackend
+
+
+@pytest.fixture
+def memory_cache(temp_cache_dir):
+    """
+    Cache manager backed by an in-memory DictBackend.
+
+    Use for tests that don't inspect the on-disk format.
+    """
+    return CacheManager(base_dir=temp_cache_dir, storage_backend=DictBackend())
 
 
 @pytest.mark.unit
@@ -49,6 +62,18 @@ class TestCacheEntry:
         )
         assert entry.is_expired is True
 
+    def test_is_expired_at(self):
+        entry = CacheEntry(
+            data={},
+            timestamp=1000.0,
+            ttl_days=1,
+            provider="fmp",
+            key="test",
+        )
+        assert entry.expires_timestamp == 1000.0 + 86400
+        assert entry.is_expired_at(1000.0 + 86400) is False
+        assert entry.is_expired_at(1000.0 + 86401) is True
+
     def test_age_seconds(self):
         # Create entry 1 hour ago
         one_hour_ago = time.time() - 3600
@@ -108,6 +133,10 @@ class TestCacheEntry:
         assert entry.provider == "polygon"
         assert entry.key == "aggs_SPY"
 
+    def test_uses_slots(self):
+        entry = CacheEntry(data={}, timestamp=0.0, ttl_days=7, provider="fmp", key="k")
+        assert not hasattr(entry, "__dict__")
+
     def test_roundtrip(self):
         original = CacheEntry(
             data={"complex": [1, 2, {"nested": True}]},
@@ -138,22 +167,20 @@ class TestCacheManager:
         cache = CacheManager(base_dir=temp_cache_dir, enabled=False)
         assert cache.enabled is False
 
-    def test_set_and_get(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
+    def test_set_and_get(self, memory_cache):
         data = {"symbol": "AAPL", "price": 185.50}
 
-        success = cache.set("fmp", "profile_AAPL", data)
+        success = memory_cache.set("fmp", "profile_AAPL", data)
         assert success is True
 
-        entry = cache.get("fmp", "profile_AAPL")
+        entry = memory_cache.get("fmp", "profile_AAPL")
         assert entry is not None
         assert entry.data == data
         assert entry.provider == "fmp"
         assert entry.key == "profile_AAPL"
 
-    def test_get_nonexistent(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
-        entry = cache.get("fmp", "nonexistent")
+    def test_get_nonexistent(self, memory_cache):
+        entry = memory_cache.get("fmp", "nonexistent")
         assert entry is None
 
     def test_get_expired(self, temp_cache_dir):
@@ -201,48 +228,41 @@ class TestCacheManager:
         assert entry is not None
         assert entry.data == {"old": True}
 
-    def test_delete(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
-
-        cache.set("fmp", "to_delete", {"data": True})
-        assert cache.exists("fmp", "to_delete") is True
+    def test_delete(self, memory_cache):
+        memory_cache.set("fmp", "to_delete", {"data": True})
+        assert memory_cache.exists("fmp", "to_delete") is True
 
-        result = cache.delete("fmp", "to_delete")
+        result = memory_cache.delete("fmp", "to_delete")
         assert result is True
-        assert cache.exists("fmp", "to_delete") is False
+        assert memory_cache.exists("fmp", "to_delete") is False
 
-    def test_delete_nonexistent(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
-        result = cache.delete("fmp", "nonexistent")
+    def test_delete_nonexistent(self, memory_cache):
+        result = memory_cache.delete("fmp", "nonexistent")
         assert result is False
 
-    def test_clear_provider(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
-
-        cache.set("fmp", "key1", {"a": 1})
-        cache.set("fmp", "key2", {"b": 2})
-        cache.set("polygon", "key3", {"c": 3})
+    def test_clear_provider(self, memory_cache):
+        memory_cache.set("fmp", "key1", {"a": 1})
+        memory_cache.set("fmp", "key2", {"b": 2})
+        memory_cache.set("polygon", "key3", {"c": 3})
 
-        count = cache.clear_provider("fmp")
+        count = memory_cache.clear_provider("fmp")
         assert count == 2
 
-        assert cache.exists("fmp", "key1") is False
-        assert cache.exists("fmp", "key2") is False
-        assert cache.exists("polygon", "key3") is True
-
-    def test_clear_all(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
+        assert memory_cache.exists("fmp", "key1") is False
+        assert memory_cache.exists("fmp", "key2") is False
+        assert memory_cache.exists("polygon", "key3") is True
 
-        cache.set("fmp", "key1", {})
-        cache.set("polygon", "key2", {})
-        cache.set("fred", "key3", {})
+    def test_clear_all(self, memory_cache):
+        memory_cache.set("fmp", "key1", {})
+        memory_cache.set("polygon", "key2", {})
+        memory_cache.set("fred", "key3", {})
 
-        count = cache.clear_all()
+        count = memory_cache.clear_all()
         assert count == 3
 
-        assert cache.exists("fmp", "key1") is False
-        assert cache.exists("polygon", "key2") is False
-        assert cache.exists("fred", "key3") is False
+        assert memory_cache.exists("fmp", "key1") is False
+        assert memory_cache.exists("polygon", "key2") is False
+        assert memory_cache.exists("fred", "key3") is False
 
     def test_clear_expired(self, temp_cache_dir):
         cache = CacheManager(base_dir=temp_cache_dir, ttl_days=1)
@@ -268,28 +288,44 @@ class TestCacheManager:
         assert cache.exists("fmp", "valid") is True
         assert cache.exists("fmp", "expired") is False
 
-    def test_exists(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
+    def test_set_stores_expiry_as_mtime(self, temp_cache_dir):
+        cache = CacheManager(base_dir=temp_cache_dir, ttl_days=1)
 
-        assert cache.exists("fmp", "test") is False
-        cache.set("fmp", "test", {})
-        assert cache.exists("fmp", "test") is True
+        cache.set("fmp", "deadline", {"data": True})
 
-    def test_is_valid(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir, ttl_days=7)
+        entry = cache.get("fmp", "deadline")
+        mtime = (temp_cache_dir / "fmp_cache" / "deadline.json").stat().st_mtime
+        assert mtime == pytest.approx(entry.expires_timestamp)
 
-        cache.set("fmp", "test", {})
-        assert cache.is_valid("fmp", "test") is True
-        assert cache.is_valid("fmp", "nonexistent") is False
+    def test_clear_expired_skips_parsing_valid_entries(self, temp_cache_dir, monkeypatch):
+        cache = CacheManager(
+            base_dir=temp_cache_dir, storage_backend=DictBackend(), ttl_days=1
+        )
+        cache.set("fmp", "valid", {"valid": True})
+
+        def fail_loads(data):
+            raise AssertionError("valid entry should not be parsed")
 
-    def test_get_stats(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir, ttl_days=7)
+        monkeypatch.setattr(cache_module, "_loads", fail_loads)
+
+        assert cache.clear_expired() == 0
 
-        cache.set("fmp", "key1", {"data": "x" * 100})
-        cache.set("fmp", "key2", {"data": "y" * 200})
-        cache.set("polygon", "key3", {"data": "z" * 50})
+    def test_exists(self, memory_cache):
+        assert memory_cache.exists("fmp", "test") is False
+        memory_cache.set("fmp", "test", {})
+        assert memory_cache.exists("fmp", "test") is True
 
-        stats = cache.get_stats()
+    def test_is_valid(self, memory_cache):
+        memory_cache.set("fmp", "test", {})
+        assert memory_cache.is_valid("fmp", "test") is True
+        assert memory_cache.is_valid("fmp", "nonexistent") is False
+
+    def test_get_stats(self, memory_cache):
+        memory_cache.set("fmp", "key1", {"data": "x" * 100})
+        memory_cache.set("fmp", "key2", {"data": "y" * 200})
+        memory_cache.set("polygon", "key3", {"data": "z" * 50})
+
+        stats = memory_cache.get_stats()
 
         assert stats["enabled"] is True
         assert stats["ttl_days"] == 7
@@ -297,6 +333,41 @@ class TestCacheManager:
         assert stats["providers"]["polygon"]["total_entries"] == 1
         assert stats["providers"]["fred"]["total_entries"] == 0
 
+    def test_get_stats_skips_parsing_valid_entries(self, temp_cache_dir, monkeypatch):
+        cache = CacheManager(
+            base_dir=temp_cache_dir, storage_backend=DictBackend(), ttl_days=1
+        )
+        cache.set("fmp", "valid", {"valid": True})
+
+        def fail_loads(data):
+            raise AssertionError("valid entry should not be parsed")
+
+        monkeypatch.setattr(cache_module, "_loads", fail_loads)
+
+        fmp_stats = cache.get_stats("fmp")["providers"]["fmp"]
+        assert fmp_stats["valid_entries"] == 1
+        assert fmp_stats["total_size_bytes"] > 0
+
+    def test_get_stats_trusts_future_mtime(self, memory_cache):
+        # A future mtime marks an entry valid without parsing it, so a
+        # corrupt file is only caught when get() reads it
+        path = memory_cache._get_cache_path("fmp", "corrupt")
+        memory_cache._backend.write_bytes(path, b"not json", mtime=time.time() + 3600)
+
+        fmp_stats = memory_cache.get_stats("fmp")["providers"]["fmp"]
+
+        assert fmp_stats["valid_entries"] == 1
+        assert memory_cache.get("fmp", "corrupt") is None
+
+    def test_get_stats_counts_expired(self, memory_cache):
+        memory_cache.set("fmp", "valid", {})
+        memory_cache.set("fmp", "expired", {}, ttl_days=-1)
+
+        fmp_stats = memory_cache.get_stats("fmp")["providers"]["fmp"]
+
+        assert fmp_stats["valid_entries"] == 1
+        assert fmp_stats["expired_entries"] == 1
+
     def test_disabled_cache(self, temp_cache_dir):
         cache = CacheManager(base_dir=temp_cache_dir, enabled=False)
 
@@ -321,15 +392,13 @@ class TestCacheManager:
         assert entry is not None
         assert entry.data == {"test": True}
 
-    def test_custom_ttl(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir, ttl_days=7)
-
-        cache.set("fmp", "short_ttl", {"data": True}, ttl_days=1)
-        entry = cache.get("fmp", "short_ttl")
+    def test_custom_ttl(self, memory_cache):
+        memory_cache.set("fmp", "short_ttl", {"data": True}, ttl_days=1)
+        entry = memory_cache.get("fmp", "short_ttl")
         assert entry.ttl_days == 1
 
-        cache.set("fmp", "long_ttl", {"data": True}, ttl_days=30)
-        entry = cache.get("fmp", "long_ttl")
+        memory_cache.set("fmp", "long_ttl", {"data": True}, ttl_days=30)
+        entry = memory_cache.get("fmp", "long_ttl")
         assert entry.ttl_days == 30
 
     def test_atomic_write(self, temp_cache_dir):
@@ -346,9 +415,16 @@ class TestCacheManager:
             data = json.load(f)
             assert data["data"]["counter"] == 1
 
-    def test_complex_data(self, temp_cache_dir):
+    def test_set_after_provider_dir_removed(self, temp_cache_dir):
         cache = CacheManager(base_dir=temp_cache_dir)
+        cache.set("fmp", "first", {"n": 1})
 
+        shutil.rmtree(temp_cache_dir / "fmp_cache")
+
+        assert cache.set("fmp", "second", {"n": 2}) is True
+        assert cache.get("fmp", "second").data == {"n": 2}
+
+    def test_complex_data(self, memory_cache):
         complex_data = {
             "string": "hello",
             "number": 42,
@@ -361,21 +437,229 @@ class TestCacheManager:
             },
         }
 
-        cache.set("fmp", "complex", complex_data)
-        entry = cache.get("fmp", "complex")
+        memory_cache.set("fmp", "complex", complex_data)
+        entry = memory_cache.get("fmp", "complex")
 
         assert entry.data == complex_data
 
-    def test_unicode_data(self, temp_cache_dir):
-        cache = CacheManager(base_dir=temp_cache_dir)
-
+    def test_unicode_data(self, memory_cache):
         unicode_data = {
             "company": "日本株式会社",
             "currency": "€",
             "emoji": "📈",
         }
 
-        cache.set("fmp", "unicode", unicode_data)
-        entry = cache.get("fmp", "unicode")
+        memory_cache.set("fmp", "unicode", unicode_data)
+        entry = memory_cache.get("fmp", "unicode")
 
         assert entry.data == unicode_data
+
+
+@pytest.mark.unit
+class TestShardedCache:
+    """Tests for hash-prefix sharded cache directories."""
+
+    def test_entry_written_to_shard_dir(self, temp_cache_dir):
+        cache = CacheManager(base_dir=temp_cache_dir, sharded=True)
+
+        cache.set("fmp", "profile_AAPL", {"symbol": "AAPL"})
+
+        shard = CacheManager._shard_for("profile_AAPL")
+        assert len(shard) == 2
+        assert (temp_cache_dir / "fmp_cache" / shard / "profile_AAPL.json").exists()
+        assert not (temp_cache_dir / "fmp_cache" / "profile_AAPL.json").exists()
+        assert cache.get("fmp", "profile_AAPL").data == {"symbol": "AAPL"}
+
+    def test_clear_and_stats_walk_shards(self, temp_cache_dir):
+        cache = CacheManager(
+            base_dir=temp_cache_dir, storage_backend=DictBackend(), sharded=True
+        )
+        for i in range(20):
+            cache.set("fmp", f"key{i}", {"i": i})
+
+        assert cache.get_stats("fmp")["providers"]["fmp"]["total_entries"] == 20
+        assert cache.clear_provider("fmp") == 20
+        assert cache.get_stats("fmp")["providers"]["fmp"]["total_entries"] == 0
+
+    def test_legacy_flat_entry_migrated_on_read(self, temp_cache_dir):
+        CacheManager(base_dir=temp_cache_dir).set("fmp", "legacy", {"v": 1})
+        cache = CacheManager(base_dir=temp_cache_dir, sharded=True)
+
+        assert cache.exists("fmp", "legacy") is True
+        assert cache.get("fmp", "legacy").data == {"v": 1}
+
+        shard = CacheManager._shard_for("legacy")
+        assert (temp_cache_dir / "fmp_cache" / shard / "legacy.json").exists()
+        assert not (temp_cache_dir / "fmp_cache" / "legacy.json").exists()
+
+    def test_delete_removes_legacy_entry(self, memory_cache):
+        memory_cache.set("fmp", "legacy", {"v": 1})
+        cache = CacheManager(
+            base_dir=memory_cache.base_dir, storage_backend=memory_cache._backend, sharded=True
+        )
+
+        assert cache.delete("fmp", "legacy") is True
+        assert cache.exists("fmp", "legacy") is False
+
+
+@pytest.mark.unit
+class TestCacheBackends:
+    """Tests for the CacheManager storage backends."""
+
+    def test_default_backend_is_file(self, temp_cache_dir):
+        cache = CacheManager(base_dir=temp_cache_dir)
+        assert isinstance(cache._backend, FileBackend)
+
+    def test_dict_backend_roundtrip(self, tmp_path):
+        backend = DictBackend()
+        path = tmp_path / "fmp_cache" / "key.json"
+
+        assert backend.exists(path) is False
+        backend.write_bytes(path, b'{"a": 1}')
+
+        assert backend.exists(path) is True
+        assert backend.read_bytes(path) == b'{"a": 1}'
+        assert backend.size(path) == 8
+        assert list(backend.iterdir(tmp_path / "fmp_cache")) == [path]
+        assert list(backend.iterdir(tmp_path / "polygon_cache")) == []
+
+        backend.unlink(path)
+        assert backend.exists(path) is False
+
+    def test_dict_backend_missing_entry(self, tmp_path):
+        backend = DictBackend()
+        path = tmp_path / "missing.json"
+
+        with pytest.raises(FileNotFoundError):
+            backend.read_bytes(path)
+        with pytest.raises(FileNotFoundError):
+            backend.unlink(path)
+
+    def test_memory_cache_does_not_touch_disk(self, memory_cache, temp_cache_dir):
+        memory_cache.set("fmp", "profile_AAPL", {"symbol": "AAPL"})
+
+        assert memory_cache.get("fmp", "profile_AAPL").data == {"symbol": "AAPL"}
+        assert not (temp_cache_dir / "fmp_cache").exists()
+
+
+@pytest.mark.unit
+class TestCacheSerialization:
+    """Tests for cache entry serialization."""
+
+    def test_stdlib_json_fallback(self, temp_cache_dir, monkeypatch):
+        monkeypatch.setattr(cache_module, "orjson", None)
+        cache = CacheManager(base_dir=temp_cache_dir)
+
+        cache.set("fmp", "fallback", {"company": "日本株式会社"})
+        entry = cache.get("fmp", "fallback")
+
+        assert entry.data == {"company": "日本株式会社"}
+
+    def test_entries_written_compact(self, memory_cache):
+        memory_cache.set("fmp", "compact", {"a": [1, 2], "b": "x y"})
+
+        raw = memory_cache._backend.read_bytes(memory_cache._get_cache_path("fmp", "compact"))
+
+        assert b"\n" not in raw
+        assert b'"a":[1,2]' in raw
+
+    def test_large_entry_read_via_mmap(self, temp_cache_dir):
+        cache = CacheManager(base_dir=temp_cache_dir)
+        data = {"rows": ["x" * 100] * 1000}
+
+        cache.set("fmp", "large", data)
+
+        path = cache._get_cache_path("fmp", "large")
+        assert path.stat().st_size >= cache_module._MMAP_THRESHOLD
+        assert cache.get("fmp", "large").data == data
+
+    def test_large_entry_stdlib_json_fallback(self, temp_cache_dir, monkeypatch):
+        monkeypatch.setattr(cache_module, "orjson", None)
+        cache = CacheManager(base_dir=temp_cache_dir)
+        data = {"rows": ["y" * 100] * 1000}
+
+        cache.set("fmp", "large", data)
+
+        assert cache.get("fmp", "large").data == data
+
+    def test_non_string_keys_coerced(self, memory_cache):
+        memory_cache.set("fmp", "int_keys", {1: "one"})
+
+        assert memory_cache.get("fmp", "int_keys").data == {"1": "one"}
+
+    @pytest.mark.parametrize(
+        "value",
+        [2 ** 70 + 1, -(2 ** 70 + 1)],
+        ids=["positive", "negative"],
+    )
+    def test_big_int_falls_back_to_json(self, memory_cache, value):
+        assert memory_cache.set("fmp", "big", {"value": value}) is True
+        assert memory_cache.get("fmp", "big").data["value"] == value
+
+    def test_non_finite_floats_roundtrip(self, memory_cache):
+        data = {"nan": float("nan"), "inf": float("inf"), "ninf": float("-inf"), "none": None}
+
+        assert memory_cache.set("fmp", "nan", data) is True
+        result = memory_cache.get("fmp", "nan").data
+
+        assert math.isnan(result["nan"])
+        assert result["inf"] == float("inf")
+        assert result["ninf"] == float("-inf")
+        assert result["none"] is None
+
+    def test_nan_and_big_int_roundtrip(self, memory_cache):
+        assert memory_cache.set("fmp", "mixed", {"nan": float("nan"), "big": 2 ** 70 + 1}) is True
+        result = memory_cache.get("fmp", "mixed").data
+
+        assert math.isnan(result["nan"])
+        assert result["big"] == 2 ** 70 + 1
+
+    def test_reads_legacy_json_with_nan(self, temp_cache_dir):
+        cache = CacheManager(base_dir=temp_cache_dir)
+        entry = {
+            "data": {"value": float("nan"), "big": 2 ** 70 + 1},
+            "timestamp": time.time(),
+            "ttl_days": 7,
+            "provider": "fmp",
+            "key": "legacy",
+        }
+        path = cache._get_cache_path("fmp", "legacy")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entry))
+
+        result = cache.get("fmp", "legacy").data
+
+        assert math.isnan(result["value"])
+        assert result["big"] == 2 ** 70 + 1
+
+    def test_unknown_serializer_rejected(self, temp_cache_dir):
+        with pytest.raises(ValueError, match="serializer"):
+            CacheManager(base_dir=temp_cache_dir, serializer="pickle")
+
+    def test_msgpack_roundtrip(self, temp_cache_dir):
+        pytest.importorskip("msgpack")
+        cache = CacheManager(base_dir=temp_cache_dir, serializer="msgpack")
+        data = {"company": "日本株式会社", "prices": [185.5, 186.0], 1: "one"}
+
+        cache.set("fmp", "packed", data)
+
+        raw = (temp_cache_dir / "fmp_cache" / "packed.json").read_bytes()
+        assert raw.startswith(cache_module._MSGPACK_MAGIC)
+        assert cache.get("fmp", "packed").data == data
+
+    def test_msgpack_reads_legacy_json(self, temp_cache_dir):
+        pytest.importorskip("msgpack")
+        CacheManager(base_dir=temp_cache_dir).set("fmp", "legacy", {"v": 1})
+
+        cache = CacheManager(base_dir=temp_cache_dir, serializer="msgpack")
+
+        assert cache.get("fmp", "legacy").data == {"v": 1}
+
+    def test_msgpack_big_int_falls_back_to_json(self, temp_cache_dir):
+        pytest.importorskip("msgpack")
+        cache = CacheManager(
+            base_dir=temp_cache_dir, storage_backend=DictBackend(), serializer="msgpack"
+        )
+
+        assert cache.set("fmp", "big", {"value": 2 ** 70 + 1}) is True
+        assert cache.get("fmp", "big").data["value"] == 2 ** 70 + 1
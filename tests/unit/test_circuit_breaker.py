@@ -2,7 +2,8 @@
 Unit tests for the Circuit Breaker.
 """
 
-import time
+import dataclasses
+import random
 
 import pytest
 
@@ -16,6 +17,20 @@ from data_loader.circuit_breaker import (
 )
 
 
+@pytest.fixture(scope="module")
+def closed_cb():
+    """Fresh breaker shared by read-only tests; never record outcomes on it."""
+    return CircuitBreaker("fmp")
+
+
+@pytest.fixture
+def prewarmed_manager():
+    """Manager with fmp and polygon breakers already created."""
+    manager = CircuitBreakerManager()
+    manager.prewarm(["fmp", "polygon"])
+    return manager
+
+
 @pytest.mark.unit
 class TestCircuitState:
     """Tests for CircuitState enum."""
@@ -71,21 +86,39 @@ class TestCircuitBreakerStats:
         assert d["total_requests"] == 100
         assert d["error_rate"] == 0.1
 
+    def test_to_dict_covers_every_field(self):
+        stats = CircuitBreakerStats(
+            state=CircuitState.OPEN,
+            total_requests=3,
+            successful_requests=1,
+            failed_requests=2,
+            error_rate=2 / 3,
+            last_failure_time=None,
+            last_state_change=1234567800.0,
+            consecutive_successes=0,
+            time_in_current_state=1.23456,
+        )
+        d = stats.to_dict()
+
+        # to_dict is a hand-written literal; keep it in step with the fields
+        assert set(d) == {f.name for f in dataclasses.fields(CircuitBreakerStats)}
+        assert d["error_rate"] == 0.6667
+        assert d["time_in_current_state"] == 1.23
+
 
 @pytest.mark.unit
 class TestCircuitBreaker:
     """Tests for CircuitBreaker class."""
 
-    def test_initial_state_is_closed(self):
-        cb = CircuitBreaker("fmp")
+    def test_initial_state_is_closed(self, closed_cb):
+        cb = closed_cb
         assert cb.state == CircuitState.CLOSED
         assert cb.is_closed is True
         assert cb.is_open is False
         assert cb.is_half_open is False
 
-    def test_can_execute_when_closed(self):
-        cb = CircuitBreaker("fmp")
-        assert cb.can_execute() is True
+    def test_can_execute_when_closed(self, closed_cb):
+        assert closed_cb.can_execute() is True
 
     def test_record_success(self):
         cb = CircuitBreaker("fmp")
@@ -101,153 +134,151 @@ class TestCircuitBreaker:
         assert stats.failed_requests == 1
         assert stats.successful_requests == 0
 
-    def test_stays_closed_below_threshold(self):
+    @pytest.mark.parametrize(
+        ("successes", "failures", "min_requests", "expected"),
+        [
+            (9, 1, 10, CircuitState.CLOSED),  # 10% error rate, below 20%
+            (8, 2, 10, CircuitState.OPEN),  # 20%, at threshold
+            (7, 3, 10, CircuitState.OPEN),  # 30%, above threshold
+            (0, 5, 10, CircuitState.CLOSED),  # 100%, but below min_requests
+            (3, 2, 5, CircuitState.OPEN),  # 40% once min_requests is met
+        ],
+        ids=["closed_9_1", "open_8_2", "open_7_3", "closed_below_min", "open_3_2"],
+    )
+    def test_threshold(self, successes, failures, min_requests, expected):
         config = CircuitBreakerConfig(
             error_threshold=0.2,
-            min_requests=10,
+            min_requests=min_requests,
         )
         cb = CircuitBreaker("fmp", config)
 
-        # 9 successes, 1 failure = 10% error rate (below 20%)
-        for _ in range(9):
-            cb.record_success()
-        cb.record_failure()
+        cb.record_outcomes(successes=successes, failures=failures)
 
-        assert cb.state == CircuitState.CLOSED
+        assert cb.state == expected
+        assert cb.can_execute() is (expected == CircuitState.CLOSED)
 
-    def test_opens_at_threshold(self):
-        config = CircuitBreakerConfig(
-            error_threshold=0.2,
-            min_requests=10,
-        )
-        cb = CircuitBreaker("fmp", config)
+    def test_record_outcomes_matches_individual_calls(self):
+        config = CircuitBreakerConfig(error_threshold=0.5, min_requests=4)
+        batched = CircuitBreaker("fmp", config)
+        single = CircuitBreaker("fmp", config)
 
-        # 8 successes, 2 failures = 20% error rate (at threshold)
-        for _ in range(8):
-            cb.record_success()
+        batched.record_outcomes(successes=3, failures=2)
+        for _ in range(3):
+            single.record_success()
         for _ in range(2):
-            cb.record_failure()
+            single.record_failure()
 
-        assert cb.state == CircuitState.OPEN
+        for cb in (batched, single):
+            stats = cb.get_stats()
+            assert stats.successful_requests == 3
+            assert stats.failed_requests == 2
+            assert stats.state == CircuitState.CLOSED
 
-    def test_opens_above_threshold(self):
-        config = CircuitBreakerConfig(
-            error_threshold=0.2,
-            min_requests=10,
-        )
+    def test_rolling_window_evicts_oldest(self):
+        config = CircuitBreakerConfig(error_threshold=0.9, min_requests=100, window_size=10)
         cb = CircuitBreaker("fmp", config)
 
-        # 7 successes, 3 failures = 30% error rate
-        for _ in range(7):
-            cb.record_success()
-        for _ in range(3):
-            cb.record_failure()
+        cb.record_outcomes(successes=4, failures=4)
+        cb.record_outcomes(successes=5)
 
-        assert cb.state == CircuitState.OPEN
+        # The 3 oldest outcomes (successes) fell out of the window
+        stats = cb.get_stats()
+        assert stats.total_requests == 10
+        assert stats.successful_requests == 6
+        assert stats.failed_requests == 4
 
-    def test_does_not_open_below_min_requests(self):
+    def test_batches_match_individual_calls_across_transitions(self, fake_clock):
+        rng = random.Random(1234)
         config = CircuitBreakerConfig(
-            error_threshold=0.2,
-            min_requests=10,
+            error_threshold=0.3,
+            min_requests=8,
+            half_open_max_requests=3,
+            window_size=20,
         )
-        cb = CircuitBreaker("fmp", config)
+        batched = CircuitBreaker("fmp", config)
+        single = CircuitBreaker("fmp", config)
 
-        # 5 failures out of 5 = 100% error rate, but below min_requests
-        for _ in range(5):
-            cb.record_failure()
+        for _ in range(200):
+            successes, failures = rng.randint(0, 6), rng.randint(0, 3)
+            batched.record_outcomes(successes=successes, failures=failures)
+            for _ in range(successes):
+                single.record_success()
+            for _ in range(failures):
+                single.record_failure()
 
-        assert cb.state == CircuitState.CLOSED
+            assert batched.get_stats() == single.get_stats()
+            fake_clock.advance(rng.choice([0.0, 61.0]))
 
-    def test_cannot_execute_when_open(self):
+    def test_transitions_to_half_open_after_timeout(self, fake_clock):
         config = CircuitBreakerConfig(
             error_threshold=0.2,
             min_requests=5,
+            recovery_timeout=60.0,
         )
         cb = CircuitBreaker("fmp", config)
 
         # Force open state
-        for _ in range(3):
-            cb.record_success()
-        for _ in range(2):
-            cb.record_failure()  # 40% error rate
+        cb.record_outcomes(successes=3, failures=2)
 
         assert cb.state == CircuitState.OPEN
-        assert cb.can_execute() is False
-
-    def test_transitions_to_half_open_after_timeout(self):
-        config = CircuitBreakerConfig(
-            error_threshold=0.2,
-            min_requests=5,
-            recovery_timeout=0.1,  # 100ms for testing
-        )
-        cb = CircuitBreaker("fmp", config)
-
-        # Force open state
-        for _ in range(3):
-            cb.record_success()
-        for _ in range(2):
-            cb.record_failure()
 
+        # Not yet recovered just before the timeout
+        fake_clock.advance(59.9)
         assert cb.state == CircuitState.OPEN
 
-        # Wait for recovery timeout
-        time.sleep(0.15)
+        fake_clock.advance(0.1)
 
         # State should transition to half-open
         assert cb.state == CircuitState.HALF_OPEN
 
-    def test_half_open_allows_limited_requests(self):
+    def test_half_open_allows_limited_requests(self, fake_clock):
         config = CircuitBreakerConfig(
             error_threshold=0.2,
             min_requests=5,
-            recovery_timeout=0.01,
+            recovery_timeout=60.0,
             half_open_max_requests=3,
         )
         cb = CircuitBreaker("fmp", config)
 
         # Force to half-open
-        for _ in range(5):
-            cb.record_failure()
-        time.sleep(0.02)
+        cb.record_outcomes(failures=5)
+        fake_clock.advance(60.0)
 
         assert cb.state == CircuitState.HALF_OPEN
         assert cb.can_execute() is True
 
-    def test_half_open_closes_after_successes(self):
+    def test_half_open_closes_after_successes(self, fake_clock):
         config = CircuitBreakerConfig(
             error_threshold=0.2,
             min_requests=5,
-            recovery_timeout=0.01,
+            recovery_timeout=60.0,
             half_open_max_requests=3,
         )
         cb = CircuitBreaker("fmp", config)
 
         # Force to half-open
-        for _ in range(5):
-            cb.record_failure()
-        time.sleep(0.02)
+        cb.record_outcomes(failures=5)
+        fake_clock.advance(60.0)
 
         assert cb.state == CircuitState.HALF_OPEN
 
         # Record enough successes
-        for _ in range(3):
-            cb.record_success()
+        cb.record_outcomes(successes=3)
 
         assert cb.state == CircuitState.CLOSED
 
-    def test_half_open_reopens_on_failure(self):
+    def test_half_open_reopens_on_failure(self, fake_clock):
         config = CircuitBreakerConfig(
             error_threshold=0.2,
             min_requests=5,
-            recovery_timeout=0.01,
+            recovery_timeout=60.0,
             half_open_max_requests=3,
         )
         cb = CircuitBreaker("fmp", config)
 
         # Force to half-open
-        for _ in range(5):
-            cb.record_failure()
-        time.sleep(0.02)
+        cb.record_outcomes(failures=5)
+        fake_clock.advance(60.0)
 
         assert cb.state == CircuitState.HALF_OPEN
 
@@ -264,8 +295,7 @@ class TestCircuitBreaker:
         cb = CircuitBreaker("fmp", config)
 
         # Force open state
-        for _ in range(5):
-            cb.record_failure()
+        cb.record_outcomes(failures=5)
 
         assert cb.state == CircuitState.OPEN
 
@@ -275,7 +305,20 @@ class TestCircuitBreaker:
         stats = cb.get_stats()
         assert stats.total_requests == 0
 
-    @pytest.mark.asyncio
+    def test_force_open(self, fake_clock):
+        cb = CircuitBreaker("fmp", CircuitBreakerConfig(recovery_timeout=60.0))
+
+        cb.force_open()
+
+        assert cb.state == CircuitState.OPEN
+        assert cb.can_execute() is False
+        assert cb.get_stats().total_requests == 0
+
+        # Recovers like a breaker that tripped at the time it was forced open
+        fake_clock.advance(60.0)
+        assert cb.state == CircuitState.HALF_OPEN
+
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_execute_success(self):
         cb = CircuitBreaker("fmp")
 
@@ -288,7 +331,7 @@ class TestCircuitBreaker:
         stats = cb.get_stats()
         assert stats.successful_requests == 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_execute_failure_records_failure(self):
         cb = CircuitBreaker("fmp")
 
@@ -301,7 +344,7 @@ class TestCircuitBreaker:
         stats = cb.get_stats()
         assert stats.failed_requests == 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_execute_raises_when_open(self):
         config = CircuitBreakerConfig(
             error_threshold=0.2,
@@ -310,8 +353,7 @@ class TestCircuitBreaker:
         cb = CircuitBreaker("fmp", config)
 
         # Force open
-        for _ in range(5):
-            cb.record_failure()
+        cb.record_outcomes(failures=5)
 
         async def should_not_run():
             return "never"
@@ -380,7 +422,7 @@ class TestCircuitBreakerManager:
         stats = manager.get_stats("fmp")
         assert stats["failed_requests"] == 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_execute_success(self):
         manager = CircuitBreakerManager()
 
@@ -390,7 +432,7 @@ class TestCircuitBreakerManager:
         result = await manager.execute("fmp", api_call)
         assert result == {"data": "result"}
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_execute_failure(self):
         manager = CircuitBreakerManager()
 
@@ -400,23 +442,39 @@ class TestCircuitBreakerManager:
         with pytest.raises(ValueError):
             await manager.execute("fmp", failing_call)
 
-    def test_get_all_states(self):
-        manager = CircuitBreakerManager()
-        manager.record_success("fmp")
-        manager.record_success("polygon")
-
-        states = manager.get_all_states()
+    def test_get_all_states(self, prewarmed_manager):
+        states = prewarmed_manager.get_all_states()
         assert "fmp" in states
         assert "polygon" in states
         assert states["fmp"] == CircuitState.CLOSED
 
-    def test_reset_single_provider(self):
+    def test_record_batches_match_individual_calls(self):
         config = CircuitBreakerConfig(min_requests=5)
-        manager = CircuitBreakerManager(default_config=config)
+        batched = CircuitBreakerManager(default_config=config)
+        single = CircuitBreakerManager(default_config=config)
+        batched.prewarm(["fmp", "polygon"])
+        single.prewarm(["fmp", "polygon"])
+
+        batched.record_successes({"fmp": 2, "polygon": 4})
+        batched.record_failures({"fmp": 3, "polygon": 1})
+        for provider, successes, failures in (("fmp", 2, 3), ("polygon", 4, 1)):
+            for _ in range(successes):
+                single.record_success(provider)
+            for _ in range(failures):
+                single.record_failure(provider)
+
+        for provider in ("fmp", "polygon"):
+            expected = single.get_stats(provider)
+            actual = batched.get_stats(provider)
+            for key in ("state", "total_requests", "successful_requests",
+                        "failed_requests", "error_rate"):
+                assert actual[key] == expected[key]
+
+    def test_reset_single_provider(self):
+        manager = CircuitBreakerManager(default_config=CircuitBreakerConfig(min_requests=5))
+        manager.prewarm(["fmp", "polygon"])
 
-        for _ in range(5):
-            manager.record_failure("fmp")
-            manager.record_failure("polygon")
+        manager.record_failures({"fmp": 5, "polygon": 5})
 
         assert manager.get_state("fmp") == CircuitState.OPEN
         assert manager.get_state("polygon") == CircuitState.OPEN
@@ -427,39 +485,67 @@ class TestCircuitBreakerManager:
         assert manager.get_state("polygon") == CircuitState.OPEN
 
     def test_reset_all_providers(self):
-        config = CircuitBreakerConfig(min_requests=5)
-        manager = CircuitBreakerManager(default_config=config)
+        manager = CircuitBreakerManager(default_config=CircuitBreakerConfig(min_requests=5))
+        manager.prewarm(["fmp", "polygon"])
 
-        for _ in range(5):
-            manager.record_failure("fmp")
-            manager.record_failure("polygon")
+        manager.record_failures({"fmp": 5, "polygon": 5})
 
         manager.reset()
 
         assert manager.get_state("fmp") == CircuitState.CLOSED
         assert manager.get_state("polygon") == CircuitState.CLOSED
 
+    def test_force_open(self, prewarmed_manager):
+        prewarmed_manager.force_open("fmp")
+
+        assert prewarmed_manager.get_state("fmp") == CircuitState.OPEN
+        assert prewarmed_manager.get_state("polygon") == CircuitState.CLOSED
+
+    def test_force_open_all(self, prewarmed_manager):
+        prewarmed_manager.force_open_all(["fmp", "fred"])
+
+        assert prewarmed_manager.get_all_states() == {
+            "fmp": CircuitState.OPEN,
+            "polygon": CircuitState.CLOSED,
+            "fred": CircuitState.OPEN,
+        }
+
     def test_is_healthy(self):
-        config = CircuitBreakerConfig(min_requests=5)
-        manager = CircuitBreakerManager(default_config=config)
+        manager = CircuitBreakerManager(default_config=CircuitBreakerConfig(min_requests=5))
+        manager.prewarm(["fmp", "polygon"])
 
         assert manager.is_healthy("fmp") is True
 
-        for _ in range(5):
-            manager.record_failure("fmp")
+        manager.record_failures({"fmp": 5})
 
         assert manager.is_healthy("fmp") is False
 
     def test_independent_providers(self):
         """Verify that different providers have independent circuit breakers."""
-        config = CircuitBreakerConfig(min_requests=5)
-        manager = CircuitBreakerManager(default_config=config)
+        manager = CircuitBreakerManager(default_config=CircuitBreakerConfig(min_requests=5))
+        manager.prewarm(["fmp", "polygon"])
 
         # Fail FMP
-        for _ in range(5):
-            manager.record_failure("fmp")
+        manager.record_failures({"fmp": 5})
 
         # Polygon should still be healthy
         assert manager.get_state("fmp") == CircuitState.OPEN
         assert manager.get_state("polygon") == CircuitState.CLOSED
         assert manager.can_execute("polygon") is True
+
+    def test_prewarm_creates_breakers(self):
+        fmp_config = CircuitBreakerConfig(error_threshold=0.1)
+        manager = CircuitBreakerManager(provider_configs={"fmp": fmp_config})
+
+        manager.prewarm(["fmp", "polygon"])
+
+        assert set(manager.get_all_states()) == {"fmp", "polygon"}
+        assert manager._breakers["fmp"].config is fmp_config
+
+    def test_prewarm_keeps_existing_breakers(self):
+        manager = CircuitBreakerManager()
+        manager.record_failure("fmp")
+
+        manager.prewarm(["fmp"])
+
+        assert manager.get_stats("fmp")["failed_requests"] == 1
@@ -2,9 +2,10 @@
 Unit tests for the configuration manager.
 """
 
+import io
 import os
-import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -43,94 +44,80 @@ class TestLogLevel:
         assert LogLevel.CRITICAL.value == "CRITICAL"
 
 
-@pytest.mark.unit
-class TestProviderConfig:
-    """Tests for ProviderConfig dataclass."""
-
-    def test_create_provider_config(self):
-        config = ProviderConfig(
-            api_key="test_key",
-            base_url="https://api.example.com",
-            max_concurrency=5,
-            timeout=30.0,
-        )
-        assert config.api_key == "test_key"
-        assert config.base_url == "https://api.example.com"
-        assert config.max_concurrency == 5
-        assert config.timeout == 30.0
-
-    def test_default_timeout(self):
-        config = ProviderConfig(
-            api_key="test_key",
-            base_url="https://api.example.com",
-            max_concurrency=5,
-        )
-        assert config.timeout == 30.0
+PROVIDER_KWARGS = {
+    "api_key": "test_key",
+    "base_url": "https://api.example.com",
+    "max_concurrency": 5,
+}
+
+# (dataclass, constructor kwargs, expected attribute values)
+DATACLASS_CASES = [
+    pytest.param(
+        ProviderConfig,
+        {**PROVIDER_KWARGS, "timeout": 45.0},
+        {**PROVIDER_KWARGS, "timeout": 45.0},
+        id="provider-custom",
+    ),
+    pytest.param(
+        ProviderConfig, PROVIDER_KWARGS, {"timeout": 30.0}, id="provider-defaults",
+    ),
+    pytest.param(
+        CacheConfig,
+        {"base_dir": Path("/tmp/cache"), "ttl_days": 14, "enabled": False},
+        {"base_dir": Path("/tmp/cache"), "ttl_days": 14, "enabled": False},
+        id="cache-custom",
+    ),
+    pytest.param(
+        CacheConfig,
+        {"base_dir": Path("/tmp/cache")},
+        {"ttl_days": 7, "enabled": True},
+        id="cache-defaults",
+    ),
+    pytest.param(
+        CircuitBreakerConfig,
+        {"error_threshold": 0.3, "recovery_timeout": 120.0, "min_requests": 20},
+        {"error_threshold": 0.3, "recovery_timeout": 120.0, "min_requests": 20},
+        id="circuit-breaker-custom",
+    ),
+    pytest.param(
+        CircuitBreakerConfig,
+        {},
+        {"error_threshold": 0.2, "recovery_timeout": 60.0, "min_requests": 10},
+        id="circuit-breaker-defaults",
+    ),
+    pytest.param(
+        RetryConfig,
+        {"max_retries": 5, "base_delay": 2.0, "max_delay": 120.0, "exponential_base": 3.0},
+        {"max_retries": 5, "base_delay": 2.0, "max_delay": 120.0, "exponential_base": 3.0},
+        id="retry-custom",
+    ),
+    pytest.param(
+        RetryConfig,
+        {},
+        {"max_retries": 3, "base_delay": 1.0, "max_delay": 60.0, "exponential_base": 2.0},
+        id="retry-defaults",
+    ),
+]
 
 
 @pytest.mark.unit
-class TestCacheConfig:
-    """Tests for CacheConfig dataclass."""
-
-    def test_create_cache_config(self):
-        config = CacheConfig(
-            base_dir=Path("/tmp/cache"),
-            ttl_days=14,
-            enabled=True,
-        )
-        assert config.base_dir == Path("/tmp/cache")
-        assert config.ttl_days == 14
-        assert config.enabled is True
+class TestConfigDataclasses:
+    """Tests for the settings dataclasses (fields and defaults)."""
 
-    def test_default_values(self):
-        config = CacheConfig(base_dir=Path("/tmp/cache"))
-        assert config.ttl_days == 7
-        assert config.enabled is True
+    @pytest.mark.parametrize(("cls", "kwargs", "expected"), DATACLASS_CASES)
+    def test_field_values(self, cls, kwargs, expected):
+        config = cls(**kwargs)
+        for name, value in expected.items():
+            assert getattr(config, name) == value
 
 
-@pytest.mark.unit
-class TestCircuitBreakerConfig:
-    """Tests for CircuitBreakerConfig dataclass."""
-
-    def test_create_circuit_breaker_config(self):
-        config = CircuitBreakerConfig(
-            error_threshold=0.3,
-            recovery_timeout=120.0,
-            min_requests=20,
-        )
-        assert config.error_threshold == 0.3
-        assert config.recovery_timeout == 120.0
-        assert config.min_requests == 20
-
-    def test_default_values(self):
-        config = CircuitBreakerConfig()
-        assert config.error_threshold == 0.2
-        assert config.recovery_timeout == 60.0
-        assert config.min_requests == 10
-
-
-@pytest.mark.unit
-class TestRetryConfig:
-    """Tests for RetryConfig dataclass."""
-
-    def test_create_retry_config(self):
-        config = RetryConfig(
-            max_retries=5,
-            base_delay=2.0,
-            max_delay=120.0,
-            exponential_base=3.0,
-        )
-        assert config.max_retries == 5
-        assert config.base_delay == 2.0
-        assert config.max_delay == 120.0
-        assert config.exponential_base == 3.0
-
-    def test_default_values(self):
-        config = RetryConfig()
-        assert config.max_retries == 3
-        assert config.base_delay == 1.0
-        assert config.max_delay == 60.0
-        assert config.exponential_base == 2.0
+# Environment variables read by Config.from_env()
+CONFIG_ENV_KEYS = [
+    "FMP_KEY", "POLYGON_KEY", "FRED_KEY",
+    "CACHE_TTL_DAYS", "MAX_RETRIES",
+    "CIRCUIT_BREAKER_THRESHOLD", "CIRCUIT_BREAKER_TIMEOUT",
+    "REQUEST_TIMEOUT", "LOG_LEVEL", "OPERATING_MODE",
+]
 
 
 @pytest.mark.unit
@@ -138,44 +125,29 @@ class TestConfig:
     """Tests for the main Config class."""
 
     @pytest.fixture
-    def clean_env(self):
+    def clean_env(self, no_dotenv):
         """Remove test-related environment variables and prevent .env loading.
 
-        This fixture temporarily renames the .env file to prevent load_dotenv()
-        from reloading API keys during tests that expect default/empty values.
+        .env loading is disabled by the module-scoped no_dotenv fixture, so
+        tests that expect default/empty values don't pick up real API keys.
         """
-        keys_to_remove = [
-            "FMP_KEY", "POLYGON_KEY", "FRED_KEY",
-            "CACHE_TTL_DAYS", "MAX_RETRIES",
-            "CIRCUIT_BREAKER_THRESHOLD", "CIRCUIT_BREAKER_TIMEOUT",
-            "REQUEST_TIMEOUT", "LOG_LEVEL", "OPERATING_MODE",
-        ]
-        original = {k: os.environ.get(k) for k in keys_to_remove}
-
-        # Temporarily rename .env file to prevent load_dotenv() from loading it
-        env_file = Path(__file__).parent.parent.parent / ".env"
-        env_backup = env_file.with_suffix(".env.bak")
-        env_existed = env_file.exists()
-        if env_existed:
-            env_file.rename(env_backup)
-
-        for k in keys_to_remove:
-            os.environ.pop(k, None)
-
-        yield
-
-        # Restore .env file
-        if env_existed and env_backup.exists():
-            env_backup.rename(env_file)
-
-        for k, v in original.items():
-            if v is not None:
-                os.environ[k] = v
-            else:
+        # patch.dict restores the whole environment on exit, including keys
+        # the test or load_dotenv() set after the fixture ran.
+        with patch.dict(os.environ):
+            for k in CONFIG_ENV_KEYS:
                 os.environ.pop(k, None)
-
-    def test_from_env_with_all_keys(self, clean_env):
-        """Test loading config with all environment variables set."""
+            yield
+
+    @pytest.fixture(scope="module")
+    def default_config(self, no_dotenv):
+        """Config loaded once from an empty environment, for read-only tests."""
+        with pytest.MonkeyPatch.context() as mp:
+            for k in CONFIG_ENV_KEYS:
+                mp.delenv(k, raising=False)
+            yield Config.from_env()
+
+    def test_from_env_coercion(self, clean_env):
+        """Test env var strings are coerced to each field type."""
         os.environ["FMP_KEY"] = "fmp_test_key"
         os.environ["POLYGON_KEY"] = "polygon_test_key"
         os.environ["FRED_KEY"] = "fred_test_key"
@@ -184,7 +156,7 @@ class TestConfig:
         os.environ["CIRCUIT_BREAKER_THRESHOLD"] = "0.3"
         os.environ["CIRCUIT_BREAKER_TIMEOUT"] = "120"
         os.environ["REQUEST_TIMEOUT"] = "45"
-        os.environ["LOG_LEVEL"] = "DEBUG"
+        os.environ["LOG_LEVEL"] = "debug"
         os.environ["OPERATING_MODE"] = "READ_ONLY"
 
         config = Config.from_env()
@@ -193,16 +165,22 @@ class TestConfig:
         assert config.polygon.api_key == "polygon_test_key"
         assert config.fred.api_key == "fred_test_key"
         assert config.cache.ttl_days == 14
+        assert isinstance(config.cache.ttl_days, int)
         assert config.retry.max_retries == 5
+        assert isinstance(config.retry.max_retries, int)
         assert config.circuit_breaker.error_threshold == 0.3
+        assert isinstance(config.circuit_breaker.error_threshold, float)
         assert config.circuit_breaker.recovery_timeout == 120.0
-        assert config.fmp.timeout == 45.0
+        assert isinstance(config.circuit_breaker.recovery_timeout, float)
+        for provider in (config.fmp, config.polygon, config.fred):
+            assert provider.timeout == 45.0
+            assert isinstance(provider.timeout, float)
         assert config.log_level == LogLevel.DEBUG
         assert config.operating_mode == OperatingMode.READ_ONLY
 
-    def test_from_env_with_defaults(self, clean_env):
+    def test_from_env_with_defaults(self, default_config):
         """Test loading config with default values."""
-        config = Config.from_env()
+        config = default_config
 
         assert config.fmp.api_key == ""
         assert config.polygon.api_key == ""
@@ -214,21 +192,39 @@ class TestConfig:
         assert config.log_level == LogLevel.INFO
         assert config.operating_mode == OperatingMode.LIVE
 
-    def test_from_env_with_env_file(self, clean_env):
+    def test_from_env_with_env_file(self, clean_env, tmp_path):
         """Test loading config from a .env file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".env", delete=False) as f:
-            f.write("FMP_KEY=file_fmp_key\n")
-            f.write("POLYGON_KEY=file_polygon_key\n")
-            f.write("FRED_KEY=file_fred_key\n")
-            env_path = Path(f.name)
+        env_path = tmp_path / "test.env"
+        env_path.write_text(
+            "FMP_KEY=file_fmp_key\n"
+            "POLYGON_KEY=file_polygon_key\n"
+            "FRED_KEY=file_fred_key\n"
+        )
 
-        try:
-            config = Config.from_env(env_path)
-            assert config.fmp.api_key == "file_fmp_key"
-            assert config.polygon.api_key == "file_polygon_key"
-            assert config.fred.api_key == "file_fred_key"
-        finally:
-            env_path.unlink()
+        config = Config.from_env(env_path)
+
+        assert config.fmp.api_key == "file_fmp_key"
+        assert config.polygon.api_key == "file_polygon_key"
+        assert config.fred.api_key == "file_fred_key"
+
+    def test_from_env_with_stream(self, clean_env):
+        """Test loading config from an in-memory .env stream."""
+        stream = io.StringIO("FMP_KEY=stream_fmp_key\nCACHE_TTL_DAYS=3\n")
+
+        config = Config.from_env(stream)
+
+        assert config.fmp.api_key == "stream_fmp_key"
+        assert config.cache.ttl_days == 3
+
+    def test_from_env_honors_dotenv_path_variable(self, clean_env, tmp_path, monkeypatch):
+        """Test that NEXUS_DOTENV_PATH selects the .env file."""
+        env_file = tmp_path / "nexus.env"
+        env_file.write_text("FMP_KEY=pointer_fmp_key\n")
+        monkeypatch.setenv("NEXUS_DOTENV_PATH", str(env_file))
+
+        config = Config.from_env()
+
+        assert config.fmp.api_key == "pointer_fmp_key"
 
     def test_invalid_log_level_defaults_to_info(self, clean_env):
         """Test that invalid log level defaults to INFO."""
@@ -242,9 +238,9 @@ class TestConfig:
         config = Config.from_env()
         assert config.operating_mode == OperatingMode.LIVE
 
-    def test_validate_missing_keys_in_live_mode(self, clean_env):
+    def test_validate_missing_keys_in_live_mode(self, default_config):
         """Test validation fails for missing API keys in LIVE mode."""
-        config = Config.from_env()
+        config = default_config
         errors = config.validate()
 
         assert "FMP_KEY is required in LIVE mode" in errors
@@ -283,9 +279,9 @@ class TestConfig:
 
         assert "CACHE_TTL_DAYS must be at least 1" in errors
 
-    def test_get_cache_dir(self, clean_env):
+    def test_get_cache_dir(self, default_config):
         """Test getting provider-specific cache directories."""
-        config = Config.from_env()
+        config = default_config
 
         fmp_cache = config.get_cache_dir("fmp")
         assert fmp_cache.name == "fmp_cache"
@@ -296,9 +292,9 @@ class TestConfig:
         fred_cache = config.get_cache_dir("fred")
         assert fred_cache.name == "fred_cache"
 
-    def test_get_log_dir(self, clean_env):
+    def test_get_log_dir(self, default_config):
         """Test getting logs directory."""
-        config = Config.from_env()
+        config = default_config
         log_dir = config.get_log_dir()
         assert log_dir.name == "logs"
 
@@ -311,17 +307,17 @@ class TestConfig:
         assert config.has_api_key("polygon") is False
         assert config.has_api_key("fred") is False
 
-    def test_provider_base_urls(self, clean_env):
+    def test_provider_base_urls(self, default_config):
         """Test that provider base URLs are set correctly."""
-        config = Config.from_env()
+        config = default_config
 
         assert config.fmp.base_url == "https://financialmodelingprep.com"
         assert config.polygon.base_url == "https://api.polygon.io"
         assert config.fred.base_url == "https://api.stlouisfed.org/fred"
 
-    def test_provider_concurrency_limits(self, clean_env):
+    def test_provider_concurrency_limits(self, default_config):
         """Test that provider concurrency limits are set correctly."""
-        config = Config.from_env()
+        config = default_config
 
         assert config.fmp.max_concurrency == 3
         assert config.polygon.max_concurrency == 10
@@ -337,18 +333,17 @@ class TestLoadConfig:
         config = load_config()
         assert isinstance(config, Config)
 
-    def test_load_config_with_path(self):
+    def test_load_config_with_path(self, tmp_path):
         """Test loading config from a specific path."""
         # Clean up environment first
         os.environ.pop("FMP_KEY", None)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".env", delete=False) as f:
-            f.write("FMP_KEY=path_test_key\n")
-            env_path = Path(f.name)
+        env_path = tmp_path / "test.env"
+        env_path.write_text("FMP_KEY=path_test_key\n")
 
         try:
             config = load_config(env_path)
             assert config.fmp.api_key == "path_test_key"
         finally:
-            env_path.unlink()
+            # load_dotenv() writes into os.environ
             os.environ.pop("FMP_KEY", None)
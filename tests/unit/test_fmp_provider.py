@@ -2,19 +2,57 @@
 Unit tests for the FMP provider.
 """
 
+import asyncio
+import json
 
-import aiohttp
 import pytest
 from aioresponses import aioresponses
+from yarl import URL
 
 from data_loader.cache import CacheManager
 from data_loader.config import ProviderConfig
 from data_loader.health import HealthMonitor
-from data_loader.http_client import HttpClient
 from data_loader.providers.fmp import FMPProvider, create_fmp_provider
 
+# Module-scoped session, mocks and cache are built once per xdist worker
+# only if the whole module stays on one worker under --dist loadgroup.
+pytestmark = [pytest.mark.unit, pytest.mark.xdist_group("test_fmp_provider")]
+
+FMP_PROFILE_URL = "https://financialmodelingprep.com/stable/profile"
+
+# Profile payloads served by mock_api, keyed by the symbol query param
+PROFILE_PAYLOADS = {
+    "AAPL": [{
+        "symbol": "AAPL",
+        "companyName": "Apple Inc.",
+        "industry": "Consumer Electronics",
+    }],
+    "MSFT": [{"symbol": "MSFT"}],
+    "GOOGL": [{"symbol": "GOOGL"}],
+}
+
+
+@pytest.fixture(scope="module")
+def mock_api():
+    """Mock the FMP profile endpoint once for every test in the module.
+
+    aioresponses compares plain URLs (query included) by equality, so each
+    expected request is registered with its exact query string. Bodies are
+    serialized here once; a payload= mock is re-encoded on every request.
+    """
+    url = URL(FMP_PROFILE_URL)
+    with aioresponses() as m:
+        for symbol, payload in PROFILE_PAYLOADS.items():
+            m.get(
+                url.with_query(apikey="test_fmp_key", symbol=symbol),
+                body=json.dumps(payload).encode(),
+                repeat=True,
+            )
+        m.get(url.with_query(apikey="test_fmp_key"), body=b"[]", repeat=True)
+        yield m
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def fmp_config():
     return ProviderConfig(
         api_key="test_fmp_key",
@@ -24,32 +62,42 @@ def fmp_config():
     )
 
 
-@pytest.fixture
-def http_client():
-    return HttpClient(timeout=30.0)
+@pytest.fixture(scope="module")
+def _module_cache_manager(tmp_path_factory):
+    return CacheManager(base_dir=tmp_path_factory.mktemp("fmp_cache"), ttl_days=7)
 
 
 @pytest.fixture
-def cache_manager(temp_cache_dir):
-    return CacheManager(base_dir=temp_cache_dir, ttl_days=7)
+def cache_manager(_module_cache_manager):
+    # Shared across the module; drop the fmp provider's entries per test
+    _module_cache_manager.clear_provider("fmp")
+    return _module_cache_manager
 
 
-@pytest.fixture
-def health_monitor():
+@pytest.fixture(scope="module")
+def _module_health_monitor():
     return HealthMonitor()
 
 
 @pytest.fixture
-def fmp_provider(fmp_config, http_client, cache_manager, health_monitor):
+def health_monitor(_module_health_monitor):
+    # Shared across the module; clear the fmp provider's metrics per test
+    _module_health_monitor.reset("fmp")
+    return _module_health_monitor
+
+
+@pytest.fixture(scope="module")
+def fmp_provider(fmp_config, http_client, _module_cache_manager, _module_health_monitor):
+    # Stateless apart from the cache and monitor; tests that read either
+    # request cache_manager/health_monitor, which reset them first.
     return FMPProvider(
         config=fmp_config,
         http_client=http_client,
-        cache=cache_manager,
-        health_monitor=health_monitor,
+        cache=_module_cache_manager,
+        health_monitor=_module_health_monitor,
     )
 
 
-@pytest.mark.unit
 class TestFMPProvider:
     """Tests for FMPProvider class."""
 
@@ -57,50 +105,26 @@ class TestFMPProvider:
         assert fmp_provider.provider_name == "fmp"
 
     def test_supported_endpoints(self, fmp_provider):
-        endpoints = fmp_provider.get_supported_endpoints()
-        assert len(endpoints) == 13
-        assert "profile" in endpoints
-        assert "quote" in endpoints
-        assert "historical_price" in endpoints
-        assert "earnings_calendar" in endpoints
-        assert "balance_sheet" in endpoints
-        assert "income_statement" in endpoints
-        assert "cash_flow" in endpoints
-        assert "ratios" in endpoints
-        assert "growth" in endpoints
-        assert "key_metrics" in endpoints
-        assert "insider_trading" in endpoints
-        assert "institutional_ownership" in endpoints
-        assert "screener" in endpoints
-
-    def test_build_url_profile(self, fmp_provider):
-        url = fmp_provider._build_url("profile", symbol="AAPL")
-        assert url == "https://financialmodelingprep.com/stable/profile"
-
-    def test_build_url_quote(self, fmp_provider):
-        url = fmp_provider._build_url("quote", symbol="MSFT")
-        assert url == "https://financialmodelingprep.com/stable/quote"
-
-    def test_build_url_historical_price(self, fmp_provider):
-        url = fmp_provider._build_url("historical_price", symbol="GOOGL")
-        assert url == "https://financialmodelingprep.com/stable/historical-price-eod/full"
-
-    def test_build_url_earnings_calendar(self, fmp_provider):
-        url = fmp_provider._build_url("earnings_calendar")
-        assert url == "https://financialmodelingprep.com/stable/earnings-calendar"
-
-    def test_build_url_insider_trading(self, fmp_provider):
-        url = fmp_provider._build_url("insider_trading")
-        assert url == "https://financialmodelingprep.com/stable/insider-trading/search"
-
-    def test_build_url_screener(self, fmp_provider):
-        """New stable API endpoints don't use path params for symbol."""
-        url = fmp_provider._build_url("screener")
-        assert url == "https://financialmodelingprep.com/stable/company-screener"
+        endpoints = set(fmp_provider.get_supported_endpoints())
+        assert endpoints == {
+            "profile", "quote", "historical_price", "earnings_calendar",
+            "balance_sheet", "income_statement", "cash_flow", "ratios",
+            "growth", "key_metrics", "insider_trading",
+            "institutional_ownership", "screener",
+        }
 
-    def test_build_url_unknown_endpoint(self, fmp_provider):
-        with pytest.raises(ValueError, match="Unknown endpoint"):
-            fmp_provider._build_url("unknown_endpoint")
+    @pytest.mark.parametrize("endpoint,kwargs,expected", [
+        ("profile", {"symbol": "AAPL"}, "/stable/profile"),
+        ("quote", {"symbol": "MSFT"}, "/stable/quote"),
+        ("historical_price", {"symbol": "GOOGL"}, "/stable/historical-price-eod/full"),
+        ("earnings_calendar", {}, "/stable/earnings-calendar"),
+        ("insider_trading", {}, "/stable/insider-trading/search"),
+        # New stable API endpoints don't use path params for symbol
+        ("screener", {}, "/stable/company-screener"),
+    ])
+    def test_build_url(self, fmp_provider, endpoint, kwargs, expected):
+        url = fmp_provider._build_url(endpoint, **kwargs)
+        assert url == "https://financialmodelingprep.com" + expected
 
     def test_build_params_includes_api_key(self, fmp_provider):
         params = fmp_provider._build_params("profile")
@@ -146,188 +170,147 @@ class TestFMPProvider:
         assert "from=2024-01-01" in key
         assert "to=2024-01-31" in key
 
-    def test_validate_symbol_valid(self, fmp_provider):
-        assert fmp_provider.validate_symbol("AAPL") is True
-        assert fmp_provider.validate_symbol("MSFT") is True
-        assert fmp_provider.validate_symbol("BRK.A") is True
-        assert fmp_provider.validate_symbol("BRK-B") is True
+    @pytest.mark.parametrize("symbol,expected", [
+        ("AAPL", True),
+        ("MSFT", True),
+        ("BRK.A", True),
+        ("BRK-B", True),
+        ("", False),
+        (None, False),
+        ("TOOLONGSYMBOL", False),
+        ("INVALID!", False),
+    ])
+    def test_validate_symbol(self, fmp_provider, symbol, expected):
+        assert fmp_provider.validate_symbol(symbol) is expected
 
-    def test_validate_symbol_invalid(self, fmp_provider):
-        assert fmp_provider.validate_symbol("") is False
-        assert fmp_provider.validate_symbol(None) is False
-        assert fmp_provider.validate_symbol("TOOLONGSYMBOL") is False
-        assert fmp_provider.validate_symbol("INVALID!") is False
+
+HISTORICAL_PRICES = [
+    {"date": "2024-01-02", "close": 185.50},
+    {"date": "2024-01-03", "close": 186.00},
+]
+
+INCOME_STATEMENTS = [
+    {"date": "2024-01-01", "revenue": 1000000},
+    {"date": "2023-10-01", "revenue": 950000},
+]
 
 
-@pytest.mark.unit
 class TestFMPProviderNormalize:
     """Tests for FMP response normalization."""
 
-    def test_normalize_profile_list(self, fmp_provider):
-        # Profile returns a list with single item
-        data = [{"symbol": "AAPL", "companyName": "Apple Inc."}]
-        result = fmp_provider.normalize(data, "profile")
-        assert result == {"symbol": "AAPL", "companyName": "Apple Inc."}
-
-    def test_normalize_quote_list(self, fmp_provider):
-        # Quote returns a list with single item
-        data = [{"symbol": "AAPL", "price": 185.50}]
-        result = fmp_provider.normalize(data, "quote")
-        assert result == {"symbol": "AAPL", "price": 185.50}
-
-    def test_normalize_historical_price(self, fmp_provider):
-        data = {
-            "symbol": "AAPL",
-            "historical": [
-                {"date": "2024-01-02", "close": 185.50},
-                {"date": "2024-01-03", "close": 186.00},
-            ]
-        }
-        result = fmp_provider.normalize(data, "historical_price")
-        assert result["symbol"] == "AAPL"
-        assert len(result["historical"]) == 2
-
-    def test_normalize_error_response(self, fmp_provider):
-        data = {"Error Message": "Invalid API key"}
-        result = fmp_provider.normalize(data, "profile")
-        assert result["error"] == "Invalid API key"
-        assert result["data"] is None
-
-    def test_normalize_list_response(self, fmp_provider):
-        # Most endpoints return lists
-        data = [
-            {"date": "2024-01-01", "revenue": 1000000},
-            {"date": "2023-10-01", "revenue": 950000},
-        ]
-        result = fmp_provider.normalize(data, "income_statement")
-        assert result == data  # Should return as-is
-
-
-@pytest.mark.unit
-class TestFMPProviderFetch:
-    """Tests for FMP API fetching."""
-
-    @pytest.mark.asyncio
-    async def test_fetch_profile_success(self, fmp_provider):
-        import re
-        # Match URL with any query params (apikey, symbol will be added)
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
+    @pytest.mark.parametrize("data,endpoint,expected", [
+        # Profile and quote return a list with a single item
+        pytest.param(
+            [{"symbol": "AAPL", "companyName": "Apple Inc."}],
+            "profile",
+            {"symbol": "AAPL", "companyName": "Apple Inc."},
+            id="profile-list",
+        ),
+        pytest.param(
+            [{"symbol": "AAPL", "price": 185.50}],
+            "quote",
+            {"symbol": "AAPL", "price": 185.50},
+            id="quote-list",
+        ),
+        pytest.param(
+            {"symbol": "AAPL", "historical": HISTORICAL_PRICES},
+            "historical_price",
+            {"symbol": "AAPL", "historical": HISTORICAL_PRICES},
+            id="historical-price",
+        ),
+        pytest.param(
+            {"Error Message": "Invalid API key"},
+            "profile",
+            {"error": "Invalid API key", "data": None},
+            id="error-response",
+        ),
+        # Most endpoints return lists, passed through as-is
+        pytest.param(INCOME_STATEMENTS, "income_statement", INCOME_STATEMENTS, id="list"),
+    ])
+    def test_normalize(self, fmp_provider, data, endpoint, expected):
+        assert fmp_provider.normalize(data, endpoint) == expected
 
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[{"symbol": "AAPL", "companyName": "Apple Inc."}],
-                status=200,
-            )
 
-            async with aiohttp.ClientSession() as session:
-                response = await fmp_provider.fetch(session, "profile", symbol="AAPL")
+class TestFMPProviderFetch:
+    """Tests for FMP API fetching."""
 
-            assert response.status == 200
-            assert response.data == [{"symbol": "AAPL", "companyName": "Apple Inc."}]
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_fetch_profile_success(self, shared_session, fmp_provider, mock_api):
+        response = await fmp_provider.fetch(shared_session, "profile", symbol="AAPL")
 
-    @pytest.mark.asyncio
-    async def test_fetch_invalid_endpoint(self, fmp_provider):
-        async with aiohttp.ClientSession() as session:
-            with pytest.raises(ValueError, match="Invalid endpoint"):
-                await fmp_provider.fetch(session, "invalid_endpoint")
+        assert response.status == 200
+        assert response.data == PROFILE_PAYLOADS["AAPL"]
 
-    @pytest.mark.asyncio
-    async def test_fetch_without_symbol_still_builds_url(self, fmp_provider):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_fetch_without_symbol_still_builds_url(
+        self, shared_session, fmp_provider, mock_api
+    ):
         """In the new stable API, symbol is a query param, not a path param.
 
         The URL can be built without symbol - API would return empty/error.
         This test verifies the URL is built correctly without symbol param.
         """
-        import re
         # Even without symbol, the URL should be built - API may return empty result
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
+        response = await fmp_provider.fetch(shared_session, "profile")
 
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[],  # Empty result when no symbol
-                status=200,
-            )
+        assert response.status == 200
+        assert response.data == []
 
-            async with aiohttp.ClientSession() as session:
-                response = await fmp_provider.fetch(session, "profile")
+    def test_build_url_unknown_endpoint(self, fmp_provider):
+        with pytest.raises(ValueError, match="Unknown endpoint"):
+            fmp_provider._build_url("unknown_endpoint")
 
-            assert response.status == 200
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_fetch_invalid_endpoint(self, shared_session, fmp_provider):
+        with pytest.raises(ValueError, match="Invalid endpoint"):
+            await fmp_provider.fetch(shared_session, "invalid_endpoint")
 
 
-@pytest.mark.unit
 class TestFMPProviderIntegration:
     """Integration tests for FMP provider get method."""
 
-    @pytest.mark.asyncio
-    async def test_get_profile_success(self, fmp_provider):
-        import re
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[{
-                    "symbol": "AAPL",
-                    "companyName": "Apple Inc.",
-                    "industry": "Consumer Electronics",
-                }],
-                status=200,
-            )
-
-            async with aiohttp.ClientSession() as session:
-                response = await fmp_provider.get(session, "profile", symbol="AAPL")
-
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_profile_concurrent(
+        self, shared_session, fmp_provider, cache_manager, health_monitor, mock_api
+    ):
+        symbols = ("AAPL", "MSFT", "GOOGL")
+        responses = await asyncio.gather(*(
+            fmp_provider.get(shared_session, "profile", symbol=symbol)
+            for symbol in symbols
+        ))
+
+        for symbol, response in zip(symbols, responses):
             assert response.success is True
-            assert response.data["symbol"] == "AAPL"
+            assert response.data["symbol"] == symbol
             assert response.from_cache is False
 
-    @pytest.mark.asyncio
-    async def test_get_from_cache(self, fmp_provider, cache_manager):
-        # Pre-populate cache
-        cache_manager.set("fmp", "profile_symbol=AAPL", {"symbol": "AAPL", "cached": True})
+            # Check cache was populated
+            cached = cache_manager.get("fmp", f"profile_symbol={symbol}")
+            assert cached is not None
+            assert cached.data["symbol"] == symbol
+
+        metrics = health_monitor.get_provider_metrics("fmp")
+        assert metrics.total_requests == 3
+        assert metrics.successful_requests == 3
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_from_cache(
+        self, shared_session, fmp_config, http_client, prewarmed_cache, health_monitor
+    ):
+        provider = FMPProvider(
+            config=fmp_config,
+            http_client=http_client,
+            cache=prewarmed_cache,
+            health_monitor=health_monitor,
+        )
 
-        async with aiohttp.ClientSession() as session:
-            response = await fmp_provider.get(session, "profile", symbol="AAPL")
+        response = await provider.get(shared_session, "profile", symbol="AAPL")
 
         assert response.success is True
         assert response.data["cached"] is True
         assert response.from_cache is True
 
-    @pytest.mark.asyncio
-    async def test_get_caches_result(self, fmp_provider, cache_manager):
-        import re
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
-
-        with aioresponses() as m:
-            m.get(url_pattern, payload=[{"symbol": "MSFT"}], status=200)
-
-            async with aiohttp.ClientSession() as session:
-                await fmp_provider.get(session, "profile", symbol="MSFT")
-
-        # Check cache was populated
-        cached = cache_manager.get("fmp", "profile_symbol=MSFT")
-        assert cached is not None
-        assert cached.data["symbol"] == "MSFT"
-
-    @pytest.mark.asyncio
-    async def test_get_records_health_metrics(self, fmp_provider, health_monitor):
-        import re
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
-
-        with aioresponses() as m:
-            m.get(url_pattern, payload=[{"symbol": "GOOGL"}], status=200)
-
-            async with aiohttp.ClientSession() as session:
-                await fmp_provider.get(session, "profile", symbol="GOOGL")
-
-        metrics = health_monitor.get_provider_metrics("fmp")
-        assert metrics.total_requests == 1
-        assert metrics.successful_requests == 1
-
 
-@pytest.mark.unit
 class TestCreateFMPProvider:
     """Tests for the create_fmp_provider convenience function."""
 
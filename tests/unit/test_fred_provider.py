@@ -2,20 +2,67 @@
 Unit tests for the FRED provider.
 """
 
-import re
+import json
 
-import aiohttp
 import pytest
 from aioresponses import aioresponses
+from yarl import URL
 
 from data_loader.cache import CacheManager
 from data_loader.config import ProviderConfig
 from data_loader.health import HealthMonitor
-from data_loader.http_client import HttpClient
 from data_loader.providers.fred import FREDProvider, create_fred_provider
 
-
-@pytest.fixture
+# Module-scoped session, mocks and cache are built once per xdist worker
+# only if the whole module stays on one worker under --dist loadgroup.
+pytestmark = [pytest.mark.unit, pytest.mark.xdist_group("test_fred_provider")]
+
+FRED_SERIES_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+# Observation payloads served by mock_api, keyed by the series_id query param
+SERIES_PAYLOADS = {
+    "CPIAUCSL": {
+        "realtime_start": "2024-01-01",
+        "realtime_end": "2024-12-31",
+        "count": 12,
+        "observations": [{"date": "2024-01-01", "value": "308.417"}],
+    },
+    "UNRATE": {
+        "count": 1,
+        "observations": [{"date": "2024-01-01", "value": "3.7"}],
+    },
+    "GDP": {"count": 0, "observations": []},
+}
+
+
+# Query params, besides series_id, that each mocked series is requested with
+SERIES_QUERIES = {
+    "UNRATE": {"observation_start": "2024-01-01", "observation_end": "2024-12-31"},
+}
+
+
+@pytest.fixture(scope="module")
+def mock_api():
+    """Mock the FRED observations endpoint once for every test in the module.
+
+    aioresponses compares plain URLs (query included) by equality, so each
+    expected request is registered with its exact query string. Bodies are
+    serialized here once; a payload= mock is re-encoded on every request.
+    """
+    url = URL(FRED_SERIES_URL)
+    with aioresponses() as m:
+        for series_id, payload in SERIES_PAYLOADS.items():
+            query = {
+                "api_key": "test_fred_key",
+                "file_type": "json",
+                "series_id": series_id,
+                **SERIES_QUERIES.get(series_id, {}),
+            }
+            m.get(url.with_query(query), body=json.dumps(payload).encode(), repeat=True)
+        yield m
+
+
+@pytest.fixture(scope="module")
 def fred_config():
     return ProviderConfig(
         api_key="test_fred_key",
@@ -25,32 +72,42 @@ def fred_config():
     )
 
 
-@pytest.fixture
-def http_client():
-    return HttpClient(timeout=30.0)
+@pytest.fixture(scope="module")
+def _module_cache_manager(tmp_path_factory):
+    return CacheManager(base_dir=tmp_path_factory.mktemp("fred_cache"), ttl_days=7)
 
 
 @pytest.fixture
-def cache_manager(temp_cache_dir):
-    return CacheManager(base_dir=temp_cache_dir, ttl_days=7)
+def cache_manager(_module_cache_manager):
+    # Shared across the module; drop the fred provider's entries per test
+    _module_cache_manager.clear_provider("fred")
+    return _module_cache_manager
 
 
-@pytest.fixture
-def health_monitor():
+@pytest.fixture(scope="module")
+def _module_health_monitor():
     return HealthMonitor()
 
 
 @pytest.fixture
-def fred_provider(fred_config, http_client, cache_manager, health_monitor):
+def health_monitor(_module_health_monitor):
+    # Shared across the module; clear the fred provider's metrics per test
+    _module_health_monitor.reset("fred")
+    return _module_health_monitor
+
+
+@pytest.fixture(scope="module")
+def fred_provider(fred_config, http_client, _module_cache_manager, _module_health_monitor):
+    # Stateless apart from the cache and monitor; tests that read either
+    # request cache_manager/health_monitor, which reset them first.
     return FREDProvider(
         config=fred_config,
         http_client=http_client,
-        cache=cache_manager,
-        health_monitor=health_monitor,
+        cache=_module_cache_manager,
+        health_monitor=_module_health_monitor,
     )
 
 
-@pytest.mark.unit
 class TestFREDProvider:
     """Tests for FREDProvider class."""
 
@@ -58,35 +115,22 @@ class TestFREDProvider:
         assert fred_provider.provider_name == "fred"
 
     def test_supported_endpoints(self, fred_provider):
-        endpoints = fred_provider.get_supported_endpoints()
-        assert "series" in endpoints
-        assert "series_info" in endpoints
-        assert "releases" in endpoints
+        endpoints = set(fred_provider.get_supported_endpoints())
+        assert {"series", "series_info", "releases"} <= endpoints
 
     def test_supported_series(self, fred_provider):
         series = fred_provider.get_supported_series()
         assert len(series) == 32
-        assert "CPIAUCSL" in series
-        assert "UNRATE" in series
-        assert "GDP" in series
-        assert "FEDFUNDS" in series
-        assert "DGS10" in series
+        assert {"CPIAUCSL", "UNRATE", "GDP", "FEDFUNDS", "DGS10"} <= set(series)
 
-    def test_build_url_series(self, fred_provider):
-        url = fred_provider._build_url("series")
-        assert url == "https://api.stlouisfed.org/fred/series/observations"
-
-    def test_build_url_series_info(self, fred_provider):
-        url = fred_provider._build_url("series_info")
-        assert url == "https://api.stlouisfed.org/fred/series"
-
-    def test_build_url_releases(self, fred_provider):
-        url = fred_provider._build_url("releases")
-        assert url == "https://api.stlouisfed.org/fred/releases"
-
-    def test_build_url_unknown_endpoint(self, fred_provider):
-        with pytest.raises(ValueError, match="Unknown endpoint"):
-            fred_provider._build_url("unknown_endpoint")
+    @pytest.mark.parametrize("endpoint,expected", [
+        ("series", "/series/observations"),
+        ("series_info", "/series"),
+        ("releases", "/releases"),
+    ])
+    def test_build_url(self, fred_provider, endpoint, expected):
+        url = fred_provider._build_url(endpoint)
+        assert url == "https://api.stlouisfed.org/fred" + expected
 
     def test_build_params_includes_api_key(self, fred_provider):
         params = fred_provider._build_params("series")
@@ -126,16 +170,17 @@ class TestFREDProvider:
         assert "series_id=GDP" in key
         assert "observation_start=2024-01-01" in key
 
-    def test_validate_series_id_valid(self, fred_provider):
-        assert fred_provider.validate_series_id("CPIAUCSL") is True
-        assert fred_provider.validate_series_id("GDP") is True
-        assert fred_provider.validate_series_id("DGS10") is True
-        assert fred_provider.validate_series_id("T10Y2Y") is True
-
-    def test_validate_series_id_invalid(self, fred_provider):
-        assert fred_provider.validate_series_id("") is False
-        assert fred_provider.validate_series_id(None) is False
-        assert fred_provider.validate_series_id("INVALID!") is False
+    @pytest.mark.parametrize("series_id,expected", [
+        ("CPIAUCSL", True),
+        ("GDP", True),
+        ("DGS10", True),
+        ("T10Y2Y", True),
+        ("", False),
+        (None, False),
+        ("INVALID!", False),
+    ])
+    def test_validate_series_id(self, fred_provider, series_id, expected):
+        assert fred_provider.validate_series_id(series_id) is expected
 
     def test_is_supported_series(self, fred_provider):
         assert fred_provider.is_supported_series("CPIAUCSL") is True
@@ -143,196 +188,154 @@ class TestFREDProvider:
         assert fred_provider.is_supported_series("UNKNOWN123") is False
 
 
-@pytest.mark.unit
+OBSERVATIONS = [
+    {"date": "2024-01-01", "value": "308.417"},
+    {"date": "2024-02-01", "value": "309.685"},
+]
+
+RELEASES = [
+    {"id": 10, "name": "Consumer Price Index"},
+    {"id": 53, "name": "Gross Domestic Product"},
+]
+
+
 class TestFREDProviderNormalize:
     """Tests for FRED response normalization."""
 
-    def test_normalize_series(self, fred_provider):
-        data = {
-            "realtime_start": "2024-01-01",
-            "realtime_end": "2024-12-31",
-            "observation_start": "2024-01-01",
-            "observation_end": "2024-12-31",
-            "units": "lin",
-            "output_type": 1,
-            "count": 12,
-            "observations": [
-                {"date": "2024-01-01", "value": "308.417"},
-                {"date": "2024-02-01", "value": "309.685"},
-            ]
-        }
-        result = fred_provider.normalize(data, "series")
-        assert result["count"] == 12
-        assert len(result["observations"]) == 2
-        assert result["realtime_start"] == "2024-01-01"
-
-    def test_normalize_series_info(self, fred_provider):
-        data = {
-            "seriess": [{
+    @pytest.mark.parametrize("data,endpoint,expected", [
+        pytest.param(
+            {
+                "realtime_start": "2024-01-01",
+                "realtime_end": "2024-12-31",
+                "observation_start": "2024-01-01",
+                "observation_end": "2024-12-31",
+                "units": "lin",
+                "output_type": 1,
+                "count": 12,
+                "observations": OBSERVATIONS,
+            },
+            "series",
+            {"count": 12, "observations": OBSERVATIONS, "realtime_start": "2024-01-01"},
+            id="series",
+        ),
+        # Single series should be unwrapped
+        pytest.param(
+            {"seriess": [{
                 "id": "CPIAUCSL",
                 "title": "Consumer Price Index for All Urban Consumers",
                 "frequency": "Monthly",
                 "units": "Index 1982-1984=100",
-            }]
-        }
-        result = fred_provider.normalize(data, "series_info")
-        # Single series should be unwrapped
-        assert result["id"] == "CPIAUCSL"
-        assert result["frequency"] == "Monthly"
-
-    def test_normalize_releases(self, fred_provider):
-        data = {
-            "count": 2,
-            "releases": [
-                {"id": 10, "name": "Consumer Price Index"},
-                {"id": 53, "name": "Gross Domestic Product"},
-            ]
-        }
-        result = fred_provider.normalize(data, "releases")
-        assert result["count"] == 2
-        assert len(result["releases"]) == 2
-
-    def test_normalize_error_response(self, fred_provider):
-        data = {
-            "error_code": 400,
-            "error_message": "Bad Request. series_id is required"
-        }
-        result = fred_provider.normalize(data, "series")
-        assert result["error"] == "Bad Request. series_id is required"
-        assert result["error_code"] == 400
-        assert result["data"] is None
-
-
-@pytest.mark.unit
+            }]},
+            "series_info",
+            {"id": "CPIAUCSL", "frequency": "Monthly"},
+            id="series-info",
+        ),
+        pytest.param(
+            {"count": 2, "releases": RELEASES},
+            "releases",
+            {"count": 2, "releases": RELEASES},
+            id="releases",
+        ),
+        pytest.param(
+            {"error_code": 400, "error_message": "Bad Request. series_id is required"},
+            "series",
+            {"error": "Bad Request. series_id is required", "error_code": 400, "data": None},
+            id="error-response",
+        ),
+    ])
+    def test_normalize(self, fred_provider, data, endpoint, expected):
+        result = fred_provider.normalize(data, endpoint)
+        # Compare only the keys under test; series results carry extra metadata
+        assert {key: result[key] for key in expected} == expected
+
+
 class TestFREDProviderFetch:
     """Tests for FRED API fetching."""
 
-    @pytest.mark.asyncio
-    async def test_fetch_series_success(self, fred_provider):
-        url_pattern = re.compile(r'https://api\.stlouisfed\.org/fred/series/observations.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload={
-                    "count": 1,
-                    "observations": [{"date": "2024-01-01", "value": "308.417"}]
-                },
-                status=200,
-            )
-
-            async with aiohttp.ClientSession() as session:
-                response = await fred_provider.fetch(
-                    session, "series", series_id="CPIAUCSL"
-                )
-
-            assert response.status == 200
-            assert response.data["count"] == 1
-
-    @pytest.mark.asyncio
-    async def test_fetch_missing_series_id(self, fred_provider):
-        async with aiohttp.ClientSession() as session:
-            with pytest.raises(ValueError, match="requires 'series_id' parameter"):
-                await fred_provider.fetch(session, "series")
-
-    @pytest.mark.asyncio
-    async def test_fetch_invalid_endpoint(self, fred_provider):
-        async with aiohttp.ClientSession() as session:
-            with pytest.raises(ValueError, match="Invalid endpoint"):
-                await fred_provider.fetch(session, "invalid_endpoint")
-
-
-@pytest.mark.unit
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_fetch_series_success(self, shared_session, fred_provider, mock_api):
+        response = await fred_provider.fetch(
+            shared_session, "series", series_id="CPIAUCSL"
+        )
+
+        assert response.status == 200
+        assert response.data == SERIES_PAYLOADS["CPIAUCSL"]
+
+    def test_build_url_unknown_endpoint(self, fred_provider):
+        with pytest.raises(ValueError, match="Unknown endpoint"):
+            fred_provider._build_url("unknown_endpoint")
+
+    @pytest.mark.parametrize("endpoint,match", [
+        pytest.param("series", "requires 'series_id' parameter", id="missing-series-id"),
+        pytest.param("invalid_endpoint", "Invalid endpoint", id="invalid-endpoint"),
+    ])
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_fetch_invalid_request_raises(
+        self, shared_session, fred_provider, endpoint, match
+    ):
+        with pytest.raises(ValueError, match=match):
+            await fred_provider.fetch(shared_session, endpoint)
+
+
 class TestFREDProviderIntegration:
     """Integration tests for FRED provider get method."""
 
-    @pytest.mark.asyncio
-    async def test_get_series_success(self, fred_provider):
-        url_pattern = re.compile(r'https://api\.stlouisfed\.org/fred/series/observations.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload={
-                    "realtime_start": "2024-01-01",
-                    "realtime_end": "2024-12-31",
-                    "count": 12,
-                    "observations": [
-                        {"date": "2024-01-01", "value": "308.417"},
-                    ]
-                },
-                status=200,
-            )
-
-            async with aiohttp.ClientSession() as session:
-                response = await fred_provider.get(
-                    session, "series", series_id="CPIAUCSL"
-                )
-
-            assert response.success is True
-            assert response.data["count"] == 12
-            assert response.from_cache is False
-
-    @pytest.mark.asyncio
-    async def test_get_series_convenience_method(self, fred_provider):
-        url_pattern = re.compile(r'https://api\.stlouisfed\.org/fred/series/observations.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload={
-                    "count": 1,
-                    "observations": [{"date": "2024-01-01", "value": "3.7"}]
-                },
-                status=200,
-            )
-
-            async with aiohttp.ClientSession() as session:
-                response = await fred_provider.get_series(
-                    session,
-                    series_id="UNRATE",
-                    start_date="2024-01-01",
-                    end_date="2024-12-31",
-                )
-
-            assert response.success is True
-            assert len(response.data["observations"]) == 1
-
-    @pytest.mark.asyncio
-    async def test_get_from_cache(self, fred_provider, cache_manager):
-        # Pre-populate cache
-        cache_key = "series_series_id=CPIAUCSL"
-        cache_manager.set("fred", cache_key, {"count": 10, "cached": True})
-
-        async with aiohttp.ClientSession() as session:
-            response = await fred_provider.get(
-                session, "series", series_id="CPIAUCSL"
-            )
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_series_success(
+        self, shared_session, fred_provider, cache_manager, mock_api
+    ):
+        response = await fred_provider.get(
+            shared_session, "series", series_id="CPIAUCSL"
+        )
 
         assert response.success is True
-        assert response.data["cached"] is True
-        assert response.from_cache is True
+        assert response.data["count"] == 12
+        assert response.from_cache is False
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_series_convenience_method(
+        self, shared_session, fred_provider, mock_api
+    ):
+        response = await fred_provider.get_series(
+            shared_session,
+            series_id="UNRATE",
+            start_date="2024-01-01",
+            end_date="2024-12-31",
+        )
+
+        assert response.success is True
+        assert len(response.data["observations"]) == 1
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_from_cache(
+        self, shared_session, fred_config, http_client, prewarmed_cache, health_monitor
+    ):
+        provider = FREDProvider(
+            config=fred_config,
+            http_client=http_client,
+            cache=prewarmed_cache,
+            health_monitor=health_monitor,
+        )
 
-    @pytest.mark.asyncio
-    async def test_get_records_health_metrics(self, fred_provider, health_monitor):
-        url_pattern = re.compile(r'https://api\.stlouisfed\.org/fred/series/observations.*')
+        response = await provider.get(
+            shared_session, "series", series_id="CPIAUCSL"
+        )
 
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload={"count": 0, "observations": []},
-                status=200,
-            )
+        assert response.success is True
+        assert response.data["cached"] is True
+        assert response.from_cache is True
 
-            async with aiohttp.ClientSession() as session:
-                await fred_provider.get(session, "series", series_id="GDP")
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_records_health_metrics(
+        self, shared_session, fred_provider, health_monitor, mock_api
+    ):
+        await fred_provider.get(shared_session, "series", series_id="GDP")
 
         metrics = health_monitor.get_provider_metrics("fred")
         assert metrics.total_requests == 1
         assert metrics.successful_requests == 1
 
 
-@pytest.mark.unit
 class TestCreateFREDProvider:
     """Tests for the create_fred_provider convenience function."""
 
@@ -2,10 +2,13 @@
 Unit tests for the health monitor.
 """
 
+import statistics
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
+from data_loader import health
 from data_loader.health import (
     HealthMonitor,
     ProviderMetrics,
@@ -14,6 +17,45 @@ from data_loader.health import (
 )
 
 
+@pytest.fixture(scope="module")
+def _module_monitor():
+    return HealthMonitor()
+
+
+@pytest.fixture
+def monitor(_module_monitor):
+    # Shared across the module; clear every tracked provider per test
+    _module_monitor.reset()
+    return _module_monitor
+
+
+@pytest.fixture(scope="module")
+def prepared_report():
+    """Health report built once for the read-only report assertions."""
+    monitor = HealthMonitor()
+    monitor.record_batch("fmp", "profile", successes=20, failures=0, latency_ms=100.0)
+    monitor.record_batch("polygon", "aggs", successes=15, failures=0, latency_ms=150.0)
+    return monitor.get_health_report()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Worker threads shared by the thread-safety tests."""
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        yield executor
+
+
+def record_many(monitor, count):
+    for _ in range(count):
+        monitor.record_success("fmp", "profile", latency_ms=100.0)
+
+
+def record_concurrently(pool, monitor, workers, records_per_worker):
+    """Record successes from several pool workers at once."""
+    # list() drains the results so worker exceptions propagate
+    list(pool.map(lambda _: record_many(monitor, records_per_worker), range(workers)))
+
+
 @pytest.mark.unit
 class TestProviderStatus:
     """Tests for ProviderStatus enum."""
@@ -97,79 +139,79 @@ class TestProviderMetrics:
 class TestHealthMonitor:
     """Tests for HealthMonitor class."""
 
-    def test_init_default(self):
-        monitor = HealthMonitor()
+    def test_init_default(self, monitor):
         assert monitor.window_size == 100
 
     def test_init_custom_window(self):
         monitor = HealthMonitor(window_size=50)
         assert monitor.window_size == 50
 
-    def test_record_success(self):
-        monitor = HealthMonitor()
-
-        monitor.record_success("fmp", "profile", latency_ms=100.0)
-
-        metrics = monitor.get_provider_metrics("fmp")
-        assert metrics.total_requests == 1
-        assert metrics.successful_requests == 1
-        assert metrics.failed_requests == 0
-
-    def test_record_failure(self):
-        monitor = HealthMonitor()
-
-        monitor.record_failure(
-            "fmp", "profile",
-            latency_ms=50.0,
-            status_code=500,
-            error_type="server_error"
-        )
-
-        metrics = monitor.get_provider_metrics("fmp")
-        assert metrics.total_requests == 1
-        assert metrics.successful_requests == 0
-        assert metrics.failed_requests == 1
-
-    def test_record_rate_limit(self):
-        monitor = HealthMonitor()
-
-        monitor.record_failure(
-            "fmp", "profile",
-            latency_ms=10.0,
-            status_code=429,
-            error_type="rate_limit"
-        )
+    @pytest.mark.parametrize("records,expected", [
+        pytest.param(
+            [(True, {"latency_ms": 100.0})],
+            {"total_requests": 1, "successful_requests": 1, "failed_requests": 0},
+            id="success",
+        ),
+        pytest.param(
+            [(False, {"latency_ms": 50.0, "status_code": 500, "error_type": "server_error"})],
+            {"total_requests": 1, "successful_requests": 0, "failed_requests": 1},
+            id="failure",
+        ),
+        pytest.param(
+            [(False, {"latency_ms": 10.0, "status_code": 429, "error_type": "rate_limit"})],
+            {"rate_limited_requests": 1},
+            id="rate_limit",
+        ),
+        pytest.param(
+            [(False, {"latency_ms": 30000.0, "error_type": "timeout"})],
+            {"timeout_requests": 1},
+            id="timeout",
+        ),
+        pytest.param(
+            # 8 successes, 2 failures = 20% error rate
+            [(True, {"latency_ms": 100.0})] * 8 + [(False, {"latency_ms": 50.0})] * 2,
+            {"error_rate": 0.2},
+            id="error_rate",
+        ),
+    ])
+    def test_record(self, monitor, records, expected):
+        for success, kwargs in records:
+            record = monitor.record_success if success else monitor.record_failure
+            record("fmp", "profile", **kwargs)
+
+        snapshot = monitor.get_provider_metrics("fmp").to_dict()
+        assert {key: snapshot[key] for key in expected} == expected
+
+    def test_record_batch(self, monitor):
+        monitor.record_batch("fmp", "profile", successes=8, failures=2, latency_ms=100.0)
 
         metrics = monitor.get_provider_metrics("fmp")
-        assert metrics.rate_limited_requests == 1
-
-    def test_record_timeout(self):
-        monitor = HealthMonitor()
+        assert metrics.total_requests == 10
+        assert metrics.successful_requests == 8
+        assert metrics.failed_requests == 2
+        assert metrics.error_rate == 0.2
+        assert metrics.avg_latency_ms == 100.0
 
-        monitor.record_failure(
-            "fmp", "profile",
-            latency_ms=30000.0,
-            error_type="timeout"
+    def test_record_batch_rate_limited(self, monitor):
+        monitor.record_batch(
+            "fmp", "profile", successes=0, failures=3,
+            latency_ms=10.0, status_code=429, error_type="rate_limit",
         )
 
         metrics = monitor.get_provider_metrics("fmp")
-        assert metrics.timeout_requests == 1
+        assert metrics.rate_limited_requests == 3
+        assert metrics.last_error_type == "rate_limit"
 
-    def test_error_rate_calculation(self):
-        monitor = HealthMonitor()
+    def test_record_batch_larger_than_window(self):
+        monitor = HealthMonitor(window_size=10)
 
-        # 8 successes, 2 failures = 20% error rate
-        for _ in range(8):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-        for _ in range(2):
-            monitor.record_failure("fmp", "profile", latency_ms=50.0)
+        monitor.record_batch("fmp", "profile", successes=50, failures=5, latency_ms=1.0)
 
         metrics = monitor.get_provider_metrics("fmp")
-        assert metrics.error_rate == 0.2
-
-    def test_latency_stats(self):
-        monitor = HealthMonitor()
+        assert metrics.total_requests == 55
+        assert metrics.error_rate == 0.5
 
+    def test_latency_stats(self, monitor):
         monitor.record_success("fmp", "profile", latency_ms=100.0)
         monitor.record_success("fmp", "profile", latency_ms=200.0)
         monitor.record_success("fmp", "profile", latency_ms=300.0)
@@ -179,133 +221,81 @@ class TestHealthMonitor:
         assert metrics.min_latency_ms == 100.0
         assert metrics.max_latency_ms == 300.0
 
-    def test_status_unknown_few_requests(self):
-        monitor = HealthMonitor()
-
-        # Less than MIN_REQUESTS_FOR_STATUS
-        for _ in range(5):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-
-        status = monitor.get_provider_status("fmp")
-        assert status == ProviderStatus.UNKNOWN
-
-    def test_status_healthy(self):
-        monitor = HealthMonitor()
-
-        # 15 requests with 0% error rate
-        for _ in range(15):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-
-        status = monitor.get_provider_status("fmp")
-        assert status == ProviderStatus.HEALTHY
-
-    def test_status_degraded(self):
-        monitor = HealthMonitor()
+    def test_latency_stats_full_window(self):
+        monitor = HealthMonitor(window_size=100)
+        for latency in range(1, 151):
+            monitor.record_success("fmp", "profile", latency_ms=float(latency))
 
+        # Only the newest 100 samples (51..150) remain in the window
+        window = [float(latency) for latency in range(51, 151)]
+        metrics = monitor.get_provider_metrics("fmp")
+        assert metrics.avg_latency_ms == pytest.approx(statistics.fmean(window))
+        assert metrics.min_latency_ms == min(window)
+        assert metrics.max_latency_ms == max(window)
+
+    @pytest.mark.parametrize("successes,failures,expected_status,healthy", [
+        # Unknown (not enough data) is considered healthy
+        (0, 0, ProviderStatus.UNKNOWN, True),
+        (5, 0, ProviderStatus.UNKNOWN, True),
+        (15, 0, ProviderStatus.HEALTHY, True),
         # 15% error rate (between 10% and 20%)
-        for _ in range(85):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-        for _ in range(15):
-            monitor.record_failure("fmp", "profile", latency_ms=50.0)
-
-        status = monitor.get_provider_status("fmp")
-        assert status == ProviderStatus.DEGRADED
-
-    def test_status_unhealthy(self):
-        monitor = HealthMonitor()
-
-        # 25% error rate (above 20%)
-        for _ in range(75):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-        for _ in range(25):
-            monitor.record_failure("fmp", "profile", latency_ms=50.0)
-
-        status = monitor.get_provider_status("fmp")
-        assert status == ProviderStatus.UNHEALTHY
-
-    def test_is_healthy(self):
-        monitor = HealthMonitor()
-
-        # Unknown is considered healthy (not enough data)
-        assert monitor.is_healthy("fmp") is True
+        (85, 15, ProviderStatus.DEGRADED, False),
+        # 25% and 30% error rate (above 20%)
+        (75, 25, ProviderStatus.UNHEALTHY, False),
+        (70, 30, ProviderStatus.UNHEALTHY, False),
+    ])
+    def test_status(self, monitor, successes, failures, expected_status, healthy):
+        monitor.record_batch(
+            "fmp", "profile", successes=successes, failures=failures, latency_ms=100.0
+        )
 
-        # After enough successful requests
-        for _ in range(15):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
+        assert monitor.get_provider_status("fmp") == expected_status
+        assert monitor.is_healthy("fmp") is healthy
 
-        assert monitor.is_healthy("fmp") is True
+    def test_custom_min_requests_for_status(self):
+        monitor = HealthMonitor(min_requests_for_status=3)
 
-    def test_is_not_healthy(self):
-        monitor = HealthMonitor()
+        monitor.record_batch("fmp", "profile", successes=3, failures=0, latency_ms=100.0)
 
-        # 30% error rate
-        for _ in range(70):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-        for _ in range(30):
-            monitor.record_failure("fmp", "profile", latency_ms=50.0)
+        assert monitor.min_requests_for_status == 3
+        assert monitor.get_provider_status("fmp") == ProviderStatus.HEALTHY
 
-        assert monitor.is_healthy("fmp") is False
+    def test_report_structure(self, prepared_report):
+        assert set(prepared_report) == {"timestamp", "providers", "overall_status"}
+        assert set(prepared_report["providers"]) == {"fmp", "polygon", "fred"}
 
-    def test_get_health_report(self):
-        monitor = HealthMonitor()
+    def test_report_provider_entries(self, prepared_report):
+        providers = prepared_report["providers"]
 
-        # Add some requests
-        for _ in range(20):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-        for _ in range(15):
-            monitor.record_success("polygon", "aggs", latency_ms=150.0)
+        assert providers["fmp"]["total_requests"] == 20
+        assert providers["fmp"]["status"] == "healthy"
+        assert providers["polygon"]["total_requests"] == 15
+        assert providers["polygon"]["avg_latency_ms"] == 150.0
+        assert providers["fred"]["total_requests"] == 0
+        assert providers["fred"]["status"] == "unknown"
 
-        report = monitor.get_health_report()
-
-        assert "timestamp" in report
-        assert "providers" in report
-        assert "overall_status" in report
-        assert "fmp" in report["providers"]
-        assert "polygon" in report["providers"]
-        assert "fred" in report["providers"]
-
-    def test_overall_status_healthy(self):
-        monitor = HealthMonitor()
+    def test_report_overall_status_ignores_unknown(self, prepared_report):
+        # FRED has no data yet, which does not drag the overall status down
+        assert prepared_report["overall_status"] == "healthy"
 
+    @pytest.mark.parametrize("counts,expected", [
         # All providers healthy
-        for _ in range(15):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-            monitor.record_success("polygon", "aggs", latency_ms=100.0)
-            monitor.record_success("fred", "series", latency_ms=100.0)
-
-        report = monitor.get_health_report()
-        assert report["overall_status"] == "healthy"
-
-    def test_overall_status_degraded(self):
-        monitor = HealthMonitor()
-
+        ({"fmp": (15, 0), "polygon": (15, 0), "fred": (15, 0)}, "healthy"),
         # FMP healthy, Polygon degraded (15% error)
-        for _ in range(15):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-
-        for _ in range(85):
-            monitor.record_success("polygon", "aggs", latency_ms=100.0)
-        for _ in range(15):
-            monitor.record_failure("polygon", "aggs", latency_ms=50.0)
-
-        report = monitor.get_health_report()
-        assert report["overall_status"] == "degraded"
-
-    def test_overall_status_unhealthy(self):
-        monitor = HealthMonitor()
-
+        ({"fmp": (15, 0), "polygon": (85, 15)}, "degraded"),
         # One provider unhealthy
-        for _ in range(75):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-        for _ in range(25):
-            monitor.record_failure("fmp", "profile", latency_ms=50.0)
+        ({"fmp": (75, 25)}, "unhealthy"),
+    ])
+    def test_overall_status(self, monitor, counts, expected):
+        for provider, (successes, failures) in counts.items():
+            monitor.record_batch(
+                provider, "endpoint", successes=successes, failures=failures, latency_ms=100.0
+            )
 
         report = monitor.get_health_report()
-        assert report["overall_status"] == "unhealthy"
-
-    def test_reset_single_provider(self):
-        monitor = HealthMonitor()
+        assert report["overall_status"] == expected
 
+    def test_reset_single_provider(self, monitor):
         monitor.record_success("fmp", "profile", latency_ms=100.0)
         monitor.record_success("polygon", "aggs", latency_ms=100.0)
 
@@ -317,9 +307,7 @@ class TestHealthMonitor:
         assert fmp_metrics.total_requests == 0
         assert polygon_metrics.total_requests == 1
 
-    def test_reset_all_providers(self):
-        monitor = HealthMonitor()
-
+    def test_reset_all_providers(self, monitor):
         monitor.record_success("fmp", "profile", latency_ms=100.0)
         monitor.record_success("polygon", "aggs", latency_ms=100.0)
         monitor.record_success("fred", "series", latency_ms=100.0)
@@ -330,19 +318,20 @@ class TestHealthMonitor:
             metrics = monitor.get_provider_metrics(provider)
             assert metrics.total_requests == 0
 
-    def test_get_error_rate(self):
-        monitor = HealthMonitor()
+    def test_reset_all_includes_custom_providers(self, monitor):
+        monitor.record_success("custom", "endpoint", latency_ms=100.0)
 
-        for _ in range(9):
-            monitor.record_success("fmp", "profile", latency_ms=100.0)
-        monitor.record_failure("fmp", "profile", latency_ms=50.0)
+        monitor.reset()
+
+        assert monitor.get_provider_metrics("custom").total_requests == 0
+
+    def test_get_error_rate(self, monitor):
+        monitor.record_batch("fmp", "profile", successes=9, failures=1, latency_ms=100.0)
 
         error_rate = monitor.get_error_rate("fmp")
         assert error_rate == 0.1
 
-    def test_get_avg_latency(self):
-        monitor = HealthMonitor()
-
+    def test_get_avg_latency(self, monitor):
         monitor.record_success("fmp", "profile", latency_ms=100.0)
         monitor.record_success("fmp", "profile", latency_ms=200.0)
 
@@ -366,48 +355,37 @@ class TestHealthMonitor:
         # Window now has 5 successes and 5 failures = 50% error rate
         assert monitor.get_error_rate("fmp") == 0.5
 
-    def test_new_provider(self):
-        monitor = HealthMonitor()
-
+    def test_new_provider(self, monitor):
         # Record for a new provider (not in default list)
         monitor.record_success("custom", "endpoint", latency_ms=100.0)
 
         metrics = monitor.get_provider_metrics("custom")
         assert metrics.total_requests == 1
 
-    def test_last_success_and_error_tracking(self):
-        monitor = HealthMonitor()
+    def test_last_success_and_error_tracking(self, monitor, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(health, "_now", lambda: now[0])
 
         monitor.record_success("fmp", "profile", latency_ms=100.0)
-        time.sleep(0.01)  # Small delay
+        now[0] += 1.0
         monitor.record_failure("fmp", "profile", latency_ms=50.0, error_type="server_error")
 
         metrics = monitor.get_provider_metrics("fmp")
         assert metrics.last_success is not None
         assert metrics.last_error is not None
         assert metrics.last_error_type == "server_error"
-        assert metrics.last_error > metrics.last_success
-
-    def test_thread_safety(self):
-        import threading
+        assert metrics.last_success == 1000.0
+        assert metrics.last_error == 1001.0
 
-        monitor = HealthMonitor()
-        errors = []
+    def test_thread_safety_smoke(self, monitor, pool):
+        record_concurrently(pool, monitor, workers=3, records_per_worker=10)
 
-        def record_many():
-            try:
-                for _ in range(100):
-                    monitor.record_success("fmp", "profile", latency_ms=100.0)
-            except Exception as e:
-                errors.append(e)
-
-        threads = [threading.Thread(target=record_many) for _ in range(10)]
+        metrics = monitor.get_provider_metrics("fmp")
+        assert metrics.total_requests == 30
 
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+    @pytest.mark.slow
+    def test_thread_safety_stress(self, monitor, pool):
+        record_concurrently(pool, monitor, workers=10, records_per_worker=100)
 
-        assert len(errors) == 0
         metrics = monitor.get_provider_metrics("fmp")
         assert metrics.total_requests == 1000
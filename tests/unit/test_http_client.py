@@ -3,6 +3,7 @@ Unit tests for the HTTP client layer.
 """
 
 import asyncio
+from unittest.mock import MagicMock
 
 import aiohttp
 import pytest
@@ -20,48 +21,72 @@ from data_loader.http_client import (
     TimeoutError,
 )
 
+API_URL = "https://api.example.com/data"
+FILTERED_URL = f"{API_URL}?filter=active"
+
+# Connector error raised by the mocked connection-failure case
+_MOCK_KEY = MagicMock(ssl=False)
+_CONN_EXC = aiohttp.ClientConnectorError(
+    connection_key=_MOCK_KEY, os_error=OSError("Connection refused")
+)
+
+# (status, is_success, is_rate_limited, is_server_error)
+STATUS_FLAGS = [
+    (200, True, False, False),
+    (201, True, False, False),
+    (299, True, False, False),
+    (400, False, False, False),
+    (429, False, True, False),
+    (500, False, False, True),
+    (503, False, False, True),
+]
+
+
+@pytest.fixture(scope="module")
+def responses():
+    """Empty-bodied responses keyed by status, shared by the flag checks."""
+    return {status: HttpResponse(status, {}, {}, "", 0) for status, *_ in STATUS_FLAGS}
+
+
+@pytest.fixture
+def mocked():
+    """aioresponses registry intercepting the shared session's requests."""
+    with aioresponses() as m:
+        yield m
+
 
 @pytest.mark.unit
 class TestHttpMethod:
     """Tests for HttpMethod enum."""
 
-    def test_all_methods(self):
-        assert HttpMethod.GET.value == "GET"
-        assert HttpMethod.POST.value == "POST"
-        assert HttpMethod.PUT.value == "PUT"
-        assert HttpMethod.DELETE.value == "DELETE"
+    @pytest.mark.parametrize("method", ["GET", "POST", "PUT", "DELETE"])
+    def test_all_methods(self, method):
+        assert HttpMethod[method].value == method
 
 
 @pytest.mark.unit
 class TestHttpError:
     """Tests for HTTP error classes."""
 
-    def test_http_error_base(self):
-        error = HttpError("Test error", status_code=400, url="https://example.com")
-        assert str(error) == "Test error"
-        assert error.status_code == 400
-        assert error.url == "https://example.com"
+    @pytest.mark.parametrize("cls,kwargs,expected", [
+        (HttpError, {"status_code": 400}, {"status_code": 400, "kind": "http_error"}),
+        (TimeoutError, {}, {"status_code": None, "kind": "timeout"}),
+        (
+            RateLimitError,
+            {"retry_after": 60},
+            {"status_code": 429, "retry_after": 60, "kind": "rate_limit"},
+        ),
+        (ServerError, {"status_code": 500}, {"status_code": 500, "kind": "server_error"}),
+        (ClientError, {"status_code": 400}, {"status_code": 400, "kind": "client_error"}),
+        (ConnectionError, {}, {"status_code": None, "kind": "connection_error"}),
+    ])
+    def test_error_attributes(self, cls, kwargs, expected):
+        error = cls("Test error", url="https://example.com", **kwargs)
 
-    def test_timeout_error(self):
-        error = TimeoutError("Request timed out", url="https://example.com")
         assert isinstance(error, HttpError)
+        assert str(error) == "Test error"
         assert error.url == "https://example.com"
-
-    def test_rate_limit_error(self):
-        error = RateLimitError("Rate limited", retry_after=60, url="https://example.com")
-        assert isinstance(error, HttpError)
-        assert error.status_code == 429
-        assert error.retry_after == 60
-
-    def test_server_error(self):
-        error = ServerError("Server down", status_code=500, url="https://example.com")
-        assert isinstance(error, HttpError)
-        assert error.status_code == 500
-
-    def test_client_error(self):
-        error = ClientError("Bad request", status_code=400, url="https://example.com")
-        assert isinstance(error, HttpError)
-        assert error.status_code == 400
+        assert {attr: getattr(error, attr) for attr in expected} == expected
 
 
 @pytest.mark.unit
@@ -82,50 +107,17 @@ class TestHttpResponse:
         assert response.url == "https://example.com/api"
         assert response.elapsed_ms == 150.5
 
-    def test_is_success_200(self):
-        response = HttpResponse(200, {}, {}, "", 0)
-        assert response.is_success is True
-
-    def test_is_success_201(self):
-        response = HttpResponse(201, {}, {}, "", 0)
-        assert response.is_success is True
-
-    def test_is_success_299(self):
-        response = HttpResponse(299, {}, {}, "", 0)
-        assert response.is_success is True
-
-    def test_is_not_success_400(self):
-        response = HttpResponse(400, {}, {}, "", 0)
-        assert response.is_success is False
-
-    def test_is_not_success_500(self):
-        response = HttpResponse(500, {}, {}, "", 0)
-        assert response.is_success is False
-
-    def test_is_rate_limited(self):
-        response = HttpResponse(429, {}, {}, "", 0)
-        assert response.is_rate_limited is True
-
-    def test_is_not_rate_limited(self):
-        response = HttpResponse(200, {}, {}, "", 0)
-        assert response.is_rate_limited is False
-
-    def test_is_server_error(self):
-        response = HttpResponse(500, {}, {}, "", 0)
-        assert response.is_server_error is True
-
-    def test_is_server_error_503(self):
-        response = HttpResponse(503, {}, {}, "", 0)
-        assert response.is_server_error is True
-
-    def test_is_not_server_error(self):
-        response = HttpResponse(400, {}, {}, "", 0)
-        assert response.is_server_error is False
+    @pytest.mark.parametrize("status,success,rate_limited,server_error", STATUS_FLAGS)
+    def test_status_flags(self, responses, status, success, rate_limited, server_error):
+        response = responses[status]
+        assert response.is_success is success
+        assert response.is_rate_limited is rate_limited
+        assert response.is_server_error is server_error
 
 
 @pytest.mark.unit
-class TestHttpClient:
-    """Tests for HttpClient class."""
+class TestHttpClientInit:
+    """Tests for HttpClient construction."""
 
     def test_init_default(self):
         client = HttpClient()
@@ -140,227 +132,114 @@ class TestHttpClient:
         assert client.timeout == 60.0
         assert client.default_headers == {"Authorization": "Bearer token"}
 
-    @pytest.mark.asyncio
-    async def test_get_success(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.get(url, payload={"result": "success"}, status=200)
-
-            async with aiohttp.ClientSession() as session:
-                response = await client.get(session, url)
-
-                assert response.status == 200
-                assert response.data == {"result": "success"}
-                assert response.is_success is True
-
-    @pytest.mark.asyncio
-    async def test_get_with_params(self):
-        client = HttpClient()
-        # Include params in the URL for aioresponses matching
-        url = "https://api.example.com/data?filter=active"
-
-        with aioresponses() as m:
-            m.get(url, payload={"result": "filtered"}, status=200)
-
-            async with aiohttp.ClientSession() as session:
-                response = await client.get(
-                    session, "https://api.example.com/data", params={"filter": "active"}
-                )
-
-                assert response.status == 200
-                assert response.data == {"result": "filtered"}
-
-    @pytest.mark.asyncio
-    async def test_get_with_headers(self):
-        client = HttpClient(default_headers={"X-Default": "value"})
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.get(url, payload={}, status=200)
-
-            async with aiohttp.ClientSession() as session:
-                response = await client.get(
-                    session, url, headers={"X-Custom": "custom"}
-                )
-
-                assert response.status == 200
 
-    @pytest.mark.asyncio
-    async def test_post_success(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.post(url, payload={"id": 123}, status=201)
-
-            async with aiohttp.ClientSession() as session:
-                response = await client.post(
-                    session, url, json_data={"name": "test"}
-                )
-
-                assert response.status == 201
-                assert response.data == {"id": 123}
-
-    @pytest.mark.asyncio
-    async def test_rate_limit_error(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.get(url, status=429, headers={"Retry-After": "60"})
-
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(RateLimitError) as exc_info:
-                    await client.get(session, url)
-
-                assert exc_info.value.status_code == 429
-                assert exc_info.value.retry_after == 60
-
-    @pytest.mark.asyncio
-    async def test_rate_limit_no_retry_after(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.get(url, status=429)
-
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(RateLimitError) as exc_info:
-                    await client.get(session, url)
-
-                assert exc_info.value.retry_after is None
-
-    @pytest.mark.asyncio
-    async def test_server_error_500(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.get(url, status=500, body="Internal Server Error")
+@pytest.mark.unit
+@pytest.mark.asyncio(loop_scope="session")
+class TestHttpClient:
+    """Tests for HttpClient requests; all run on the session loop with the shared session."""
 
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(ServerError) as exc_info:
-                    await client.get(session, url)
+    async def test_create_session_limits_connections(self):
+        client = HttpClient(timeout=12.0)
 
-                assert exc_info.value.status_code == 500
+        async with client.create_session(limit=8, limit_per_host=3) as session:
+            assert session.connector.limit == 8
+            assert session.connector.limit_per_host == 3
+            assert session.timeout.total == 12.0
 
-    @pytest.mark.asyncio
-    async def test_server_error_503(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
+    async def test_get_success(self, shared_session, mocked, http_client):
+        mocked.get(API_URL, payload={"result": "success"}, status=200)
 
-        with aioresponses() as m:
-            m.get(url, status=503)
+        response = await http_client.get(shared_session, API_URL)
 
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(ServerError) as exc_info:
-                    await client.get(session, url)
+        assert response.status == 200
+        assert response.data == {"result": "success"}
+        assert response.is_success is True
 
-                assert exc_info.value.status_code == 503
+    async def test_get_with_params(self, shared_session, mocked, http_client):
+        # aioresponses matches on the full URL, query included
+        mocked.get(FILTERED_URL, payload={"result": "filtered"}, status=200)
 
-    @pytest.mark.asyncio
-    async def test_client_error_400(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
+        response = await http_client.get(
+            shared_session, API_URL, params={"filter": "active"}
+        )
 
-        with aioresponses() as m:
-            m.get(url, status=400, payload={"error": "Bad Request"})
+        assert response.status == 200
+        assert response.data == {"result": "filtered"}
 
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(ClientError) as exc_info:
-                    await client.get(session, url)
+    async def test_get_with_headers(self, shared_session, mocked):
+        client = HttpClient(default_headers={"X-Default": "value"})
 
-                assert exc_info.value.status_code == 400
+        mocked.get(API_URL, payload={}, status=200)
 
-    @pytest.mark.asyncio
-    async def test_client_error_404(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
+        response = await client.get(
+            shared_session, API_URL, headers={"X-Custom": "custom"}
+        )
 
-        with aioresponses() as m:
-            m.get(url, status=404)
+        assert response.status == 200
 
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(ClientError) as exc_info:
-                    await client.get(session, url)
+    async def test_post_success(self, shared_session, mocked, http_client):
+        mocked.post(API_URL, payload={"id": 123}, status=201)
 
-                assert exc_info.value.status_code == 404
+        response = await http_client.post(
+            shared_session, API_URL, json_data={"name": "test"}
+        )
 
-    @pytest.mark.asyncio
-    async def test_timeout_error(self):
+        assert response.status == 201
+        assert response.data == {"id": 123}
+
+    @pytest.mark.parametrize("mock_kwargs,exc_type,status_code,retry_after", [
+        ({"status": 429, "headers": {"Retry-After": "60"}}, RateLimitError, 429, 60),
+        ({"status": 429}, RateLimitError, 429, None),
+        ({"status": 500, "body": "Internal Server Error"}, ServerError, 500, None),
+        ({"status": 503}, ServerError, 503, None),
+        ({"status": 400, "payload": {"error": "Bad Request"}}, ClientError, 400, None),
+        ({"status": 404}, ClientError, 404, None),
+        ({"exception": _CONN_EXC}, ConnectionError, None, None),
+    ])
+    async def test_error_raises(
+        self, shared_session, mocked, http_client, mock_kwargs, exc_type, status_code,
+        retry_after,
+    ):
+        mocked.get(API_URL, **mock_kwargs)
+
+        with pytest.raises(exc_type) as exc_info:
+            await http_client.get(shared_session, API_URL)
+
+        assert exc_info.value.status_code == status_code
+        if exc_type is RateLimitError:
+            assert exc_info.value.retry_after == retry_after
+
+    async def test_timeout_error(self, shared_session, mocked):
         client = HttpClient(timeout=0.001)  # Very short timeout
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.get(url, exception=asyncio.TimeoutError())
-
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(TimeoutError):
-                    await client.get(session, url)
-
-    @pytest.mark.asyncio
-    async def test_connection_error(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
-
-        # Create a mock connection key for aiohttp
-        from unittest.mock import MagicMock
-
-        mock_key = MagicMock()
-        mock_key.ssl = False
 
-        with aioresponses() as m:
-            m.get(url, exception=aiohttp.ClientConnectorError(
-                connection_key=mock_key, os_error=OSError("Connection refused")
-            ))
-
-            async with aiohttp.ClientSession() as session:
-                with pytest.raises(ConnectionError):
-                    await client.get(session, url)
-
-    @pytest.mark.asyncio
-    async def test_text_response(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
+        mocked.get(API_URL, exception=asyncio.TimeoutError())
 
-        with aioresponses() as m:
-            m.get(
-                url,
-                body="Plain text response",
-                status=200,
-                headers={"Content-Type": "text/plain"},
-            )
+        with pytest.raises(TimeoutError):
+            await client.get(shared_session, API_URL)
 
-            async with aiohttp.ClientSession() as session:
-                response = await client.get(session, url)
+    async def test_text_response(self, shared_session, mocked, http_client):
+        mocked.get(
+            API_URL,
+            body="Plain text response",
+            status=200,
+            headers={"Content-Type": "text/plain"},
+        )
 
-                assert response.status == 200
-                assert response.data == "Plain text response"
+        response = await http_client.get(shared_session, API_URL)
 
-    @pytest.mark.asyncio
-    async def test_elapsed_time_recorded(self):
-        client = HttpClient()
-        url = "https://api.example.com/data"
-
-        with aioresponses() as m:
-            m.get(url, payload={}, status=200)
+        assert response.status == 200
+        assert response.data == "Plain text response"
 
-            async with aiohttp.ClientSession() as session:
-                response = await client.get(session, url)
+    async def test_elapsed_time_recorded(self, shared_session, mocked, http_client):
+        mocked.get(API_URL, payload={}, status=200)
 
-                assert response.elapsed_ms >= 0
+        response = await http_client.get(shared_session, API_URL)
 
-    @pytest.mark.asyncio
-    async def test_custom_timeout_override(self):
-        client = HttpClient(timeout=30.0)
-        url = "https://api.example.com/data"
+        assert response.elapsed_ms >= 0
 
-        with aioresponses() as m:
-            m.get(url, payload={}, status=200)
+    async def test_custom_timeout_override(self, shared_session, mocked, http_client):
+        mocked.get(API_URL, payload={}, status=200)
 
-            async with aiohttp.ClientSession() as session:
-                # Should succeed with explicit timeout
-                response = await client.get(session, url, timeout=60.0)
-                assert response.is_success
+        # Should succeed with explicit timeout
+        response = await http_client.get(shared_session, API_URL, timeout=60.0)
+        assert response.is_success
@@ -4,39 +4,87 @@ Unit tests for the unified DataLoader interface.
 
 import re
 
-import aiohttp
 import pytest
 from aioresponses import aioresponses
 
-from data_loader.cache import CacheManager
+from data_loader import config as config_module
+from data_loader.cache import CacheManager, DictBackend
 from data_loader.circuit_breaker import (
     CircuitBreakerError,
     CircuitBreakerManager,
     CircuitState,
 )
-from data_loader.config import Config, OperatingMode
+from data_loader.config import CacheConfig, Config, LogLevel, OperatingMode, ProviderConfig
 from data_loader.health import HealthMonitor, ProviderStatus
 from data_loader.loader import DataLoader, DataLoaderStats, ReadOnlyError, create_data_loader
 from data_loader.qos_router import QoSSemaphoreRouter
 from data_loader.retry import RetryConfig, RetryHandler
 
+# Mocked provider endpoints
+FMP_PROFILE_RE = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
+FMP_QUOTE_RE = re.compile(r'https://financialmodelingprep\.com/stable/quote\?.*')
+POLYGON_SPY_AGGS_RE = re.compile(r'https://api\.polygon\.io/v2/aggs/ticker/SPY/range/1/day/.*')
+FRED_SERIES_RE = re.compile(r'https://api\.stlouisfed\.org/fred/series/observations.*')
 
-@pytest.fixture
-def mock_config(temp_cache_dir):
-    """Create a mock config for testing."""
-    return Config.from_env()
+
+def seed_cache(loader, provider, endpoint, payload, **params):
+    """Store payload under the cache key the loader uses for this request."""
+    cache_key = loader._providers[provider].cache_key(endpoint, **params)
+    loader._cache.set(provider, cache_key, payload)
 
 
 @pytest.fixture
-def data_loader(temp_cache_dir, mock_config):
-    """Create a DataLoader instance for testing."""
-    cache = CacheManager(base_dir=temp_cache_dir, ttl_days=7)
+def mocked():
+    """aioresponses registry for tests that mock provider HTTP calls."""
+    with aioresponses() as m:
+        yield m
+
+
+@pytest.fixture(scope="module")
+def mock_config(tmp_path_factory):
+    """Config built directly, independent of the environment and any .env file."""
+    project_root = tmp_path_factory.mktemp("loader_project")
+    return Config(
+        fmp=ProviderConfig("test_fmp_key", Config.FMP_BASE_URL, Config.FMP_MAX_CONCURRENCY),
+        polygon=ProviderConfig(
+            "test_polygon_key", Config.POLYGON_BASE_URL, Config.POLYGON_MAX_CONCURRENCY
+        ),
+        fred=ProviderConfig("test_fred_key", Config.FRED_BASE_URL, Config.FRED_MAX_CONCURRENCY),
+        cache=CacheConfig(base_dir=project_root / "data" / "cache"),
+        circuit_breaker=config_module.CircuitBreakerConfig(),
+        retry=config_module.RetryConfig(),
+        operating_mode=OperatingMode.LIVE,
+        log_level=LogLevel.INFO,
+        project_root=project_root,
+    )
+
+
+@pytest.fixture(scope="module")
+def _module_data_loader(tmp_path_factory, mock_config):
+    # In-memory entries: these tests exercise loader logic, not cache disk I/O
+    cache = CacheManager(
+        base_dir=tmp_path_factory.mktemp("loader_cache"),
+        ttl_days=7,
+        storage_backend=DictBackend(),
+    )
     return DataLoader(
         config=mock_config,
         cache=cache,
     )
 
 
+@pytest.fixture
+def data_loader(_module_data_loader):
+    """DataLoader shared across the module, reset to its initial state per test."""
+    loader = _module_data_loader
+    loader.reset_stats()
+    loader.reset_circuit_breaker()
+    loader.reset_health_monitor()
+    loader._cache.clear_all()
+    loader.set_operating_mode(loader.config.operating_mode)
+    return loader
+
+
 @pytest.mark.unit
 class TestDataLoaderInit:
     """Tests for DataLoader initialization."""
@@ -78,6 +126,18 @@ class TestDataLoaderInit:
         assert "polygon" in data_loader._providers
         assert "fred" in data_loader._providers
 
+    @pytest.mark.asyncio
+    async def test_create_session_sized_to_provider_limits(self, data_loader):
+        limits = [
+            data_loader.config.fmp.max_concurrency,
+            data_loader.config.polygon.max_concurrency,
+            data_loader.config.fred.max_concurrency,
+        ]
+
+        async with data_loader.create_session() as session:
+            assert session.connector.limit == sum(limits)
+            assert session.connector.limit_per_host == max(limits)
+
 
 @pytest.mark.unit
 class TestOperatingMode:
@@ -95,28 +155,24 @@ class TestOperatingMode:
         data_loader.set_operating_mode(OperatingMode.LIVE)
         assert data_loader.operating_mode == OperatingMode.LIVE
 
-    @pytest.mark.asyncio
-    async def test_read_only_mode_raises_on_cache_miss(self, data_loader):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_read_only_mode_raises_on_cache_miss(self, shared_session, data_loader):
         data_loader.set_operating_mode(OperatingMode.READ_ONLY)
 
-        async with aiohttp.ClientSession() as session:
-            with pytest.raises(ReadOnlyError) as exc_info:
-                await data_loader.get_fmp_data(session, "profile", symbol="AAPL")
+        with pytest.raises(ReadOnlyError) as exc_info:
+            await data_loader.get_fmp_data(shared_session, "profile", symbol="AAPL")
 
         assert exc_info.value.provider == "fmp"
         assert exc_info.value.endpoint == "profile"
         assert "READ_ONLY mode" in str(exc_info.value)
 
-    @pytest.mark.asyncio
-    async def test_read_only_mode_returns_cached_data(self, data_loader, temp_cache_dir):
-        # Pre-populate cache
-        cache_key = data_loader._providers["fmp"].cache_key("profile", symbol="AAPL")
-        data_loader._cache.set("fmp", cache_key, {"symbol": "AAPL", "cached": True})
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_read_only_mode_returns_cached_data(self, shared_session, data_loader):
+        seed_cache(data_loader, "fmp", "profile", {"symbol": "AAPL", "cached": True}, symbol="AAPL")
 
         data_loader.set_operating_mode(OperatingMode.READ_ONLY)
 
-        async with aiohttp.ClientSession() as session:
-            response = await data_loader.get_fmp_data(session, "profile", symbol="AAPL")
+        response = await data_loader.get_fmp_data(shared_session, "profile", symbol="AAPL")
 
         assert response.success is True
         assert response.from_cache is True
@@ -127,51 +183,41 @@ class TestOperatingMode:
 class TestCacheHandling:
     """Tests for cache behavior."""
 
-    @pytest.mark.asyncio
-    async def test_returns_cached_data_on_cache_hit(self, data_loader):
-        # Pre-populate cache
-        cache_key = data_loader._providers["fmp"].cache_key("profile", symbol="MSFT")
-        data_loader._cache.set("fmp", cache_key, {"symbol": "MSFT", "name": "Microsoft"})
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_returns_cached_data_on_cache_hit(self, shared_session, data_loader):
+        seed_cache(
+            data_loader, "fmp", "profile", {"symbol": "MSFT", "name": "Microsoft"}, symbol="MSFT"
+        )
 
-        async with aiohttp.ClientSession() as session:
-            response = await data_loader.get_fmp_data(session, "profile", symbol="MSFT")
+        response = await data_loader.get_fmp_data(shared_session, "profile", symbol="MSFT")
 
         assert response.success is True
         assert response.from_cache is True
         assert response.data["symbol"] == "MSFT"
 
-    @pytest.mark.asyncio
-    async def test_cache_stats_tracked(self, data_loader):
-        # Pre-populate cache
-        cache_key = data_loader._providers["fmp"].cache_key("profile", symbol="GOOG")
-        data_loader._cache.set("fmp", cache_key, {"symbol": "GOOG"})
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_cache_stats_tracked(self, shared_session, data_loader):
+        seed_cache(data_loader, "fmp", "profile", {"symbol": "GOOG"}, symbol="GOOG")
 
-        async with aiohttp.ClientSession() as session:
-            await data_loader.get_fmp_data(session, "profile", symbol="GOOG")
+        await data_loader.get_fmp_data(shared_session, "profile", symbol="GOOG")
 
         stats = data_loader.get_stats()
         assert stats.cache_hits == 1
         assert stats.total_requests == 1
 
-    @pytest.mark.asyncio
-    async def test_cache_bypass_when_disabled(self, data_loader):
-        # Pre-populate cache
-        cache_key = data_loader._providers["fmp"].cache_key("profile", symbol="AMZN")
-        data_loader._cache.set("fmp", cache_key, {"symbol": "AMZN", "cached": True})
-
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[{"symbol": "AMZN", "name": "Amazon", "fresh": True}],
-                status=200,
-            )
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_cache_bypass_when_disabled(self, shared_session, mocked, data_loader):
+        seed_cache(data_loader, "fmp", "profile", {"symbol": "AMZN", "cached": True}, symbol="AMZN")
 
-            async with aiohttp.ClientSession() as session:
-                response = await data_loader.get_fmp_data(
-                    session, "profile", symbol="AMZN", use_cache=False
-                )
+        mocked.get(
+            FMP_PROFILE_RE,
+            payload=[{"symbol": "AMZN", "name": "Amazon", "fresh": True}],
+            status=200,
+        )
+
+        response = await data_loader.get_fmp_data(
+            shared_session, "profile", symbol="AMZN", use_cache=False
+        )
 
         # Should have fetched from API (fresh data)
         assert response.success is True
@@ -182,177 +228,110 @@ class TestCacheHandling:
 class TestCircuitBreakerIntegration:
     """Tests for circuit breaker integration."""
 
-    @pytest.mark.asyncio
-    async def test_rejects_when_circuit_open(self, data_loader):
-        # Force circuit breaker open
-        for _ in range(15):
-            data_loader._circuit_breaker.record_failure("fmp")
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_rejects_when_circuit_open(self, shared_session, data_loader):
+        data_loader._circuit_breaker.force_open("fmp")
 
-        async with aiohttp.ClientSession() as session:
-            with pytest.raises(CircuitBreakerError) as exc_info:
-                await data_loader.get_fmp_data(session, "profile", symbol="AAPL")
+        with pytest.raises(CircuitBreakerError) as exc_info:
+            await data_loader.get_fmp_data(shared_session, "profile", symbol="AAPL")
 
         assert exc_info.value.provider == "fmp"
         assert data_loader._stats.circuit_breaker_rejections >= 1
 
-    @pytest.mark.asyncio
-    async def test_circuit_breaker_state_affects_requests(self, data_loader):
-        # Record enough failures to open circuit
-        for _ in range(15):
-            data_loader._circuit_breaker.record_failure("polygon")
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_circuit_breaker_state_affects_requests(self, shared_session, data_loader):
+        data_loader._circuit_breaker.force_open("polygon")
 
         assert data_loader._circuit_breaker.get_state("polygon") == CircuitState.OPEN
 
-        async with aiohttp.ClientSession() as session:
-            with pytest.raises(CircuitBreakerError):
-                await data_loader.get_polygon_data(
-                    session, "aggs_daily",
-                    symbol="SPY", start="2024-01-01", end="2024-01-31"
-                )
-
-
-@pytest.mark.unit
-class TestFMPDataFetching:
-    """Tests for FMP data fetching."""
-
-    @pytest.mark.asyncio
-    async def test_get_fmp_profile(self, data_loader):
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[{
-                    "symbol": "AAPL",
-                    "companyName": "Apple Inc.",
-                    "sector": "Technology",
-                }],
-                status=200,
+        with pytest.raises(CircuitBreakerError):
+            await data_loader.get_polygon_data(
+                shared_session, "aggs_daily",
+                symbol="SPY", start="2024-01-01", end="2024-01-31"
             )
 
-            async with aiohttp.ClientSession() as session:
-                response = await data_loader.get_fmp_data(
-                    session, "profile", symbol="AAPL"
-                )
-
-        assert response.success is True
-        assert response.provider == "fmp"
-        assert response.endpoint == "profile"
-        assert response.from_cache is False
-
-    @pytest.mark.asyncio
-    async def test_get_fmp_quote(self, data_loader):
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/quote\?.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[{
-                    "symbol": "MSFT",
-                    "price": 400.00,
-                    "change": 5.00,
-                }],
-                status=200,
-            )
-
-            async with aiohttp.ClientSession() as session:
-                response = await data_loader.get_fmp_data(
-                    session, "quote", symbol="MSFT"
-                )
-
-        assert response.success is True
-        assert response.data["symbol"] == "MSFT"
-
 
 @pytest.mark.unit
-class TestPolygonDataFetching:
-    """Tests for Polygon data fetching."""
-
-    @pytest.mark.asyncio
-    async def test_get_polygon_aggs(self, data_loader):
-        url_pattern = re.compile(r'https://api\.polygon\.io/v2/aggs/ticker/SPY/range/1/day/.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload={
-                    "ticker": "SPY",
-                    "resultsCount": 5,
-                    "results": [
-                        {"o": 450.0, "h": 455.0, "l": 448.0, "c": 452.0, "v": 1000000}
-                    ],
-                },
-                status=200,
-            )
-
-            async with aiohttp.ClientSession() as session:
-                response = await data_loader.get_polygon_data(
-                    session, "aggs_daily",
-                    symbol="SPY", start="2024-01-01", end="2024-01-31"
-                )
+class TestProviderDataFetching:
+    """Tests for the provider-specific get_*_data methods."""
+
+    @pytest.mark.parametrize("provider,endpoint,url_re,payload,params,expected_data", [
+        pytest.param(
+            "fmp", "profile", FMP_PROFILE_RE,
+            [{"symbol": "AAPL", "companyName": "Apple Inc.", "sector": "Technology"}],
+            {"symbol": "AAPL"},
+            None,
+            id="fmp_profile",
+        ),
+        pytest.param(
+            "fmp", "quote", FMP_QUOTE_RE,
+            [{"symbol": "MSFT", "price": 400.00, "change": 5.00}],
+            {"symbol": "MSFT"},
+            {"symbol": "MSFT"},
+            id="fmp_quote",
+        ),
+        pytest.param(
+            "polygon", "aggs_daily", POLYGON_SPY_AGGS_RE,
+            {
+                "ticker": "SPY",
+                "resultsCount": 5,
+                "results": [{"o": 450.0, "h": 455.0, "l": 448.0, "c": 452.0, "v": 1000000}],
+            },
+            {"symbol": "SPY", "start": "2024-01-01", "end": "2024-01-31"},
+            None,
+            id="polygon_aggs",
+        ),
+        pytest.param(
+            "fred", "series", FRED_SERIES_RE,
+            {"count": 1, "observations": [{"date": "2024-01-01", "value": "308.417"}]},
+            {"series_id": "CPIAUCSL"},
+            None,
+            id="fred_series",
+        ),
+    ])
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_provider_data(
+        self, shared_session, mocked, data_loader, provider, endpoint, url_re, payload, params,
+        expected_data,
+    ):
+        get_data = getattr(data_loader, f"get_{provider}_data")
+
+        mocked.get(url_re, payload=payload, status=200)
+
+        response = await get_data(shared_session, endpoint, **params)
 
         assert response.success is True
-        assert response.provider == "polygon"
-
-
-@pytest.mark.unit
-class TestFREDDataFetching:
-    """Tests for FRED data fetching."""
-
-    @pytest.mark.asyncio
-    async def test_get_fred_series(self, data_loader):
-        url_pattern = re.compile(r'https://api\.stlouisfed\.org/fred/series/observations.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload={
-                    "count": 1,
-                    "observations": [
-                        {"date": "2024-01-01", "value": "308.417"},
-                    ],
-                },
-                status=200,
-            )
-
-            async with aiohttp.ClientSession() as session:
-                response = await data_loader.get_fred_data(
-                    session, "series", series_id="CPIAUCSL"
-                )
-
-        assert response.success is True
-        assert response.provider == "fred"
+        assert response.provider == provider
+        assert response.endpoint == endpoint
+        assert response.from_cache is False
+        if expected_data is not None:
+            assert {key: response.data[key] for key in expected_data} == expected_data
 
 
 @pytest.mark.unit
 class TestGenericDataFetching:
     """Tests for the generic get_data method."""
 
-    @pytest.mark.asyncio
-    async def test_get_data_with_fmp(self, data_loader):
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[{"symbol": "TSLA", "companyName": "Tesla"}],
-                status=200,
-            )
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_data_with_fmp(self, shared_session, mocked, data_loader):
+        mocked.get(
+            FMP_PROFILE_RE,
+            payload=[{"symbol": "TSLA", "companyName": "Tesla"}],
+            status=200,
+        )
 
-            async with aiohttp.ClientSession() as session:
-                response = await data_loader.get_data(
-                    session, "fmp", "profile", symbol="TSLA"
-                )
+        response = await data_loader.get_data(
+            shared_session, "fmp", "profile", symbol="TSLA"
+        )
 
         assert response.success is True
         assert response.provider == "fmp"
 
-    @pytest.mark.asyncio
-    async def test_get_data_unknown_provider(self, data_loader):
-        async with aiohttp.ClientSession() as session:
-            response = await data_loader.get_data(
-                session, "unknown_provider", "endpoint"
-            )
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_data_unknown_provider(self, shared_session, data_loader):
+        response = await data_loader.get_data(
+            shared_session, "unknown_provider", "endpoint"
+        )
 
         assert response.success is False
         assert "Unknown provider" in response.error
@@ -388,9 +367,7 @@ class TestHealthReport:
         assert data_loader.is_provider_healthy("fmp") is True
 
     def test_is_provider_healthy_when_circuit_open(self, data_loader):
-        # Force circuit open
-        for _ in range(15):
-            data_loader._circuit_breaker.record_failure("polygon")
+        data_loader._circuit_breaker.force_open("polygon")
 
         assert data_loader.is_provider_healthy("polygon") is False
 
@@ -406,32 +383,25 @@ class TestStatistics:
         assert stats.cache_misses == 0
         assert stats.api_calls == 0
 
-    @pytest.mark.asyncio
-    async def test_stats_track_cache_hits(self, data_loader):
-        # Pre-populate cache
-        cache_key = data_loader._providers["fred"].cache_key("series", series_id="GDP")
-        data_loader._cache.set("fred", cache_key, {"observations": []})
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_stats_track_cache_hits(self, shared_session, data_loader):
+        seed_cache(data_loader, "fred", "series", {"observations": []}, series_id="GDP")
 
-        async with aiohttp.ClientSession() as session:
-            await data_loader.get_fred_data(session, "series", series_id="GDP")
+        await data_loader.get_fred_data(shared_session, "series", series_id="GDP")
 
         stats = data_loader.get_stats()
         assert stats.cache_hits == 1
         assert stats.total_requests == 1
 
-    @pytest.mark.asyncio
-    async def test_stats_track_api_calls(self, data_loader):
-        url_pattern = re.compile(r'https://financialmodelingprep\.com/stable/profile\?.*')
-
-        with aioresponses() as m:
-            m.get(
-                url_pattern,
-                payload=[{"symbol": "NVDA"}],
-                status=200,
-            )
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_stats_track_api_calls(self, shared_session, mocked, data_loader):
+        mocked.get(
+            FMP_PROFILE_RE,
+            payload=[{"symbol": "NVDA"}],
+            status=200,
+        )
 
-            async with aiohttp.ClientSession() as session:
-                await data_loader.get_fmp_data(session, "profile", symbol="NVDA")
+        await data_loader.get_fmp_data(shared_session, "profile", symbol="NVDA")
 
         stats = data_loader.get_stats()
         assert stats.api_calls == 1
@@ -465,9 +435,7 @@ class TestResetMethods:
     """Tests for reset functionality."""
 
     def test_reset_circuit_breaker_single_provider(self, data_loader):
-        # Force circuit open
-        for _ in range(15):
-            data_loader._circuit_breaker.record_failure("fmp")
+        data_loader._circuit_breaker.force_open("fmp")
 
         assert data_loader._circuit_breaker.get_state("fmp") == CircuitState.OPEN
 
@@ -477,9 +445,7 @@ class TestResetMethods:
 
     def test_reset_circuit_breaker_all_providers(self, data_loader):
         # Force circuits open
-        for _ in range(15):
-            data_loader._circuit_breaker.record_failure("fmp")
-            data_loader._circuit_breaker.record_failure("polygon")
+        data_loader._circuit_breaker.force_open_all(["fmp", "polygon"])
 
         data_loader.reset_circuit_breaker()
 
@@ -524,10 +490,12 @@ class TestSupportedEndpoints:
 class TestCreateDataLoader:
     """Tests for the create_data_loader convenience function."""
 
-    def test_create_data_loader_default(self):
-        loader = create_data_loader()
-        assert loader is not None
-        assert isinstance(loader, DataLoader)
+    @pytest.fixture(scope="class")
+    def default_loader(self):
+        return create_data_loader()
+
+    def test_create_data_loader_default(self, default_loader):
+        assert isinstance(default_loader, DataLoader)
 
     def test_create_data_loader_with_config(self, mock_config):
         loader = create_data_loader(config=mock_config)
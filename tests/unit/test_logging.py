@@ -3,6 +3,7 @@ Unit tests for the logging module.
 """
 
 import logging
+import re
 
 import pytest
 
@@ -154,7 +155,6 @@ class TestSanitizingFormatter:
         assert "https://api.example.com/v1/data?symbol=AAPL" in formatted
 
     def test_additional_patterns(self):
-        import re
         custom_pattern = (re.compile(r'SSN:\s*(\d{3}-\d{2}-\d{4})'), 'SSN: [REDACTED]')
         formatter = SanitizingFormatter(additional_patterns=[custom_pattern])
         record = logging.LogRecord(
@@ -168,6 +168,23 @@ class TestSanitizingFormatter:
         )
         formatted = formatter.format(record)
         assert "123-45-6789" not in formatted
+        assert formatted == "User SSN: [REDACTED]"
+
+    def test_additional_patterns_read_at_format_time(self):
+        formatter = SanitizingFormatter()
+        formatter.additional_patterns.append(
+            (re.compile(r'SSN:\s*(\d{3}-\d{2}-\d{4})'), 'SSN: [REDACTED]')
+        )
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="",
+            lineno=0,
+            msg="User SSN: 123-45-6789",
+            args=(),
+            exc_info=None,
+        )
+        assert formatter.format(record) == "User SSN: [REDACTED]"
 
 
 @pytest.mark.unit
@@ -193,6 +210,20 @@ class TestSanitizeMessage:
         result = sanitize_message(message)
         assert result == message
 
+    @pytest.mark.parametrize(
+        "message, secret",
+        [
+            ("Using key Ab3dEf7hIj9kLm1nOp5qRs for FMP", "Ab3dEf7hIj9kLm1nOp5qRs"),
+            ("Header: BEARER tok.abc-123", "tok.abc-123"),
+            ("Digest 0123456789abcdef0123456789abcdef", "0123456789abcdef0123456789abcdef"),
+            ("Résumé 0123456789abcdef0123456789abcdef", "0123456789abcdef0123456789abcdef"),
+        ],
+    )
+    def test_sanitize_without_query_markers(self, message, secret):
+        result = sanitize_message(message)
+        assert secret not in result
+        assert "[REDACTED]" in result
+
 
 @pytest.mark.unit
 class TestSetupLogging:
@@ -272,20 +303,22 @@ class TestSetupLogging:
             logger_name="test_sanitize",
         )
 
-        # Log a message with sensitive data
-        logger.info("Request to https://api.example.com?apikey=super_secret_key_123")
+        # Log sensitive data both pre-formatted and as a lazy %s argument
+        url = "https://api.example.com?apikey=super_secret_key_123"
+        logger.info(f"Request to {url}")
+        logger.info("Request to %s", url)
 
         # Check console output (StreamHandler writes to stderr by default)
         captured = capfd.readouterr()
         console_output = captured.out + captured.err
         assert "super_secret_key_123" not in console_output
-        assert "[REDACTED]" in console_output
+        assert console_output.count("[REDACTED]") == 2
 
         # Check file output
         log_file = temp_log_dir / "test_sanitize.log"
         content = log_file.read_text()
         assert "super_secret_key_123" not in content
-        assert "[REDACTED]" in content
+        assert content.count("[REDACTED]") == 2
 
 
 @pytest.mark.unit
@@ -329,6 +362,19 @@ class TestLoggerMixin:
         logger2 = obj.logger
         assert logger1 is logger2
 
+    def test_mixin_itself_has_logger(self):
+        logger = LoggerMixin().logger
+        assert isinstance(logger, logging.Logger)
+        assert logger.name == "LoggerMixin"
+
+    def test_mixin_logger_shared_by_instances(self):
+        class TestClass(LoggerMixin):
+            pass
+
+        first, second = TestClass(), TestClass()
+        assert first.logger is second.logger is TestClass.logger
+        assert "logger" not in vars(first)
+
     def test_mixin_different_classes_different_loggers(self):
         class ClassA(LoggerMixin):
             pass
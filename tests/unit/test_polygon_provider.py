@@ -11,7 +11,6 @@ from aioresponses import aioresponses
 from data_loader.cache import CacheManager
 from data_loader.config import ProviderConfig
 from data_loader.health import HealthMonitor
-from data_loader.http_client import HttpClient
 from data_loader.providers.polygon import PolygonProvider, create_polygon_provider
 
 
@@ -25,11 +24,6 @@ def polygon_config():
     )
 
 
-@pytest.fixture
-def http_client():
-    return HttpClient(timeout=30.0)
-
-
 @pytest.fixture
 def cache_manager(temp_cache_dir):
     return CacheManager(base_dir=temp_cache_dir, ttl_days=7)
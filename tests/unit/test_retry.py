@@ -2,6 +2,7 @@
 Unit tests for the Retry & Backoff Handler.
 """
 
+import time
 
 import pytest
 
@@ -358,8 +359,6 @@ class TestRetryTiming:
 
     @pytest.mark.asyncio
     async def test_delays_accumulate(self):
-        import time
-
         config = RetryConfig(
             max_retries=2,
             base_delay=0.05,